@@ -1,11 +1,214 @@
+import hashlib
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from itertools import islice
 from typing import Any
+
+import httpx
 from universal_mcp.applications import APIApplication
 from universal_mcp.integrations import Integration
 
+from universal_mcp_dialpad.blocklist import ADD, REMOVE, chunk_idempotency_key, chunks, diff_numbers
+from universal_mcp_dialpad.breaker import CircuitBreaker
+from universal_mcp_dialpad.cache import ResponseCache
+from universal_mcp_dialpad.columnar import ColumnarWriter, call_schema, iter_call_batches
+from universal_mcp_dialpad.contacts import UNCHANGED, WRITE_METHODS, ContactSnapshot, dedupe_contacts, read_contacts
+from universal_mcp_dialpad.duty import OperatorUpdateRun
+from universal_mcp_dialpad.exports import SHARD_DONE, BoundaryDeduper, ShardFailed, split_window
+from universal_mcp_dialpad.mirror import DirectoryMirror
+from universal_mcp_dialpad.operators import GROUP_ENDPOINTS, current_operators, desired_operators, normalize_group_type, operator_call, record_change, roster_diff, roster_report
+from universal_mcp_dialpad.optout import INVALID, OPTED_BACK_IN, OPTED_OUT, OptOutSet, with_state
+from universal_mcp_dialpad.pagination import iter_items, iter_pages, prefetch_pages
+from universal_mcp_dialpad.phones import NumberFormatter, PhoneIndex, normalize_number
+from universal_mcp_dialpad.provisioning import CREATE, ProvisioningRun, step_call
+from universal_mcp_dialpad.ratelimit import RateLimiter, shared_limiter
+from universal_mcp_dialpad.retry import IDEMPOTENCY_HEADER, RetryPolicy, current_idempotency_key, idempotency_key, retries_disabled, without_retries
+from universal_mcp_dialpad.sms import SENT, SenderPacer, batch_idempotency_key, batch_results, iter_sms_batches, opted_out_result, sms_message
+from universal_mcp_dialpad.stats import (
+    COMPLETE,
+    DOWNLOAD_TIMEOUT,
+    FAILED,
+    StatsBatch,
+    StatsJobError,
+    iter_column_batches,
+    iter_csv_rows,
+    iter_file_lines,
+    iter_record_batches,
+    job_state,
+    poll_intervals,
+    spill_path,
+)
+
+
+class CachedResponse(httpx.Response):
+    """
+    Response kept in the ResponseCache. Its JSON body is decoded once and the same object is
+    returned to every cache hit, so callers must treat it as read-only.
+    """
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "CachedResponse":
+        # The content is already decoded, so drop the headers describing the encoded body.
+        headers = [(name, value) for name, value in response.headers.multi_items() if name.lower() not in ("content-encoding", "content-length")]
+        return cls(response.status_code, headers=headers, content=response.content, request=response.request)
+
+    def json(self, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().json(**kwargs)
+        try:
+            return self._decoded
+        except AttributeError:
+            self._decoded = super().json()
+            return self._decoded
+
+
 class DialpadApp(APIApplication):
-    def __init__(self, integration: Integration = None, **kwargs) -> None:
+    def __init__(self, integration: Integration = None, cache: ResponseCache | bool = False, rate_limiter: RateLimiter | Mapping[str, tuple[float, float]] | bool = False, retry: RetryPolicy | bool = True, circuit_breaker: CircuitBreaker | bool = False, directory: DirectoryMirror | str | None = None, **kwargs) -> None:
+        """
+        Args:
+            integration (Integration): Supplies the Dialpad credentials.
+            cache (ResponseCache | bool): Opt-in cache for read-only GET endpoints. Pass True for the default per-endpoint TTLs or a configured ResponseCache.
+            rate_limiter (RateLimiter | Mapping | bool): Opt-in client-side throttling. Pass True to share the process-wide limiter with its default limits, a mapping of endpoint family to (requests per second, burst) to share it with those limits (see ratelimit.parse_limits), or a configured RateLimiter.
+            retry (RetryPolicy | bool): Retry policy for transient failures of idempotent requests. Enabled with defaults unless False is passed.
+            circuit_breaker (CircuitBreaker | bool): Opt-in per-endpoint circuit breaker that fails fast with CircuitOpenError while an endpoint keeps failing. Pass True for the defaults.
+            directory (DirectoryMirror | str): Local directory mirror behind the directory_* tools. Pass a SQLite file path to keep it across restarts, or a configured DirectoryMirror; in memory by default.
+        """
         super().__init__(name='dialpad', integration=integration, **kwargs)
         self.base_url = "https://dialpad.com/api/v2"
+        self.cache = ResponseCache() if cache is True else cache or None
+        if rate_limiter is True or isinstance(rate_limiter, Mapping):
+            self.rate_limiter = shared_limiter(None if rate_limiter is True else rate_limiter)
+        else:
+            self.rate_limiter = rate_limiter or None
+        self.retry = RetryPolicy() if retry is True else retry or None
+        self.circuit_breaker = CircuitBreaker() if circuit_breaker is True else circuit_breaker or None
+        self._limiter_key = None
+        self.phone_index = PhoneIndex()
+        self._phone_index_refresh: threading.Thread | None = None
+        self.number_formatter = NumberFormatter()
+        self.sms_opt_outs = OptOutSet()
+        self.contact_snapshots: dict[Any, ContactSnapshot] = {}
+        self.directory = directory if isinstance(directory, DirectoryMirror) else DirectoryMirror(self, directory or ":memory:")
+
+    def _rate_limit_key(self) -> str:
+        # Buckets are per credential; keep only a digest of it in the limiter. The digest is
+        # cached per header set, so a rotated token is charged to its own bucket.
+        headers = repr(sorted(self._get_headers().items()))
+        if self._limiter_key is None or self._limiter_key[0] != headers:
+            self._limiter_key = (headers, hashlib.sha256(headers.encode()).hexdigest()[:16])
+        return self._limiter_key[1]
+
+    def _request(self, method: str, url: str, params=None, data=None) -> httpx.Response:
+        """
+        Sends a single request to the Dialpad API. Every endpoint method funnels through here.
+
+        With a cache configured, fresh GET responses are served locally, stale ones are revalidated
+        with If-None-Match / If-Modified-Since (a 304 serves the stored body), and every other method
+        invalidates the entries it may have changed. Cached responses decode their JSON body only
+        once (see CachedResponse).
+
+        Args:
+            method (string): HTTP method, e.g. "GET" or "POST".
+            url (string): Absolute request URL.
+            params (dict): Query string parameters.
+            data (dict): JSON request body, or None for body-less methods.
+
+        Returns:
+            httpx.Response: The raw response; callers are responsible for raising on error status.
+        """
+        if self.cache is None:
+            return self._send(method, url, params=params, data=data)
+        if method != "GET":
+            try:
+                return self._send(method, url, params=params, data=data)
+            finally:
+                # Even a failed write may have been applied server-side, so invalidate regardless of outcome.
+                self.cache.invalidate_url(url)
+        cached = self.cache.get(url, params)
+        if cached is not None:
+            return cached
+        response = self._send(method, url, params=params, headers=self.cache.conditional_headers(url, params))
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            cached = self.cache.revalidate(url, params)
+            if cached is not None:
+                return cached
+            response = self._send(method, url, params=params)
+        if response.is_success:
+            response = CachedResponse.from_response(response)
+            self.cache.set(url, params, response, etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
+        return response
+
+    def _send(self, method: str, url: str, params=None, data=None, headers=None) -> httpx.Response:
+        """
+        Performs the HTTP exchange for _request. The request must pass the circuit breaker, which
+        records one outcome for it however many attempts it takes; each attempt waits for
+        rate-limiter capacity, and transient failures are retried according to self.retry.
+        """
+        key = current_idempotency_key()
+        if key is not None:
+            headers = {**(headers or {}), IDEMPOTENCY_HEADER: key}
+        retryable = self.retry is not None and not retries_disabled() and self.retry.allows(method, key)
+        circuit = self.circuit_breaker.before_request(url) if self.circuit_breaker is not None else None
+        failed = None
+        try:
+            attempt = 0
+            while True:
+                self._throttle(method, url)
+                try:
+                    response = self.client.request(method, url, params=params, json=data, headers=headers)
+                except httpx.TransportError:
+                    if not (retryable and self.retry.should_retry(attempt)):
+                        failed = True
+                        raise
+                    delay = self.retry.delay(attempt)
+                else:
+                    if not (retryable and self.retry.should_retry(attempt, response.status_code)):
+                        failed = response.is_server_error
+                        return response
+                    delay = self.retry.delay(attempt, response.headers.get("Retry-After"))
+                    response.close()
+                attempt += 1
+                time.sleep(delay)
+        finally:
+            # One outcome per logical request; requests that end otherwise (cancelled, other
+            # errors) only give back their half-open probe slot.
+            self._record_outcome(circuit, failed)
+
+    def _record_outcome(self, circuit: str | None, failed: bool | None) -> None:
+        if circuit is None:
+            return
+        if failed is None:
+            self.circuit_breaker.release(circuit)
+        elif failed:
+            self.circuit_breaker.record_failure(circuit)
+        else:
+            self.circuit_breaker.record_success(circuit)
+
+    def _throttle(self, method: str, url: str) -> None:
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve(self._rate_limit_key(), method, url)
+            if wait:
+                time.sleep(wait)
+
+    def _get(self, url, params=None) -> httpx.Response:
+        return self._request("GET", url, params=params)
+
+    def _post(self, url, data, params=None) -> httpx.Response:
+        return self._request("POST", url, params=params, data=data)
+
+    def _put(self, url, data, params=None) -> httpx.Response:
+        return self._request("PUT", url, params=params, data=data)
+
+    def _patch(self, url, data, params=None) -> httpx.Response:
+        return self._request("PATCH", url, params=params, data=data)
+
+    def _delete(self, url, params=None, data=None) -> httpx.Response:
+        return self._request("DELETE", url, params=params, data=data)
 
     def accesscontrolpolicies_assign(self, id, target_id=None, target_type=None, user_id=None) -> dict[str, Any]:
         """
@@ -950,7 +1153,7 @@ class DialpadApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/v2/callcenters/{id}/operators"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
         return response.json()
 
@@ -1418,7 +1621,7 @@ class DialpadApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/v2/channels/{id}/members"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
         return response.json()
 
@@ -1893,7 +2096,7 @@ class DialpadApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/v2/customivrs/{target_type}/{target_id}/{ivr_type}"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
         return response.json()
 
@@ -2219,7 +2422,7 @@ class DialpadApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/v2/departments/{id}/operators"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
         return response.json()
 
@@ -2902,7 +3105,7 @@ class DialpadApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/v2/offices/{id}/operators"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
         return response.json()
 
@@ -5182,6 +5385,1349 @@ class DialpadApp(APIApplication):
         response.raise_for_status()
         return response.json()
 
+    def paginate(self, method, *args, max_items=None, max_pages=None, prefetch=0, **kwargs) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item of a cursor-paginated list method, holding one page in memory at a time.
+
+        Args:
+            method (callable): A bound list method accepting a ``cursor`` keyword, e.g. ``self.users_list``.
+            *args: Positional arguments forwarded to ``method`` on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background. Each next-cursor request is issued as soon as the previous page arrives, overlapping network waits with item processing; 0 disables read-ahead.
+            **kwargs: Keyword filters forwarded to ``method`` on every page.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+        """
+        pages = iter_pages(lambda cursor: method(*args, cursor=cursor, **kwargs), max_pages=max_pages)
+        if prefetch:
+            pages = prefetch_pages(pages, depth=prefetch)
+        return iter_items(pages, max_items=max_items)
+
+    def iter_accesscontrolpolicies_list(self, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by accesscontrolpolicies_list, following the pagination cursor.
+
+        Args:
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            accesscontrolpolicies
+        """
+        return self.paginate(self.accesscontrolpolicies_list, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_accesscontrolpolicies_assignments(self, id, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by accesscontrolpolicies_assignments, following the pagination cursor.
+
+        Args:
+            id: Forwarded to accesscontrolpolicies_assignments on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            accesscontrolpolicies
+        """
+        return self.paginate(self.accesscontrolpolicies_assignments, id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_blockednumbers_list(self, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by blockednumbers_list, following the pagination cursor.
+
+        Args:
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            blockednumbers
+        """
+        return self.paginate(self.blockednumbers_list, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_call_list(self, started_after=None, started_before=None, target_id=None, target_type=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by call_list, following the pagination cursor.
+
+        Args:
+            started_after, started_before, target_id, target_type: Forwarded to call_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            call
+        """
+        return self.paginate(self.call_list, started_after=started_after, started_before=started_before, target_id=target_id, target_type=target_type, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_callcenters_listall(self, office_id=None, name_search=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by callcenters_listall, following the pagination cursor.
+
+        Args:
+            office_id, name_search: Forwarded to callcenters_listall on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            callcenters
+        """
+        return self.paginate(self.callcenters_listall, office_id=office_id, name_search=name_search, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_callrouters_list(self, office_id=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by callrouters_list, following the pagination cursor.
+
+        Args:
+            office_id: Forwarded to callrouters_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            callrouters
+        """
+        return self.paginate(self.callrouters_list, office_id=office_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_channels_list(self, state=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by channels_list, following the pagination cursor.
+
+        Args:
+            state: Forwarded to channels_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            channels
+        """
+        return self.paginate(self.channels_list, state=state, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_channels_members_list(self, id, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by channels_members_list, following the pagination cursor.
+
+        Args:
+            id: Forwarded to channels_members_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            channels
+        """
+        return self.paginate(self.channels_members_list, id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_coaching_team_listall(self, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by coaching_team_listall, following the pagination cursor.
+
+        Args:
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            coachingteams
+        """
+        return self.paginate(self.coaching_team_listall, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_company_sms_opt_out(self, id, opt_out_state, a2p_campaign_id=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by company_sms_opt_out, following the pagination cursor.
+
+        Args:
+            id, opt_out_state, a2p_campaign_id: Forwarded to company_sms_opt_out on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            company
+        """
+        return self.paginate(self.company_sms_opt_out, id, opt_out_state, a2p_campaign_id=a2p_campaign_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_conference_rooms_list(self, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by conference_rooms_list, following the pagination cursor.
+
+        Args:
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            conference
+        """
+        return self.paginate(self.conference_rooms_list, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_conference_meetings_list(self, room_id=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by conference_meetings_list, following the pagination cursor.
+
+        Args:
+            room_id: Forwarded to conference_meetings_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            conference
+        """
+        return self.paginate(self.conference_meetings_list, room_id=room_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_contacts_list(self, include_local=None, owner_id=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by contacts_list, following the pagination cursor.
+
+        Args:
+            include_local, owner_id: Forwarded to contacts_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            contacts
+        """
+        return self.paginate(self.contacts_list, include_local=include_local, owner_id=owner_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_custom_ivrs_get(self, target_type, target_id, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by custom_ivrs_get, following the pagination cursor.
+
+        Args:
+            target_type, target_id: Forwarded to custom_ivrs_get on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            customivrs, important
+        """
+        return self.paginate(self.custom_ivrs_get, target_type, target_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_departments_listall(self, office_id=None, name_search=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by departments_listall, following the pagination cursor.
+
+        Args:
+            office_id, name_search: Forwarded to departments_listall on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            departments
+        """
+        return self.paginate(self.departments_listall, office_id=office_id, name_search=name_search, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_numbers_list(self, status=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by numbers_list, following the pagination cursor.
+
+        Args:
+            status: Forwarded to numbers_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            numbers
+        """
+        return self.paginate(self.numbers_list, status=status, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_callcenters_list(self, office_id, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by callcenters_list, following the pagination cursor.
+
+        Args:
+            office_id: Forwarded to callcenters_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            offices
+        """
+        return self.paginate(self.callcenters_list, office_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_coaching_team_list(self, office_id, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by coaching_team_list, following the pagination cursor.
+
+        Args:
+            office_id: Forwarded to coaching_team_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            offices
+        """
+        return self.paginate(self.coaching_team_list, office_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_departments_list(self, office_id, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by departments_list, following the pagination cursor.
+
+        Args:
+            office_id: Forwarded to departments_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            offices
+        """
+        return self.paginate(self.departments_list, office_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_offices_list(self, active_only=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by offices_list, following the pagination cursor.
+
+        Args:
+            active_only: Forwarded to offices_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            offices
+        """
+        return self.paginate(self.offices_list, active_only=active_only, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_rooms_list(self, office_id=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by rooms_list, following the pagination cursor.
+
+        Args:
+            office_id: Forwarded to rooms_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            rooms
+        """
+        return self.paginate(self.rooms_list, office_id=office_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_schedule_reports_list(self, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by schedule_reports_list, following the pagination cursor.
+
+        Args:
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            schedulereports
+        """
+        return self.paginate(self.schedule_reports_list, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_webhook_agent_status_event_subscription_list(self, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by webhook_agent_status_event_subscription_list, following the pagination cursor.
+
+        Args:
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            subscriptions
+        """
+        return self.paginate(self.webhook_agent_status_event_subscription_list, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_webhook_call_event_subscription_list(self, target_type=None, target_id=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by webhook_call_event_subscription_list, following the pagination cursor.
+
+        Args:
+            target_type, target_id: Forwarded to webhook_call_event_subscription_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            subscriptions
+        """
+        return self.paginate(self.webhook_call_event_subscription_list, target_type=target_type, target_id=target_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_webhook_change_log_event_subscription_list(self, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by webhook_change_log_event_subscription_list, following the pagination cursor.
+
+        Args:
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            subscriptions
+        """
+        return self.paginate(self.webhook_change_log_event_subscription_list, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_webhook_contact_event_subscription_list(self, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by webhook_contact_event_subscription_list, following the pagination cursor.
+
+        Args:
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            subscriptions
+        """
+        return self.paginate(self.webhook_contact_event_subscription_list, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_webhook_sms_event_subscription_list(self, target_type=None, target_id=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by webhook_sms_event_subscription_list, following the pagination cursor.
+
+        Args:
+            target_type, target_id: Forwarded to webhook_sms_event_subscription_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            subscriptions
+        """
+        return self.paginate(self.webhook_sms_event_subscription_list, target_type=target_type, target_id=target_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_userdevices_list(self, user_id=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by userdevices_list, following the pagination cursor.
+
+        Args:
+            user_id: Forwarded to userdevices_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            userdevices
+        """
+        return self.paginate(self.userdevices_list, user_id=user_id, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_users_list(self, state=None, company_admin=None, email=None, number=None, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by users_list, following the pagination cursor.
+
+        Args:
+            state, company_admin, email, number: Forwarded to users_list on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            users
+        """
+        return self.paginate(self.users_list, state=state, company_admin=company_admin, email=email, number=number, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_webhooks_list(self, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by webhooks_list, following the pagination cursor.
+
+        Args:
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            webhooks
+        """
+        return self.paginate(self.webhooks_list, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def iter_websockets_list(self, max_items=None, max_pages=None, prefetch=0) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item returned by websockets_list, following the pagination cursor.
+
+        Args:
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background while items are consumed; 0 disables read-ahead.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+
+        Tags:
+            websockets
+        """
+        return self.paginate(self.websockets_list, max_items=max_items, max_pages=max_pages, prefetch=prefetch)
+
+    def export_calls(self, start, end, shards=8, concurrency=4, target_id=None, target_type=None, buffer_size=1000) -> Iterator[dict[str, Any]]:
+        """
+        Exports every call started in a time range by paging several sub-windows of call_list in parallel and streaming the results.
+
+        Args:
+            start (integer): Only calls started after this Unix timestamp (same unit as call_list's started_after).
+            end (integer): Only calls started before this Unix timestamp.
+            shards (integer): Number of sub-windows the range is split into.
+            concurrency (integer): Maximum number of windows being paged at the same time.
+            target_id (integer): Optional target ID forwarded to call_list.
+            target_type (string): Optional target type forwarded to call_list.
+            buffer_size (integer): Calls buffered per window that is fetched ahead of the one being read; bounds memory use.
+
+        Yields:
+            dict[str, Any]: Calls window by window, oldest window first and each in call_list's order, de-duplicated by call_id.
+
+        Tags:
+            call
+        """
+        windows = split_window(start, end, shards)
+        buffers = [queue.Queue(maxsize=buffer_size) for _ in windows]
+        stop = threading.Event()
+
+        def put(buffer, item):
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def fetch(window, buffer):
+            started_after, started_before = window
+            try:
+                with closing(self.iter_call_list(started_after=started_after, started_before=started_before, target_id=target_id, target_type=target_type)) as calls:
+                    for call in calls:
+                        if not put(buffer, call):
+                            return
+            except BaseException as exc:
+                put(buffer, ShardFailed(exc))
+            else:
+                put(buffer, SHARD_DONE)
+
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dialpad-export")
+        try:
+            for window, buffer in zip(windows, buffers):
+                pool.submit(fetch, window, buffer)
+            dedupe = BoundaryDeduper(windows)
+            for buffer in buffers:
+                while (item := buffer.get()) is not SHARD_DONE:
+                    if isinstance(item, ShardFailed):
+                        raise item.error
+                    if dedupe(item):
+                        yield item
+        finally:
+            # Tell running fetches to stop at their next call instead of paging on in the background.
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def wait_for_stats(self, request_id, timeout=600.0, initial_interval=1.0, max_interval=15.0) -> dict[str, Any]:
+        """
+        Polls stats_get until a stats request has finished, starting with short intervals and backing off up to max_interval.
+
+        Args:
+            request_id (string): The request_id returned by stats_create.
+            timeout (number): Seconds to wait for the result before giving up.
+            initial_interval (number): Seconds before the second poll.
+            max_interval (number): Upper bound for the delay between polls.
+
+        Returns:
+            dict[str, Any]: The completed stats_get response, including its download_url.
+
+        Raises:
+            StatsJobError: If Dialpad reports the request as failed.
+            TimeoutError: If the result is not ready within timeout seconds.
+
+        Tags:
+            stats
+        """
+        deadline = time.monotonic() + timeout
+        for delay in poll_intervals(initial_interval, maximum=max_interval):
+            result = self.stats_get(request_id)
+            state = job_state(result)
+            if state == COMPLETE:
+                return result
+            if state == FAILED:
+                raise StatsJobError(f"Stats request {request_id} failed: {result}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Stats request {request_id} was not ready after {timeout}s")
+            time.sleep(min(delay, remaining))
+
+    def iter_stats_result(self, result, types=None, infer_types=False, spill=None) -> Iterator[dict[str, Any]]:
+        """
+        Streams the CSV file behind a completed stats request and yields its rows as they are downloaded, holding one row in memory at a time.
+
+        Args:
+            result (dict): A completed stats_get response, as returned by wait_for_stats.
+            types (dict): Optional column name -> converter mapping, e.g. {"date": datetime.fromisoformat}; empty cells become None.
+            infer_types (boolean): Convert plainly numeric cells of the other columns to int or float.
+            spill (string | boolean): Download the file to this path (or to a temporary file if True, removed afterwards) before parsing it, so the HTTP connection is not held open while rows are consumed.
+
+        Yields:
+            dict[str, Any]: One row per iteration, keyed by the CSV header.
+
+        Tags:
+            stats
+        """
+        # The download URL is pre-signed, so it is fetched without the API credentials.
+        if not spill:
+            with httpx.stream("GET", result["download_url"], timeout=DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+                yield from iter_csv_rows(response.iter_lines(), types=types, infer_types=infer_types)
+            return
+        path = spill_path(spill)
+        try:
+            with httpx.stream("GET", result["download_url"], timeout=DOWNLOAD_TIMEOUT) as response, path.open("wb") as file:
+                response.raise_for_status()
+                for chunk in response.iter_bytes():
+                    file.write(chunk)
+            yield from iter_csv_rows(iter_file_lines(path), types=types, infer_types=infer_types)
+        finally:
+            if spill is True:
+                path.unlink(missing_ok=True)
+
+    def iter_stats_batches(self, result, batch_size=10000, arrow=False, types=None, infer_types=True, spill=None) -> Iterator[Any]:
+        """
+        Streams the file behind a completed stats request as columnar batches of at most batch_size rows.
+
+        Args:
+            result (dict): A completed stats_get response, as returned by wait_for_stats.
+            batch_size (integer): Maximum number of rows per batch.
+            arrow (boolean): Yield pyarrow.RecordBatch objects instead of dicts of lists; requires the optional pyarrow dependency.
+            types (dict): Optional column name -> converter mapping, e.g. {"date": datetime.fromisoformat}; empty cells become None.
+            infer_types (boolean): Convert plainly numeric cells of the other columns to int or float.
+            spill (string | boolean): Download the file to this path (or to a temporary file if True, removed afterwards) before parsing it, so the HTTP connection is not held open while rows are consumed.
+
+        Yields:
+            dict[str, list] | pyarrow.RecordBatch: One batch per iteration.
+
+        Tags:
+            stats
+        """
+        batches = iter_column_batches(self.iter_stats_result(result, types=types, infer_types=infer_types, spill=spill), batch_size=batch_size)
+        return iter_record_batches(batches) if arrow else batches
+
+    def iter_stats(self, timeout=600.0, types=None, infer_types=False, spill=None, **stats_params) -> Iterator[dict[str, Any]]:
+        """
+        Submits a stats request, waits for it to complete and lazily yields the rows of its result.
+
+        Args:
+            timeout (number): Seconds to wait for the result before giving up.
+            types (dict): Optional column name -> converter mapping, e.g. {"date": datetime.fromisoformat}; empty cells become None.
+            infer_types (boolean): Convert plainly numeric cells of the other columns to int or float.
+            spill (string | boolean): Download the file to this path (or to a temporary file if True, removed afterwards) before parsing it, so the HTTP connection is not held open while rows are consumed.
+            **stats_params: Arguments forwarded to stats_create, e.g. export_type="records".
+
+        Yields:
+            dict[str, Any]: One row per iteration.
+
+        Tags:
+            stats
+        """
+        request_id = self.stats_create(**stats_params)["request_id"]
+        yield from self.iter_stats_result(self.wait_for_stats(request_id, timeout=timeout), types=types, infer_types=infer_types, spill=spill)
+
+    def run_stats(self, coaching_group=None, coaching_team=None, days_ago_end=None, days_ago_start=None, export_type=None, group_by=None, is_today=None, office_id=None, stat_type=None, target_id=None, target_type=None, timezone=None, max_rows=1000, timeout=600) -> dict[str, Any]:
+        """
+        Submits a stats report, waits until Dialpad has produced it and returns the parsed rows, all in a single call.
+
+        Args:
+            coaching_group (boolean): Whether or not the the statistics should be for trainees of the coach group with the given target_id.
+            coaching_team (boolean): Whether or not the the statistics should be for trainees of the coach team with the given target_id.
+            days_ago_end (integer): End of the date range to get statistics for.
+
+        This is the number of days to look back relative to the current day. Used in conjunction with days_ago_start to specify a range.
+            days_ago_start (integer): Start of the date range to get statistics for.
+
+        This is the number of days to look back relative to the current day. Used in conjunction with days_ago_end to specify a range.
+            export_type (string): Whether to return aggregated statistics (stats), or individual rows for each record (records).
+
+        NOTE: For stat_type "csat" or "dispositions", only "records" is supported.
+            group_by (string): This param is only applicable when the stat_type is specified as call. For call stats, group calls by user per day (default), get total metrics by day, or break down by department and call center (office only).
+            is_today (boolean): Whether or not the statistics are for the current day.
+
+        NOTE: days_ago_start and days_ago_end are ignored if this is passed in.
+            office_id (integer): ID of the office to get statistics for.
+
+        If a target_id and target_type are passed in this value is ignored and instead the target is used.
+            stat_type (string): The type of statistics to be returned.
+
+        NOTE: if the value is "csat" or "dispositions", target_id and target_type must be specified.
+            target_id (integer): The target's id.
+            target_type (string): Target's type.
+            timezone (string): Timezone using a tz database name.
+            max_rows (integer): Maximum number of rows to return; the result is flagged as truncated beyond that.
+            timeout (integer): Seconds to wait for the report before giving up.
+
+        Returns:
+            dict[str, Any]: The request_id, the parsed rows and whether they were truncated to max_rows.
+
+        Raises:
+            StatsJobError: If Dialpad reports the request as failed.
+            TimeoutError: If the report is not ready within timeout seconds.
+
+        Tags:
+            stats
+        """
+        request_id = self.stats_create(coaching_group=coaching_group, coaching_team=coaching_team, days_ago_end=days_ago_end, days_ago_start=days_ago_start, export_type=export_type, group_by=group_by, is_today=is_today, office_id=office_id, stat_type=stat_type, target_id=target_id, target_type=target_type, timezone=timezone)["request_id"]
+        # Close the row stream (and its HTTP response) as soon as enough rows are read.
+        with closing(self.iter_stats_result(self.wait_for_stats(request_id, timeout=timeout))) as rows:
+            collected = list(islice(rows, max_rows + 1))
+        return {"request_id": request_id, "rows": collected[:max_rows], "truncated": len(collected) > max_rows}
+
+    def iter_stats_batch(self, jobs, concurrency=8, timeout=600.0, initial_interval=1.0, max_interval=15.0) -> Iterator[dict[str, Any]]:
+        """
+        Submits many stats requests concurrently and polls all of them from a single scheduler loop, yielding each one as soon as it finishes.
+
+        Args:
+            jobs (iterable): stats_create arguments per request, e.g. one dict with target_id and target_type per office. Consumed lazily.
+            concurrency (integer): Maximum number of requests submitted but not yet finished.
+            timeout (number): Seconds each request may take before it is reported as timed out.
+            initial_interval (number): Seconds before a request is first polled.
+            max_interval (number): Upper bound for the delay between polls of one request.
+
+        Yields:
+            dict[str, Any]: {"job", "request_id", "result", "error"} per request in completion order. "result" is the completed stats_get response (pass it to iter_stats_result for the rows); "error" holds the exception if the request failed or timed out.
+
+        Tags:
+            stats
+        """
+        batch = StatsBatch(jobs, concurrency=concurrency, timeout=timeout, initial_interval=initial_interval, max_interval=max_interval)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dialpad-stats") as pool:
+            while not batch.done:
+                calls = [(job, pool.submit(self.stats_create, **job.params)) for job in batch.ready_to_submit()]
+                calls += [(job, pool.submit(self.stats_get, job.request_id)) for job in batch.due()]
+                for job, future in calls:
+                    try:
+                        finished = batch.update(job, future.result())
+                    except Exception as exc:
+                        finished = batch.fail(job, exc)
+                    if finished is not None:
+                        yield finished
+                if not calls:
+                    time.sleep(batch.idle_time())
+
+    def export_calls_to_file(self, path, start, end, format="parquet", compression="zstd", batch_size=10000, shards=8, concurrency=4, target_id=None, target_type=None) -> dict[str, Any]:
+        """
+        Writes every call started in a time range to a compressed Parquet or Arrow IPC file with the fixed columnar.CALL_COLUMNS schema.
+
+        Args:
+            path (string): Destination file.
+            format (string): "parquet" or "arrow" (Arrow IPC file).
+            compression (string): Codec for the batches, e.g. "zstd", "lz4" or "snappy" (Parquet only); None disables compression.
+            batch_size (integer): Rows per written batch; bounds memory use.
+            start (integer): Only calls started after this Unix timestamp (same unit as call_list's started_after).
+            end (integer): Only calls started before this Unix timestamp.
+            shards (integer): Number of sub-windows fetched in parallel, see export_calls.
+            concurrency (integer): Maximum number of windows being paged at the same time.
+            target_id (integer): Optional target ID forwarded to call_list.
+            target_type (string): Optional target type forwarded to call_list.
+
+        Returns:
+            dict[str, Any]: The written path and number of rows.
+
+        Tags:
+            call
+        """
+        with ColumnarWriter(path, schema=call_schema(), format=format, compression=compression) as writer:
+            calls = self.export_calls(start, end, shards=shards, concurrency=concurrency, target_id=target_id, target_type=target_type)
+            for batch in iter_call_batches(calls, batch_size=batch_size):
+                writer.write(batch)
+        return {"path": str(writer.path), "rows": writer.rows}
+
+    def export_stats_to_file(self, path, format="parquet", compression="zstd", batch_size=10000, timeout=600.0, types=None, **stats_params) -> dict[str, Any]:
+        """
+        Runs a stats request (records export by default) and streams its result into a compressed Parquet or Arrow IPC file.
+
+        Args:
+            path (string): Destination file.
+            format (string): "parquet" or "arrow" (Arrow IPC file).
+            compression (string): Codec for the batches, e.g. "zstd", "lz4" or "snappy" (Parquet only); None disables compression.
+            batch_size (integer): Rows per written batch; bounds memory use.
+            timeout (number): Seconds to wait for the report before giving up.
+            types (dict): Optional column name -> converter mapping for typed columns; other columns are stored as text.
+            **stats_params: Arguments forwarded to stats_create; export_type defaults to "records".
+
+        Returns:
+            dict[str, Any]: The stats request_id, the written path and number of rows.
+
+        Tags:
+            stats
+        """
+        stats_params.setdefault("export_type", "records")
+        request_id = self.stats_create(**stats_params)["request_id"]
+        result = self.wait_for_stats(request_id, timeout=timeout)
+        with ColumnarWriter(path, format=format, compression=compression) as writer:
+            for batch in self.iter_stats_batches(result, batch_size=batch_size, types=types, infer_types=False, spill=True):
+                writer.write(batch)
+        return {"request_id": request_id, "path": str(writer.path), "rows": writer.rows}
+
+    def refresh_phone_index(self) -> int:
+        """
+        Rebuilds the in-process phone number index used by lookup_number from numbers_list and contacts_list.
+
+        Returns:
+            int: Number of distinct numbers indexed.
+
+        Tags:
+            numbers, contacts
+        """
+        return self.phone_index.build(self.iter_numbers_list(prefetch=1), self.iter_contacts_list(prefetch=1))
+
+    def _refresh_phone_index_in_background(self) -> None:
+        # Called with phone_index.refresh_lock held. On failure the stale index keeps answering and
+        # the next lookup tries again.
+        try:
+            self.refresh_phone_index()
+        except Exception:
+            pass
+        finally:
+            self.phone_index.refresh_lock.release()
+
+    def lookup_number(self, number, max_age=900.0) -> dict[str, Any]:
+        """
+        Resolves a phone number to the user, room, call router, office, department, call center or contact that owns it, from an in-process index instead of a numbers_get, users_list or contacts_list round-trip.
+
+        Args:
+            number (string): Phone number in E.164 or national format.
+            max_age (number): Seconds after which the index is rebuilt from numbers_list and contacts_list in the background; the stale index keeps answering meanwhile, and only the very first lookup waits for a build.
+
+        Returns:
+            dict[str, Any]: The E.164 number with its target_type, target_id, office_id and name (contacts only); target_type and target_id are None if no owner is known.
+
+        Tags:
+            numbers, contacts
+        """
+        index = self.phone_index
+        if index.built_at is None:
+            with index.refresh_lock:
+                if index.built_at is None:
+                    self.refresh_phone_index()
+        elif index.is_stale(max_age) and index.refresh_lock.acquire(blocking=False):
+            self._phone_index_refresh = threading.Thread(target=self._refresh_phone_index_in_background, daemon=True)
+            self._phone_index_refresh.start()
+        owner = index.lookup(number)
+        if owner is None:
+            return {"number": normalize_number(number, index.country), "target_type": None, "target_id": None, "office_id": None, "name": None}
+        return dict(owner)
+
+    def directory_owner_of_number(self, number, max_age=3600.0) -> dict[str, Any]:
+        """
+        Answers "who owns number X" from the local directory mirror: the user, office, department, call center or contact a number belongs to, with its mirrored record.
+
+        Args:
+            number (string): Phone number in E.164 or national format.
+            max_age (number): Seconds after which a kind of entity is re-synced from its list endpoint in the background; the mirror answers from its current state meanwhile.
+
+        Returns:
+            dict[str, Any]: kind, id and entity (entity is None for kinds that are not mirrored, such as rooms; all three are None if no owner is known), and stale, true while some kind has not been synced within max_age, including before the first sync completes.
+
+        Tags:
+            numbers, users, offices, contacts
+        """
+        stale = self.directory.refresh_in_background(max_age)
+        owner = self.directory.owner_of_number(number) or {"kind": None, "id": None, "entity": None}
+        return {**owner, "stale": stale}
+
+    def directory_office_of_user(self, user_id, max_age=3600.0) -> dict[str, Any]:
+        """
+        Answers "which office is user Y in" from the local directory mirror.
+
+        Args:
+            user_id (string): The user's id.
+            max_age (number): Seconds after which a kind of entity is re-synced from its list endpoint in the background; the mirror answers from its current state meanwhile.
+
+        Returns:
+            dict[str, Any]: office, the mirrored office or None if the user or their office is unknown, and stale, true while some kind has not been synced within max_age, including before the first sync completes.
+
+        Tags:
+            users, offices
+        """
+        stale = self.directory.refresh_in_background(max_age)
+        return {"office": self.directory.office_of_user(user_id), "stale": stale}
+
+    def ingest_change_log_events(self, events) -> int:
+        """
+        Applies change-log webhook events to the directory mirror and the phone index behind
+        lookup_number, e.g. as the consumer of a WebhookReceiver route subscribed with
+        ``self.directory.subscribe_change_log``.
+
+        Returns:
+            int: Number of events that concerned a mirrored entity.
+        """
+        count = 0
+        for event in events:
+            count += self.directory.apply_change_log_event(event)
+            self._patch_phone_index(event)
+        return count
+
+    def _patch_phone_index(self, event) -> None:
+        """
+        Carries a change-log event for a number or contact over to the phone index, from the
+        record the directory mirror has just stored.
+        """
+        parsed = DirectoryMirror.parse_change_log_event(event)
+        if parsed is None or parsed[0] not in ("numbers", "contacts"):
+            return
+        kind, entity_id, _, deleted = parsed
+        item = None if deleted else self.directory.get(kind, entity_id)
+        if kind == "numbers":
+            if item is None:
+                self.phone_index.remove_number(entity_id)
+            else:
+                self.phone_index.update_number(item)
+        elif item is None:
+            self.phone_index.remove_contact(entity_id)
+        else:
+            self.phone_index.update_contact(item)
+
+    def _format_remote(self, number, country_code) -> dict[str, Any] | None:
+        try:
+            return self.format_post(country_code=country_code, number=number)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.is_client_error:
+                return None
+            raise
+
+    def normalize_numbers(self, numbers, country_code="US", remote_fallback=True, concurrency=8) -> list[dict[str, Any]]:
+        """
+        Normalises a batch of phone numbers to E.164 locally, calling format_post only for the numbers the offline rules cannot settle and remembering its answers.
+
+        Args:
+            numbers (array): Phone numbers in any common national or international format.
+            country_code (string): ISO 3166-1 alpha-2 country used to read national numbers, as for format_post.
+            remote_fallback (boolean): Ask format_post about ambiguous numbers; if False they are returned unresolved.
+            concurrency (integer): Maximum number of format_post calls in flight.
+
+        Returns:
+            list[dict[str, Any]]: One {"number", "e164", "source"} entry per input, in order. source is "local", "cache" or "remote"; e164 is None for numbers that are invalid, and source too for those left unresolved.
+
+        Tags:
+            numbers
+        """
+        results, pending = self.number_formatter.plan(numbers, country_code)
+        if remote_fallback and pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pending)))) as pool:
+                futures = {number: pool.submit(self._format_remote, number, country_code) for number in pending}
+            for number, future in futures.items():
+                if future.exception() is None:
+                    self.number_formatter.record(number, country_code, future.result())
+        return self.number_formatter.complete(results, country_code)
+
+    def refresh_sms_opt_outs(self, company_id, a2p_campaign_id=None, full=False) -> dict[str, Any]:
+        """
+        Loads or refreshes the local SMS opt-out set that send_sms_bulk filters recipients against, from company_sms_opt_out pages of both opt-out states.
+
+        Args:
+            company_id (string): The company ID, as for company_sms_opt_out.
+            a2p_campaign_id (integer): Optional A2P campaign to restrict the opt-outs to.
+            full (boolean): Rebuild the set from scratch. Otherwise, once the set has been loaded, only the entries not seen before (dated from the last refresh's newest entry on) are applied to it. company_sms_opt_out has no date filter, so both listings are still paged in full either way.
+
+        Returns:
+            dict[str, Any]: The number of opted-out numbers held locally, whether the set was rebuilt and, if not, how many newer entries were applied, and how many entries were skipped because their recipient cannot be read.
+
+        Tags:
+            company, sms
+        """
+        entries = (
+            entry
+            for state in (OPTED_OUT, OPTED_BACK_IN)
+            for entry in with_state(self.iter_company_sms_opt_out(company_id, state, a2p_campaign_id=a2p_campaign_id, prefetch=1), state)
+        )
+        opt_outs = self.sms_opt_outs
+        rebuilt = full or opt_outs.built_at is None
+        applied = 0
+        if rebuilt:
+            opt_outs.build(entries)
+        else:
+            applied = opt_outs.apply(entries)
+        return {"opted_out": len(opt_outs), "rebuilt": rebuilt, "applied": applied, "skipped": opt_outs.skipped}
+
+    def _send_sms_batch(self, batch, pacer, infer_country_code=None, campaign_id=None) -> dict[str, Any]:
+        delay = pacer.reserve(batch["sender_key"], len(batch["to_numbers"]))
+        if delay:
+            time.sleep(delay)
+        params = dict(batch["sender"], text=batch["text"], media=batch["media"], to_numbers=batch["to_numbers"], infer_country_code=infer_country_code)
+        if campaign_id is None:
+            return self.sms_send(**params)
+        with idempotency_key(batch_idempotency_key(campaign_id, batch)):
+            return self.sms_send(**params)
+
+    def send_sms_bulk(self, messages, from_number=None, user_id=None, sender_group_id=None, sender_group_type=None, infer_country_code=None, max_recipients=1, concurrency=8, rate=1.0, burst=10, campaign_id=None, exclude_opted_out=True) -> dict[str, Any]:
+        """
+        Sends many SMS messages, one sms_send per recipient unless grouping is requested, pacing each sender to its throughput limit and keeping several sends in flight.
+
+        Args:
+            messages (array): Items of (to_number, text) or (to_number, text, media), or objects with to_number, text, optional media and optional from_number, user_id, sender_group_id or sender_group_type overriding the defaults below. Consumed lazily.
+            from_number (string): Default number to send from; overrides user_id and sender_group_id, as for sms_send.
+            user_id (integer): Default user to send as.
+            sender_group_id (integer): Default office, department or call center to send on behalf of.
+            sender_group_type (string): Type of sender_group_id (office, department or callcenter).
+            infer_country_code (boolean): Forwarded to sms_send.
+            max_recipients (integer): Recipients per sms_send call, at most 10. Defaults to 1. Larger values merge recipients of the same text into one group message, in which every recipient sees the others' numbers; only use them for intended group conversations.
+            concurrency (integer): Maximum number of sms_send calls in flight.
+            rate (number): Messages per second allowed per sender; each recipient counts as one message.
+            burst (number): Messages a sender may send at once before pacing starts.
+            campaign_id (string): Optional campaign identifier; each batch then carries a stable Idempotency-Key so failed batches are retried safely.
+            exclude_opted_out (boolean): Skip recipients in the local opt-out set loaded by refresh_sms_opt_outs, and recipients whose number cannot be read (after dropping a tel: prefix and any extension), which are reported as invalid instead of being sent.
+
+        Returns:
+            dict[str, Any]: Counts of sent, failed, opted-out and invalid recipients and a per-recipient report of {"to_number", "sender", "status", "id", "error"}; id is only set for messages sent to a single recipient.
+
+        Tags:
+            sms
+        """
+        defaults = {"from_number": from_number, "user_id": user_id, "sender_group_id": sender_group_id, "sender_group_type": sender_group_type}
+        pacer = SenderPacer(rate=rate, burst=burst)
+        results = []
+        in_flight = {}
+
+        def deliverable():
+            for item in messages:
+                message = sms_message(item, defaults)
+                status = self.sms_opt_outs.status(message["to_number"]) if exclude_opted_out else None
+                if status is not None:
+                    results.append(opted_out_result(message, status))
+                else:
+                    yield message
+
+        batches = iter_sms_batches(deliverable(), max_recipients=max_recipients)
+
+        def collect(done):
+            for future in done:
+                batch = in_flight.pop(future)
+                error = future.exception()
+                results.extend(batch_results(batch, None if error else future.result(), error))
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dialpad-sms") as pool:
+            for batch in batches:
+                if len(in_flight) >= concurrency:
+                    collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+                in_flight[pool.submit(self._send_sms_batch, batch, pacer, infer_country_code, campaign_id)] = batch
+            collect(wait(in_flight).done)
+        sent = sum(result["status"] == SENT for result in results)
+        opted_out = sum(result["status"] == OPTED_OUT for result in results)
+        invalid = sum(result["status"] == INVALID for result in results)
+        return {"sent": sent, "failed": len(results) - sent - opted_out - invalid, "opted_out": opted_out, "invalid": invalid, "results": results}
+
+    def _provision_step(self, step, spec, user_id) -> dict[str, Any]:
+        if step == CREATE and spec.get("email"):
+            # A user created by an interrupted run may not have reached the checkpoint; reuse it.
+            existing = next(self.iter_users_list(email=spec["email"], max_items=1), None)
+            if existing is not None:
+                return existing
+        name, kwargs = step_call(step, spec, user_id)
+        return getattr(self, name)(**kwargs)
+
+    def provision_users(self, users, checkpoint=None, concurrency=8) -> dict[str, Any]:
+        """
+        Provisions many users from declarative specs: creates each user, then runs its office move, number assignment, caller ID, E911 address and office operator steps as a dependency graph, executing independent steps concurrently and checkpointing progress so a failed run can be resumed.
+
+        Args:
+            users (array): User specs with the users_create fields (email, first_name, last_name, license, office_id, auto_assign) and optionally key (defaults to email), move_office_id, number or area_code with primary, caller_id, e911 (address, address2, city, state, zip, country, use_validated_option) and operator_offices (office IDs, or objects with office_id and role).
+            checkpoint (string): Optional JSON file recording finished steps and created user IDs; rerunning with the same specs and file skips what already succeeded.
+            concurrency (integer): Maximum number of API calls in flight. Pair with the app's rate_limiter to stay within Dialpad's limits.
+
+        Returns:
+            dict[str, Any]: Counts of fully provisioned and failed users, and per user (by key) its user_id with the done, failed (step -> error) and blocked steps.
+
+        Tags:
+            users
+        """
+        run = ProvisioningRun(users, checkpoint)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dialpad-provision") as pool:
+            in_flight = {}
+            while True:
+                for key, step, spec, user_id in run.ready():
+                    in_flight[pool.submit(self._provision_step, step, spec, user_id)] = (key, step)
+                if not in_flight:
+                    break
+                for future in wait(in_flight, return_when=FIRST_COMPLETED).done:
+                    key, step = in_flight.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        run.complete(key, step, future.result())
+                    else:
+                        run.fail(key, step, error)
+        return run.report()
+
+    def upsert_contacts(self, contacts, owner_id=None, country_code="US", concurrency=8, snapshot_max_age=300.0, dry_run=False) -> dict[str, Any]:
+        """
+        Creates or updates contacts in bulk from a CSV/JSONL file or a list, skipping records that match an existing contact exactly and writing the rest concurrently.
+
+        Records are normalised (E.164 phones, lower-cased emails) and merged when they share a uid, phone or email. Each one is compared with a snapshot of contacts_list: records with a uid go through contacts_create_with_uid, matched records without one through contacts_update with only the changed fields, and the rest through contacts_create.
+
+        Args:
+            contacts (string | array): Path of a CSV file (contact field names as header, multiple emails/phones/urls separated by ";") or JSONL file, or a list of contact objects.
+            owner_id (string): Owner of the contacts (a user ID) for local contacts; the snapshot is taken for this owner. Omit for shared company contacts.
+            country_code (string): ISO 3166-1 alpha-2 country used to normalise national phone numbers.
+            concurrency (integer): Maximum number of writes in flight.
+            snapshot_max_age (number): Seconds the contacts_list snapshot is reused before it is taken again.
+            dry_run (boolean): Only count what would be written.
+
+        Returns:
+            dict[str, Any]: Number of contacts per action (create, upsert_uid, update, unchanged), the number of failed writes and their errors.
+
+        Tags:
+            contacts
+        """
+        if isinstance(contacts, (str, os.PathLike)):
+            contacts = read_contacts(contacts)
+        snapshot = self.contact_snapshots.setdefault(owner_id, ContactSnapshot(country_code))
+        if snapshot.is_stale(snapshot_max_age):
+            snapshot.build(self.iter_contacts_list(owner_id=owner_id, include_local=True if owner_id is not None else None, prefetch=1))
+        counts = {**dict.fromkeys((*WRITE_METHODS, UNCHANGED), 0), "failed": 0}
+        errors = []
+
+        def planned():
+            for contact in dedupe_contacts(contacts, country_code):
+                if owner_id is not None:
+                    contact.setdefault("owner_id", str(owner_id))
+                action, kwargs = snapshot.plan(contact)
+                if action == UNCHANGED or dry_run:
+                    counts[action] += 1
+                else:
+                    yield action, kwargs
+
+        def collect(action, kwargs, result, error):
+            if error is None:
+                counts[action] += 1
+                snapshot.record(result if isinstance(result, dict) and result.get("id") is not None else kwargs)
+            else:
+                counts["failed"] += 1
+                errors.append({"action": action, "contact": kwargs, "error": str(error)})
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dialpad-contacts") as pool:
+            in_flight = {}
+            for action, kwargs in planned():
+                if len(in_flight) >= concurrency:
+                    for future in wait(in_flight, return_when=FIRST_COMPLETED).done:
+                        collect(*in_flight.pop(future), None if future.exception() else future.result(), future.exception())
+                in_flight[pool.submit(getattr(self, WRITE_METHODS[action]), **kwargs)] = (action, kwargs)
+            for future in wait(in_flight).done:
+                collect(*in_flight.pop(future), None if future.exception() else future.result(), future.exception())
+        return {**counts, "errors": errors}
+
+    def _change_blocked_numbers(self, action, numbers) -> Any:
+        method = self.blockednumbers_add if action == ADD else self.blockednumbers_remove
+        with idempotency_key(chunk_idempotency_key(action, numbers)):
+            return method(numbers=numbers)
+
+    def sync_blocked_numbers(self, desired, country_code="US", remove_extra=True, chunk_size=500, concurrency=4, dry_run=False) -> dict[str, Any]:
+        """
+        Converges the company's blocked numbers to a desired set: pages blockednumbers_list, computes which numbers to add and remove, and applies the difference in chunked, concurrent blockednumbers_add / blockednumbers_remove calls.
+
+        Args:
+            desired (array): Numbers that should be blocked, in E.164 or national format.
+            country_code (string): ISO 3166-1 alpha-2 country used to read national numbers.
+            remove_extra (boolean): Unblock numbers that are blocked but not desired; if False, numbers are only added.
+            chunk_size (integer): Numbers per add/remove call.
+            concurrency (integer): Maximum number of add/remove calls in flight.
+            dry_run (boolean): Only compute the difference.
+
+        Returns:
+            dict[str, Any]: Counts of added, removed and unchanged numbers, the desired entries that are not valid numbers, and the chunks that failed with their errors.
+
+        Tags:
+            blockednumbers
+        """
+        current = (item.get("number") for item in self.iter_blockednumbers_list(prefetch=1))
+        to_add, to_remove, unchanged, invalid = diff_numbers(current, desired, country_code)
+        if not remove_extra:
+            to_remove = []
+        report = {"added": 0, "removed": 0, "unchanged": unchanged, "invalid": invalid, "failed": []}
+        if dry_run:
+            return {**report, "added": len(to_add), "removed": len(to_remove)}
+        calls = [(ADD, chunk) for chunk in chunks(to_add, chunk_size)] + [(REMOVE, chunk) for chunk in chunks(to_remove, chunk_size)]
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dialpad-blocked") as pool:
+            futures = {pool.submit(self._change_blocked_numbers, action, chunk): (action, chunk) for action, chunk in calls}
+            for future, (action, chunk) in futures.items():
+                if future.exception() is None:
+                    report["added" if action == ADD else "removed"] += len(chunk)
+                else:
+                    report["failed"].append({"action": action, "numbers": chunk, "error": str(future.exception())})
+        return report
+
+    def reconcile_operators(self, rosters, remove_extra=True, concurrency=8, dry_run=False) -> dict[str, Any]:
+        """
+        Reconciles the operator rosters of many call centers, departments and offices at once: fetches every current roster concurrently, computes the minimal additions and removals against the desired operators, and applies them in parallel.
+
+        Args:
+            rosters (array): Desired rosters, each with group_type (callcenter, department or office), group_id and operators: user IDs, or objects with id and optionally type (user or room; call centers take users only), role and, for call centers, skill_level, license_type and keep_paid_numbers.
+            remove_extra (boolean): Remove operators that are on a roster but not desired; if False, operators are only added.
+            concurrency (integer): Maximum number of API calls in flight. Pair with the app's rate_limiter to stay within Dialpad's limits.
+            dry_run (boolean): Only fetch the rosters and report the changes that would be made.
+
+        Returns:
+            dict[str, Any]: Totals of added, removed and failed operator changes, and per group the operators added and removed, the failed changes with their errors, and an error if its roster could not be fetched.
+
+        Tags:
+            callcenters, departments, offices
+        """
+        groups = {}
+        for roster in rosters:
+            group_type = normalize_group_type(roster["group_type"])
+            if (group_type, str(roster["group_id"])) in groups:
+                raise ValueError(f"Duplicate roster for {group_type} {roster['group_id']}")
+            groups[(group_type, str(roster["group_id"]))] = (group_type, roster["group_id"], desired_operators(group_type, roster.get("operators") or ()))
+        reports = [{"group_type": group_type, "group_id": group_id, "added": [], "removed": [], "failed": []} for group_type, group_id, _ in groups.values()]
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dialpad-operators") as pool:
+            fetches = [pool.submit(getattr(self, f"{GROUP_ENDPOINTS[group_type]}_get"), group_id) for group_type, group_id, _ in groups.values()]
+            changes = {}
+            for report, (group_type, group_id, desired), fetch in zip(reports, groups.values(), fetches):
+                if fetch.exception() is not None:
+                    report["error"] = str(fetch.exception())
+                    continue
+                for action, operator in roster_diff(current_operators(fetch.result()), desired, remove_extra):
+                    if dry_run:
+                        record_change(report, action, operator)
+                        continue
+                    method, kwargs = operator_call(group_type, group_id, action, operator)
+                    changes[pool.submit(getattr(self, method), **kwargs)] = (report, action, operator)
+            for future, (report, action, operator) in changes.items():
+                record_change(report, action, operator, future.exception())
+        return roster_report(reports)
+
+    def _update_operator(self, method, kwargs) -> Any:
+        # OperatorUpdateRun retries within the deadline itself; the app's retry policy would
+        # stack its own attempts and Retry-After waits on top.
+        with without_retries():
+            return getattr(self, method)(**kwargs)
+
+    def update_operators(self, updates, deadline=30.0, concurrency=16, max_attempts=3) -> dict[str, Any]:
+        """
+        Updates the duty status and/or skill level of many call center operators at once, e.g. at a shift change. Updates run concurrently under a deadline; failed updates are retried with backoff while time remains.
+
+        Args:
+            updates (array): Operator updates, each with user_id and on_duty and/or duty_status_reason (callcenters_operators_dutystatus) and/or skill_level with the call_center_id it applies to (callcenters_operators_skilllevel).
+            deadline (number): Seconds within which all updates must be done; updates not sent by then are reported as timed out, and updates sent but not yet answered as in flight (Dialpad may still apply them).
+            concurrency (integer): Maximum number of updates in flight. Pair with the app's rate_limiter to stay within Dialpad's limits.
+            max_attempts (integer): Attempts per update, counting the first. Only connection errors, throttling and server errors are retried, by this tool rather than the app's retry policy.
+
+        Returns:
+            dict[str, Any]: Counts of succeeded, failed, timed-out and in-flight updates, and per operator (in input order) the status, attempts and last error of its duty status and skill level updates.
+
+        Tags:
+            callcenters
+        """
+        run = OperatorUpdateRun(updates, deadline, max_attempts)
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dialpad-duty")
+        in_flight = {}
+        try:
+            while not run.done and not run.expired:
+                for index, kind, method, kwargs in run.ready():
+                    in_flight[pool.submit(self._update_operator, method, kwargs)] = (index, kind)
+                if not in_flight:
+                    time.sleep(run.wait_time())
+                    continue
+                for future in wait(in_flight, timeout=run.wait_time(), return_when=FIRST_COMPLETED).done:
+                    index, kind = in_flight.pop(future)
+                    if future.exception() is None:
+                        run.complete(index, kind)
+                    else:
+                        run.fail(index, kind, future.exception())
+        finally:
+            # Don't hold the caller past the deadline for requests that are still running; the
+            # ones that never started are withdrawn, the others are reported as in flight.
+            for future, (index, kind) in in_flight.items():
+                if future.cancel():
+                    run.withdraw(index, kind)
+            pool.shutdown(wait=False)
+        return run.report()
+
     def list_tools(self):
         return [
             self.accesscontrolpolicies_assign,
@@ -5197,6 +6743,7 @@ class DialpadApp(APIApplication):
             self.blockednumbers_get,
             self.blockednumbers_remove,
             self.blockednumbers_list,
+            self.sync_blocked_numbers,
             self.call_participants_add,
             self.call_get_call_info,
             self.call_initiate_ivr_call,
@@ -5218,9 +6765,11 @@ class DialpadApp(APIApplication):
             self.callcenters_operators_dutystatus,
             self.callcenters_operators_get_skilllevel,
             self.callcenters_operators_skilllevel,
+            self.update_operators,
             self.callcenters_operators_delete,
             self.callcenters_operators_get,
             self.callcenters_operators_post,
+            self.reconcile_operators,
             self.calllabel_list,
             self.call_review_share_link_create,
             self.call_review_share_link_delete,
@@ -5253,6 +6802,7 @@ class DialpadApp(APIApplication):
             self.contacts_list,
             self.contacts_create,
             self.contacts_create_with_uid,
+            self.upsert_contacts,
             self.ivr_delete,
             self.ivr_update,
             self.custom_ivrs_get,
@@ -5271,8 +6821,12 @@ class DialpadApp(APIApplication):
             self.numbers_assign_target_number_post,
             self.numbers_delete,
             self.numbers_get,
+            self.lookup_number,
+            self.directory_owner_of_number,
+            self.directory_office_of_user,
             self.numbers_list,
             self.format_post,
+            self.normalize_numbers,
             self.oauth2_authorize_get,
             self.oauth2_deauthorize_post,
             self.plan_get,
@@ -5312,8 +6866,11 @@ class DialpadApp(APIApplication):
             self.schedule_reports_list,
             self.schedule_reports_create,
             self.sms_send,
+            self.send_sms_bulk,
+            self.refresh_sms_opt_outs,
             self.stats_get,
             self.stats_create,
+            self.run_stats,
             self.webhook_agent_status_event_subscription_list,
             self.webhook_agent_status_event_subscription_create,
             self.webhook_agent_status_event_subscription_delete,
@@ -5363,6 +6920,7 @@ class DialpadApp(APIApplication):
             self.users_update,
             self.users_list,
             self.users_create,
+            self.provision_users,
             self.users_move_office_patch,
             self.users_update_status,
             self.webhooks_list,
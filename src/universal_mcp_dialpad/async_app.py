@@ -0,0 +1,1247 @@
+import asyncio
+import functools
+import importlib.util
+import os
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from itertools import islice
+from typing import Any
+
+import httpx
+from universal_mcp.integrations import Integration
+
+from universal_mcp_dialpad.app import CachedResponse, DialpadApp
+from universal_mcp_dialpad.blocklist import ADD, REMOVE, chunk_idempotency_key, chunks, diff_numbers
+from universal_mcp_dialpad.columnar import ColumnarWriter, call_schema, iter_call_batches
+from universal_mcp_dialpad.contacts import UNCHANGED, WRITE_METHODS, ContactSnapshot, dedupe_contacts, read_contacts
+from universal_mcp_dialpad.duty import OperatorUpdateRun
+from universal_mcp_dialpad.exports import SHARD_DONE, BoundaryDeduper, ShardFailed, split_window
+from universal_mcp_dialpad.operators import GROUP_ENDPOINTS, current_operators, desired_operators, normalize_group_type, operator_call, record_change, roster_diff, roster_report
+from universal_mcp_dialpad.optout import INVALID, OPTED_BACK_IN, OPTED_OUT
+from universal_mcp_dialpad.pagination import aiter_items, aiter_pages, aprefetch_pages
+from universal_mcp_dialpad.phones import canonical_number, normalize_number
+from universal_mcp_dialpad.provisioning import CREATE, ProvisioningRun, step_call
+from universal_mcp_dialpad.retry import IDEMPOTENCY_HEADER, current_idempotency_key, idempotency_key, retries_disabled, without_retries
+from universal_mcp_dialpad.sms import SENT, SenderPacer, batch_idempotency_key, batch_results, iter_sms_batches, opted_out_result, sms_message
+from universal_mcp_dialpad.stats import (
+    COMPLETE,
+    DOWNLOAD_TIMEOUT,
+    FAILED,
+    CsvRowParser,
+    StatsBatch,
+    StatsJobError,
+    coerce_row,
+    iter_column_batches,
+    iter_csv_rows,
+    iter_file_lines,
+    iter_record_batches,
+    job_state,
+    poll_intervals,
+    spill_path,
+)
+
+# HTTP/2 needs the optional ``h2`` package (``pip install universal-mcp-dialpad[http2]``).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Rows parsed per worker-thread hop when reading a spilled stats file.
+SPILL_BLOCK_ROWS = 1000
+
+
+class _RequestBuilder:
+    """
+    Stands in for the app while a generated DialpadApp endpoint runs: the endpoint validates its
+    arguments and builds its request as usual, and the builder records that request instead of
+    sending it.
+    """
+
+    _get = DialpadApp._get
+    _post = DialpadApp._post
+    _put = DialpadApp._put
+    _patch = DialpadApp._patch
+    _delete = DialpadApp._delete
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self.request: tuple[str, str, Any, Any] | None = None
+
+    def _request(self, method: str, url: str, params=None, data=None) -> "_RequestBuilder":
+        self.request = (method, url, params, data)
+        return self
+
+    def raise_for_status(self) -> "_RequestBuilder":
+        return self
+
+    def json(self) -> "_RequestBuilder":
+        return self
+
+
+def _coroutine_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Turns a generated DialpadApp endpoint into its coroutine counterpart, which sends the request
+    the sync endpoint builds through AsyncDialpadApp._request.
+    """
+
+    @functools.wraps(endpoint)
+    async def call(self, *args, **kwargs):
+        builder = _RequestBuilder(self.base_url)
+        endpoint(builder, *args, **kwargs)
+        if builder.request is None:
+            raise TypeError(f"{endpoint.__name__} is not a generated endpoint; AsyncDialpadApp must override it")
+        method, url, params, data = builder.request
+        response = await self._request(method, url, params=params, data=data)
+        response.raise_for_status()
+        return response.json()
+
+    return call
+
+
+class AsyncDialpadApp(DialpadApp):
+    """
+    Coroutine twin of DialpadApp. Every tool is an ``async def`` that shares one
+    keep-alive (HTTP/2 when available) connection pool, so a single server process
+    can keep many Dialpad round-trips in flight at once.
+
+    The generated endpoints are not repeated here: each one reuses the DialpadApp endpoint to
+    validate its arguments and build its request (see _coroutine_endpoint), and the inherited
+    ``iter_*`` methods page through them with the async paginate(). Only the hand-written tools,
+    which differ in how they wait and fan out, have their own coroutine versions below.
+    """
+
+    def __init__(self, integration: Integration = None, max_connections: int = 100, max_keepalive_connections: int = 20, timeout: float = 180, **kwargs) -> None:
+        super().__init__(integration=integration, **kwargs)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        self.timeout = timeout
+        self._async_client: httpx.AsyncClient | None = None
+        self._phone_index_lock = asyncio.Lock()
+        self._phone_index_task: asyncio.Task | None = None
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(
+                headers=self._get_headers(),
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=HTTP2_AVAILABLE,
+            )
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """
+        Closes the shared connection pool. The next request transparently opens a new one.
+        """
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    async def __aenter__(self) -> "AsyncDialpadApp":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _request(self, method: str, url: str, params=None, data=None) -> httpx.Response:
+        if self.cache is None:
+            return await self._send(method, url, params=params, data=data)
+        if method != "GET":
+            try:
+                return await self._send(method, url, params=params, data=data)
+            finally:
+                # Even a failed write may have been applied server-side, so invalidate regardless of outcome.
+                self.cache.invalidate_url(url)
+        cached = self.cache.get(url, params)
+        if cached is not None:
+            return cached
+        response = await self._send(method, url, params=params, headers=self.cache.conditional_headers(url, params))
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            cached = self.cache.revalidate(url, params)
+            if cached is not None:
+                return cached
+            response = await self._send(method, url, params=params)
+        if response.is_success:
+            response = CachedResponse.from_response(response)
+            self.cache.set(url, params, response, etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
+        return response
+
+    async def _send(self, method: str, url: str, params=None, data=None, headers=None) -> httpx.Response:
+        key = current_idempotency_key()
+        if key is not None:
+            headers = {**(headers or {}), IDEMPOTENCY_HEADER: key}
+        retryable = self.retry is not None and not retries_disabled() and self.retry.allows(method, key)
+        circuit = self.circuit_breaker.before_request(url) if self.circuit_breaker is not None else None
+        failed = None
+        try:
+            attempt = 0
+            while True:
+                await self._throttle(method, url)
+                try:
+                    response = await self.async_client.request(method, url, params=params, json=data, headers=headers)
+                except httpx.TransportError:
+                    if not (retryable and self.retry.should_retry(attempt)):
+                        failed = True
+                        raise
+                    delay = self.retry.delay(attempt)
+                else:
+                    if not (retryable and self.retry.should_retry(attempt, response.status_code)):
+                        failed = response.is_server_error
+                        return response
+                    delay = self.retry.delay(attempt, response.headers.get("Retry-After"))
+                    await response.aclose()
+                attempt += 1
+                await asyncio.sleep(delay)
+        finally:
+            # One outcome per logical request; requests that end otherwise (cancelled, other
+            # errors) only give back their half-open probe slot.
+            self._record_outcome(circuit, failed)
+
+    async def _throttle(self, method: str, url: str) -> None:
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve(self._rate_limit_key(), method, url)
+            if wait:
+                await asyncio.sleep(wait)
+
+    async def _get(self, url, params=None) -> httpx.Response:
+        return await self._request("GET", url, params=params)
+
+    async def _post(self, url, data, params=None) -> httpx.Response:
+        return await self._request("POST", url, params=params, data=data)
+
+    async def _put(self, url, data, params=None) -> httpx.Response:
+        return await self._request("PUT", url, params=params, data=data)
+
+    async def _patch(self, url, data, params=None) -> httpx.Response:
+        return await self._request("PATCH", url, params=params, data=data)
+
+    async def _delete(self, url, params=None, data=None) -> httpx.Response:
+        return await self._request("DELETE", url, params=params, data=data)
+
+    def paginate(self, method, *args, max_items=None, max_pages=None, prefetch=0, **kwargs) -> AsyncIterator[dict[str, Any]]:
+        """
+        Lazily iterates over every item of a cursor-paginated list method, holding one page in memory at a time.
+
+        Args:
+            method (callable): A bound list coroutine method accepting a ``cursor`` keyword, e.g. ``self.users_list``.
+            *args: Positional arguments forwarded to ``method`` on every page.
+            max_items (integer): Stop after yielding this many items.
+            max_pages (integer): Stop after fetching this many pages.
+            prefetch (integer): Number of pages to fetch ahead in the background. Each next-cursor request is issued as soon as the previous page arrives, overlapping network waits with item processing; 0 disables read-ahead.
+            **kwargs: Keyword filters forwarded to ``method`` on every page.
+
+        Yields:
+            dict[str, Any]: One item per iteration.
+        """
+        pages = aiter_pages(lambda cursor: method(*args, cursor=cursor, **kwargs), max_pages=max_pages)
+        if prefetch:
+            pages = aprefetch_pages(pages, depth=prefetch)
+        return aiter_items(pages, max_items=max_items)
+
+    async def export_calls(self, start, end, shards=8, concurrency=4, target_id=None, target_type=None, buffer_size=1000) -> AsyncIterator[dict[str, Any]]:
+        """
+        Exports every call started in a time range by paging several sub-windows of call_list concurrently and streaming the results.
+
+        Args:
+            start (integer): Only calls started after this Unix timestamp (same unit as call_list's started_after).
+            end (integer): Only calls started before this Unix timestamp.
+            shards (integer): Number of sub-windows the range is split into.
+            concurrency (integer): Maximum number of windows being paged at the same time.
+            target_id (integer): Optional target ID forwarded to call_list.
+            target_type (string): Optional target type forwarded to call_list.
+            buffer_size (integer): Calls buffered per window that is fetched ahead of the one being read; bounds memory use.
+
+        Yields:
+            dict[str, Any]: Calls window by window, oldest window first and each in call_list's order, de-duplicated by call_id.
+
+        Tags:
+            call
+        """
+        windows = split_window(start, end, shards)
+        buffers = [asyncio.Queue(maxsize=buffer_size) for _ in windows]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(window, buffer):
+            started_after, started_before = window
+            async with semaphore:
+                try:
+                    async with aclosing(self.iter_call_list(started_after=started_after, started_before=started_before, target_id=target_id, target_type=target_type)) as calls:
+                        async for call in calls:
+                            await buffer.put(call)
+                except Exception as exc:
+                    await buffer.put(ShardFailed(exc))
+                else:
+                    await buffer.put(SHARD_DONE)
+
+        tasks = [asyncio.create_task(fetch(window, buffer)) for window, buffer in zip(windows, buffers)]
+        try:
+            dedupe = BoundaryDeduper(windows)
+            for buffer in buffers:
+                while (item := await buffer.get()) is not SHARD_DONE:
+                    if isinstance(item, ShardFailed):
+                        raise item.error
+                    if dedupe(item):
+                        yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def wait_for_stats(self, request_id, timeout=600.0, initial_interval=1.0, max_interval=15.0) -> dict[str, Any]:
+        """
+        Polls stats_get until a stats request has finished, starting with short intervals and backing off up to max_interval.
+
+        Args:
+            request_id (string): The request_id returned by stats_create.
+            timeout (number): Seconds to wait for the result before giving up.
+            initial_interval (number): Seconds before the second poll.
+            max_interval (number): Upper bound for the delay between polls.
+
+        Returns:
+            dict[str, Any]: The completed stats_get response, including its download_url.
+
+        Raises:
+            StatsJobError: If Dialpad reports the request as failed.
+            TimeoutError: If the result is not ready within timeout seconds.
+
+        Tags:
+            stats
+        """
+        deadline = time.monotonic() + timeout
+        for delay in poll_intervals(initial_interval, maximum=max_interval):
+            result = await self.stats_get(request_id)
+            state = job_state(result)
+            if state == COMPLETE:
+                return result
+            if state == FAILED:
+                raise StatsJobError(f"Stats request {request_id} failed: {result}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Stats request {request_id} was not ready after {timeout}s")
+            await asyncio.sleep(min(delay, remaining))
+
+    async def iter_stats_result(self, result, types=None, infer_types=False, spill=None) -> AsyncIterator[dict[str, Any]]:
+        """
+        Streams the CSV file behind a completed stats request and yields its rows as they are downloaded, holding one row in memory at a time.
+
+        Args:
+            result (dict): A completed stats_get response, as returned by wait_for_stats.
+            types (dict): Optional column name -> converter mapping, e.g. {"date": datetime.fromisoformat}; empty cells become None.
+            infer_types (boolean): Convert plainly numeric cells of the other columns to int or float.
+            spill (string | boolean): Download the file to this path (or to a temporary file if True, removed afterwards) before parsing it, so the HTTP connection is not held open while rows are consumed.
+
+        Yields:
+            dict[str, Any]: One row per iteration, keyed by the CSV header.
+
+        Tags:
+            stats
+        """
+        convert = types is not None or infer_types
+        # The download URL is pre-signed, so it is fetched without the API credentials.
+        async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT) as client:
+            if not spill:
+                parser = CsvRowParser()
+                async with client.stream("GET", result["download_url"]) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        for row in parser.feed(line):
+                            yield coerce_row(row, types, infer_types) if convert else row
+                return
+            path = spill_path(spill)
+            try:
+                async with client.stream("GET", result["download_url"]) as response:
+                    response.raise_for_status()
+                    with path.open("wb") as file:
+                        async for chunk in response.aiter_bytes():
+                            file.write(chunk)
+                # Reading and parsing the file blocks, so it runs in a worker thread, a block of rows at a time.
+                rows = iter_csv_rows(iter_file_lines(path), types=types, infer_types=infer_types)
+                while block := await asyncio.to_thread(list, islice(rows, SPILL_BLOCK_ROWS)):
+                    for row in block:
+                        yield row
+            finally:
+                if spill is True:
+                    path.unlink(missing_ok=True)
+
+    async def iter_stats_batches(self, result, batch_size=10000, arrow=False, types=None, infer_types=True, spill=None) -> AsyncIterator[Any]:
+        """
+        Streams the file behind a completed stats request as columnar batches of at most batch_size rows.
+
+        Args:
+            result (dict): A completed stats_get response, as returned by wait_for_stats.
+            batch_size (integer): Maximum number of rows per batch.
+            arrow (boolean): Yield pyarrow.RecordBatch objects instead of dicts of lists; requires the optional pyarrow dependency.
+            types (dict): Optional column name -> converter mapping, e.g. {"date": datetime.fromisoformat}; empty cells become None.
+            infer_types (boolean): Convert plainly numeric cells of the other columns to int or float.
+            spill (string | boolean): Download the file to this path (or to a temporary file if True, removed afterwards) before parsing it, so the HTTP connection is not held open while rows are consumed.
+
+        Yields:
+            dict[str, list] | pyarrow.RecordBatch: One batch per iteration.
+
+        Tags:
+            stats
+        """
+        rows = []
+        async for row in self.iter_stats_result(result, types=types, infer_types=infer_types, spill=spill):
+            rows.append(row)
+            if len(rows) >= batch_size:
+                batch = next(iter_column_batches(rows, batch_size))
+                yield next(iter_record_batches([batch])) if arrow else batch
+                rows = []
+        if rows:
+            batch = next(iter_column_batches(rows, batch_size))
+            yield next(iter_record_batches([batch])) if arrow else batch
+
+    async def iter_stats(self, timeout=600.0, types=None, infer_types=False, spill=None, **stats_params) -> AsyncIterator[dict[str, Any]]:
+        """
+        Submits a stats request, waits for it to complete and lazily yields the rows of its result.
+
+        Args:
+            timeout (number): Seconds to wait for the result before giving up.
+            types (dict): Optional column name -> converter mapping, e.g. {"date": datetime.fromisoformat}; empty cells become None.
+            infer_types (boolean): Convert plainly numeric cells of the other columns to int or float.
+            spill (string | boolean): Download the file to this path (or to a temporary file if True, removed afterwards) before parsing it, so the HTTP connection is not held open while rows are consumed.
+            **stats_params: Arguments forwarded to stats_create, e.g. export_type="records".
+
+        Yields:
+            dict[str, Any]: One row per iteration.
+
+        Tags:
+            stats
+        """
+        request_id = (await self.stats_create(**stats_params))["request_id"]
+        async for row in self.iter_stats_result(await self.wait_for_stats(request_id, timeout=timeout), types=types, infer_types=infer_types, spill=spill):
+            yield row
+
+    async def run_stats(self, coaching_group=None, coaching_team=None, days_ago_end=None, days_ago_start=None, export_type=None, group_by=None, is_today=None, office_id=None, stat_type=None, target_id=None, target_type=None, timezone=None, max_rows=1000, timeout=600) -> dict[str, Any]:
+        """
+        Submits a stats report, waits until Dialpad has produced it and returns the parsed rows, all in a single call.
+
+        Args:
+            coaching_group (boolean): Whether or not the the statistics should be for trainees of the coach group with the given target_id.
+            coaching_team (boolean): Whether or not the the statistics should be for trainees of the coach team with the given target_id.
+            days_ago_end (integer): End of the date range to get statistics for.
+
+        This is the number of days to look back relative to the current day. Used in conjunction with days_ago_start to specify a range.
+            days_ago_start (integer): Start of the date range to get statistics for.
+
+        This is the number of days to look back relative to the current day. Used in conjunction with days_ago_end to specify a range.
+            export_type (string): Whether to return aggregated statistics (stats), or individual rows for each record (records).
+
+        NOTE: For stat_type "csat" or "dispositions", only "records" is supported.
+            group_by (string): This param is only applicable when the stat_type is specified as call. For call stats, group calls by user per day (default), get total metrics by day, or break down by department and call center (office only).
+            is_today (boolean): Whether or not the statistics are for the current day.
+
+        NOTE: days_ago_start and days_ago_end are ignored if this is passed in.
+            office_id (integer): ID of the office to get statistics for.
+
+        If a target_id and target_type are passed in this value is ignored and instead the target is used.
+            stat_type (string): The type of statistics to be returned.
+
+        NOTE: if the value is "csat" or "dispositions", target_id and target_type must be specified.
+            target_id (integer): The target's id.
+            target_type (string): Target's type.
+            timezone (string): Timezone using a tz database name.
+            max_rows (integer): Maximum number of rows to return; the result is flagged as truncated beyond that.
+            timeout (integer): Seconds to wait for the report before giving up.
+
+        Returns:
+            dict[str, Any]: The request_id, the parsed rows and whether they were truncated to max_rows.
+
+        Raises:
+            StatsJobError: If Dialpad reports the request as failed.
+            TimeoutError: If the report is not ready within timeout seconds.
+
+        Tags:
+            stats
+        """
+        request_id = (await self.stats_create(coaching_group=coaching_group, coaching_team=coaching_team, days_ago_end=days_ago_end, days_ago_start=days_ago_start, export_type=export_type, group_by=group_by, is_today=is_today, office_id=office_id, stat_type=stat_type, target_id=target_id, target_type=target_type, timezone=timezone))["request_id"]
+        rows = []
+        truncated = False
+        # Close the row stream (and its HTTP response) as soon as enough rows are read.
+        async with aclosing(self.iter_stats_result(await self.wait_for_stats(request_id, timeout=timeout))) as stream:
+            async for row in stream:
+                if len(rows) == max_rows:
+                    truncated = True
+                    break
+                rows.append(row)
+        return {"request_id": request_id, "rows": rows, "truncated": truncated}
+
+    async def iter_stats_batch(self, jobs, concurrency=8, timeout=600.0, initial_interval=1.0, max_interval=15.0) -> AsyncIterator[dict[str, Any]]:
+        """
+        Submits many stats requests concurrently and polls all of them from a single scheduler loop, yielding each one as soon as it finishes.
+
+        Args:
+            jobs (iterable): stats_create arguments per request, e.g. one dict with target_id and target_type per office. Consumed lazily.
+            concurrency (integer): Maximum number of requests submitted but not yet finished.
+            timeout (number): Seconds each request may take before it is reported as timed out.
+            initial_interval (number): Seconds before a request is first polled.
+            max_interval (number): Upper bound for the delay between polls of one request.
+
+        Yields:
+            dict[str, Any]: {"job", "request_id", "result", "error"} per request in completion order. "result" is the completed stats_get response (pass it to iter_stats_result for the rows); "error" holds the exception if the request failed or timed out.
+
+        Tags:
+            stats
+        """
+        batch = StatsBatch(jobs, concurrency=concurrency, timeout=timeout, initial_interval=initial_interval, max_interval=max_interval)
+        while not batch.done:
+            calls = [(job, self.stats_create(**job.params)) for job in batch.ready_to_submit()]
+            calls += [(job, self.stats_get(job.request_id)) for job in batch.due()]
+            outcomes = await asyncio.gather(*(call for _, call in calls), return_exceptions=True)
+            for (job, _), outcome in zip(calls, outcomes):
+                if isinstance(outcome, Exception):
+                    finished = batch.fail(job, outcome)
+                else:
+                    finished = batch.update(job, outcome)
+                if finished is not None:
+                    yield finished
+            if not calls:
+                await asyncio.sleep(batch.idle_time())
+
+    async def export_calls_to_file(self, path, start, end, format="parquet", compression="zstd", batch_size=10000, shards=8, concurrency=4, target_id=None, target_type=None) -> dict[str, Any]:
+        """
+        Writes every call started in a time range to a compressed Parquet or Arrow IPC file with the fixed columnar.CALL_COLUMNS schema.
+
+        Args:
+            path (string): Destination file.
+            format (string): "parquet" or "arrow" (Arrow IPC file).
+            compression (string): Codec for the batches, e.g. "zstd", "lz4" or "snappy" (Parquet only); None disables compression.
+            batch_size (integer): Rows per written batch; bounds memory use.
+            start (integer): Only calls started after this Unix timestamp (same unit as call_list's started_after).
+            end (integer): Only calls started before this Unix timestamp.
+            shards (integer): Number of sub-windows fetched concurrently, see export_calls.
+            concurrency (integer): Maximum number of windows being paged at the same time.
+            target_id (integer): Optional target ID forwarded to call_list.
+            target_type (string): Optional target type forwarded to call_list.
+
+        Returns:
+            dict[str, Any]: The written path and number of rows.
+
+        Tags:
+            call
+        """
+        with ColumnarWriter(path, schema=call_schema(), format=format, compression=compression) as writer:
+            calls = []
+            async for call in self.export_calls(start, end, shards=shards, concurrency=concurrency, target_id=target_id, target_type=target_type):
+                calls.append(call)
+                if len(calls) >= batch_size:
+                    await asyncio.to_thread(writer.write, next(iter_call_batches(calls, batch_size=batch_size)))
+                    calls = []
+            if calls:
+                await asyncio.to_thread(writer.write, next(iter_call_batches(calls, batch_size=batch_size)))
+        return {"path": str(writer.path), "rows": writer.rows}
+
+    async def export_stats_to_file(self, path, format="parquet", compression="zstd", batch_size=10000, timeout=600.0, types=None, **stats_params) -> dict[str, Any]:
+        """
+        Runs a stats request (records export by default) and streams its result into a compressed Parquet or Arrow IPC file.
+
+        Args:
+            path (string): Destination file.
+            format (string): "parquet" or "arrow" (Arrow IPC file).
+            compression (string): Codec for the batches, e.g. "zstd", "lz4" or "snappy" (Parquet only); None disables compression.
+            batch_size (integer): Rows per written batch; bounds memory use.
+            timeout (number): Seconds to wait for the report before giving up.
+            types (dict): Optional column name -> converter mapping for typed columns; other columns are stored as text.
+            **stats_params: Arguments forwarded to stats_create; export_type defaults to "records".
+
+        Returns:
+            dict[str, Any]: The stats request_id, the written path and number of rows.
+
+        Tags:
+            stats
+        """
+        stats_params.setdefault("export_type", "records")
+        request_id = (await self.stats_create(**stats_params))["request_id"]
+        result = await self.wait_for_stats(request_id, timeout=timeout)
+        with ColumnarWriter(path, format=format, compression=compression) as writer:
+            async for batch in self.iter_stats_batches(result, batch_size=batch_size, types=types, infer_types=False, spill=True):
+                await asyncio.to_thread(writer.write, batch)
+        return {"request_id": request_id, "path": str(writer.path), "rows": writer.rows}
+
+    async def refresh_phone_index(self) -> int:
+        """
+        Rebuilds the in-process phone number index used by lookup_number from numbers_list and contacts_list.
+
+        Returns:
+            int: Number of distinct numbers indexed.
+
+        Tags:
+            numbers, contacts
+        """
+        return await self.phone_index.abuild(self.iter_numbers_list(prefetch=1), self.iter_contacts_list(prefetch=1))
+
+    async def _refresh_phone_index_in_background(self) -> None:
+        # On failure the stale index keeps answering and the next lookup tries again.
+        async with self._phone_index_lock:
+            try:
+                await self.refresh_phone_index()
+            except Exception:
+                pass
+
+    async def lookup_number(self, number, max_age=900.0) -> dict[str, Any]:
+        """
+        Resolves a phone number to the user, room, call router, office, department, call center or contact that owns it, from an in-process index instead of a numbers_get, users_list or contacts_list round-trip.
+
+        Args:
+            number (string): Phone number in E.164 or national format.
+            max_age (number): Seconds after which the index is rebuilt from numbers_list and contacts_list in the background; the stale index keeps answering meanwhile, and only the very first lookup waits for a build.
+
+        Returns:
+            dict[str, Any]: The E.164 number with its target_type, target_id, office_id and name (contacts only); target_type and target_id are None if no owner is known.
+
+        Tags:
+            numbers, contacts
+        """
+        index = self.phone_index
+        if index.built_at is None:
+            async with self._phone_index_lock:
+                if index.built_at is None:
+                    await self.refresh_phone_index()
+        elif index.is_stale(max_age) and (self._phone_index_task is None or self._phone_index_task.done()):
+            self._phone_index_task = asyncio.create_task(self._refresh_phone_index_in_background())
+        owner = index.lookup(number)
+        if owner is None:
+            return {"number": normalize_number(number, index.country), "target_type": None, "target_id": None, "office_id": None, "name": None}
+        return dict(owner)
+
+    async def directory_owner_of_number(self, number, max_age=3600.0) -> dict[str, Any]:
+        """
+        Answers "who owns number X" from the local directory mirror: the user, office, department, call center or contact a number belongs to, with its mirrored record.
+
+        Args:
+            number (string): Phone number in E.164 or national format.
+            max_age (number): Seconds after which a kind of entity is re-synced from its list endpoint in the background; the mirror answers from its current state meanwhile.
+
+        Returns:
+            dict[str, Any]: kind, id and entity (entity is None for kinds that are not mirrored, such as rooms; all three are None if no owner is known), and stale, true while some kind has not been synced within max_age, including before the first sync completes.
+
+        Tags:
+            numbers, users, offices, contacts
+        """
+        stale = await self.directory.arefresh_in_background(max_age)
+        owner = self.directory.owner_of_number(number) or {"kind": None, "id": None, "entity": None}
+        return {**owner, "stale": stale}
+
+    async def directory_office_of_user(self, user_id, max_age=3600.0) -> dict[str, Any]:
+        """
+        Answers "which office is user Y in" from the local directory mirror.
+
+        Args:
+            user_id (string): The user's id.
+            max_age (number): Seconds after which a kind of entity is re-synced from its list endpoint in the background; the mirror answers from its current state meanwhile.
+
+        Returns:
+            dict[str, Any]: office, the mirrored office or None if the user or their office is unknown, and stale, true while some kind has not been synced within max_age, including before the first sync completes.
+
+        Tags:
+            users, offices
+        """
+        stale = await self.directory.arefresh_in_background(max_age)
+        return {"office": self.directory.office_of_user(user_id), "stale": stale}
+
+    async def ingest_change_log_events(self, events) -> int:
+        """
+        Applies change-log webhook events to the directory mirror and the phone index behind
+        lookup_number, e.g. as the consumer of a WebhookReceiver route subscribed with
+        ``self.directory.asubscribe_change_log``.
+        """
+        count = 0
+        for event in events:
+            count += await self.directory.aapply_change_log_event(event)
+            self._patch_phone_index(event)
+        return count
+
+    async def _format_remote(self, number, country_code) -> dict[str, Any] | None:
+        try:
+            return await self.format_post(country_code=country_code, number=number)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.is_client_error:
+                return None
+            raise
+
+    async def normalize_numbers(self, numbers, country_code="US", remote_fallback=True, concurrency=8) -> list[dict[str, Any]]:
+        """
+        Normalises a batch of phone numbers to E.164 locally, calling format_post only for the numbers the offline rules cannot settle and remembering its answers.
+
+        Args:
+            numbers (array): Phone numbers in any common national or international format.
+            country_code (string): ISO 3166-1 alpha-2 country used to read national numbers, as for format_post.
+            remote_fallback (boolean): Ask format_post about ambiguous numbers; if False they are returned unresolved.
+            concurrency (integer): Maximum number of format_post calls in flight.
+
+        Returns:
+            list[dict[str, Any]]: One {"number", "e164", "source"} entry per input, in order. source is "local", "cache" or "remote"; e164 is None for numbers that are invalid, and source too for those left unresolved.
+
+        Tags:
+            numbers
+        """
+        results, pending = self.number_formatter.plan(numbers, country_code)
+        if remote_fallback and pending:
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+
+            async def format_one(number):
+                async with semaphore:
+                    return await self._format_remote(number, country_code)
+
+            responses = await asyncio.gather(*(format_one(number) for number in pending), return_exceptions=True)
+            for number, response in zip(pending, responses):
+                if not isinstance(response, BaseException):
+                    self.number_formatter.record(number, country_code, response)
+        return self.number_formatter.complete(results, country_code)
+
+    async def refresh_sms_opt_outs(self, company_id, a2p_campaign_id=None, full=False) -> dict[str, Any]:
+        """
+        Loads or refreshes the local SMS opt-out set that send_sms_bulk filters recipients against, from company_sms_opt_out pages of both opt-out states.
+
+        Args:
+            company_id (string): The company ID, as for company_sms_opt_out.
+            a2p_campaign_id (integer): Optional A2P campaign to restrict the opt-outs to.
+            full (boolean): Rebuild the set from scratch. Otherwise, once the set has been loaded, only the entries not seen before (dated from the last refresh's newest entry on) are applied to it. company_sms_opt_out has no date filter, so both listings are still paged in full either way.
+
+        Returns:
+            dict[str, Any]: The number of opted-out numbers held locally, whether the set was rebuilt and, if not, how many newer entries were applied, and how many entries were skipped because their recipient cannot be read.
+
+        Tags:
+            company, sms
+        """
+        async def entries():
+            for state in (OPTED_OUT, OPTED_BACK_IN):
+                async for entry in self.iter_company_sms_opt_out(company_id, state, a2p_campaign_id=a2p_campaign_id, prefetch=1):
+                    yield {**entry, "opt_out_state": state}
+
+        opt_outs = self.sms_opt_outs
+        rebuilt = full or opt_outs.built_at is None
+        applied = 0
+        if rebuilt:
+            await opt_outs.abuild(entries())
+        else:
+            applied = await opt_outs.aapply(entries())
+        return {"opted_out": len(opt_outs), "rebuilt": rebuilt, "applied": applied, "skipped": opt_outs.skipped}
+
+    async def _send_sms_batch(self, batch, pacer, infer_country_code=None, campaign_id=None) -> dict[str, Any]:
+        delay = pacer.reserve(batch["sender_key"], len(batch["to_numbers"]))
+        if delay:
+            await asyncio.sleep(delay)
+        params = dict(batch["sender"], text=batch["text"], media=batch["media"], to_numbers=batch["to_numbers"], infer_country_code=infer_country_code)
+        if campaign_id is None:
+            return await self.sms_send(**params)
+        with idempotency_key(batch_idempotency_key(campaign_id, batch)):
+            return await self.sms_send(**params)
+
+    async def send_sms_bulk(self, messages, from_number=None, user_id=None, sender_group_id=None, sender_group_type=None, infer_country_code=None, max_recipients=1, concurrency=8, rate=1.0, burst=10, campaign_id=None, exclude_opted_out=True) -> dict[str, Any]:
+        """
+        Sends many SMS messages, one sms_send per recipient unless grouping is requested, pacing each sender to its throughput limit and keeping several sends in flight.
+
+        Args:
+            messages (array): Items of (to_number, text) or (to_number, text, media), or objects with to_number, text, optional media and optional from_number, user_id, sender_group_id or sender_group_type overriding the defaults below. Consumed lazily.
+            from_number (string): Default number to send from; overrides user_id and sender_group_id, as for sms_send.
+            user_id (integer): Default user to send as.
+            sender_group_id (integer): Default office, department or call center to send on behalf of.
+            sender_group_type (string): Type of sender_group_id (office, department or callcenter).
+            infer_country_code (boolean): Forwarded to sms_send.
+            max_recipients (integer): Recipients per sms_send call, at most 10. Defaults to 1. Larger values merge recipients of the same text into one group message, in which every recipient sees the others' numbers; only use them for intended group conversations.
+            concurrency (integer): Maximum number of sms_send calls in flight.
+            rate (number): Messages per second allowed per sender; each recipient counts as one message.
+            burst (number): Messages a sender may send at once before pacing starts.
+            campaign_id (string): Optional campaign identifier; each batch then carries a stable Idempotency-Key so failed batches are retried safely.
+            exclude_opted_out (boolean): Skip recipients in the local opt-out set loaded by refresh_sms_opt_outs, and recipients whose number cannot be read (after dropping a tel: prefix and any extension), which are reported as invalid instead of being sent.
+
+        Returns:
+            dict[str, Any]: Counts of sent, failed, opted-out and invalid recipients and a per-recipient report of {"to_number", "sender", "status", "id", "error"}; id is only set for messages sent to a single recipient.
+
+        Tags:
+            sms
+        """
+        defaults = {"from_number": from_number, "user_id": user_id, "sender_group_id": sender_group_id, "sender_group_type": sender_group_type}
+        pacer = SenderPacer(rate=rate, burst=burst)
+        results = []
+        in_flight = {}
+
+        def deliverable():
+            for item in messages:
+                message = sms_message(item, defaults)
+                status = self.sms_opt_outs.status(message["to_number"]) if exclude_opted_out else None
+                if status is not None:
+                    results.append(opted_out_result(message, status))
+                else:
+                    yield message
+
+        batches = iter_sms_batches(deliverable(), max_recipients=max_recipients)
+
+        def collect(done):
+            for task in done:
+                batch = in_flight.pop(task)
+                error = task.exception()
+                results.extend(batch_results(batch, None if error else task.result(), error))
+
+        try:
+            for batch in batches:
+                if len(in_flight) >= concurrency:
+                    done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    collect(done)
+                in_flight[asyncio.create_task(self._send_sms_batch(batch, pacer, infer_country_code, campaign_id))] = batch
+            if in_flight:
+                collect((await asyncio.wait(in_flight))[0])
+        finally:
+            for task in in_flight:
+                task.cancel()
+        sent = sum(result["status"] == SENT for result in results)
+        opted_out = sum(result["status"] == OPTED_OUT for result in results)
+        invalid = sum(result["status"] == INVALID for result in results)
+        return {"sent": sent, "failed": len(results) - sent - opted_out - invalid, "opted_out": opted_out, "invalid": invalid, "results": results}
+
+    async def _provision_step(self, step, spec, user_id) -> dict[str, Any]:
+        if step == CREATE and spec.get("email"):
+            # A user created by an interrupted run may not have reached the checkpoint; reuse it.
+            async for existing in self.iter_users_list(email=spec["email"], max_items=1):
+                return existing
+        name, kwargs = step_call(step, spec, user_id)
+        return await getattr(self, name)(**kwargs)
+
+    async def provision_users(self, users, checkpoint=None, concurrency=8) -> dict[str, Any]:
+        """
+        Provisions many users from declarative specs: creates each user, then runs its office move, number assignment, caller ID, E911 address and office operator steps as a dependency graph, executing independent steps concurrently and checkpointing progress so a failed run can be resumed.
+
+        Args:
+            users (array): User specs with the users_create fields (email, first_name, last_name, license, office_id, auto_assign) and optionally key (defaults to email), move_office_id, number or area_code with primary, caller_id, e911 (address, address2, city, state, zip, country, use_validated_option) and operator_offices (office IDs, or objects with office_id and role).
+            checkpoint (string): Optional JSON file recording finished steps and created user IDs; rerunning with the same specs and file skips what already succeeded.
+            concurrency (integer): Maximum number of API calls in flight. Pair with the app's rate_limiter to stay within Dialpad's limits.
+
+        Returns:
+            dict[str, Any]: Counts of fully provisioned and failed users, and per user (by key) its user_id with the done, failed (step -> error) and blocked steps.
+
+        Tags:
+            users
+        """
+        run = ProvisioningRun(users, checkpoint)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def execute(step, spec, user_id):
+            async with semaphore:
+                return await self._provision_step(step, spec, user_id)
+
+        in_flight = {}
+        try:
+            while True:
+                for key, step, spec, user_id in run.ready():
+                    in_flight[asyncio.create_task(execute(step, spec, user_id))] = (key, step)
+                if not in_flight:
+                    break
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    key, step = in_flight.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        run.complete(key, step, task.result())
+                    else:
+                        run.fail(key, step, error)
+        finally:
+            for task in in_flight:
+                task.cancel()
+        return run.report()
+
+    async def upsert_contacts(self, contacts, owner_id=None, country_code="US", concurrency=8, snapshot_max_age=300.0, dry_run=False) -> dict[str, Any]:
+        """
+        Creates or updates contacts in bulk from a CSV/JSONL file or a list, skipping records that match an existing contact exactly and writing the rest concurrently.
+
+        Records are normalised (E.164 phones, lower-cased emails) and merged when they share a uid, phone or email. Each one is compared with a snapshot of contacts_list: records with a uid go through contacts_create_with_uid, matched records without one through contacts_update with only the changed fields, and the rest through contacts_create.
+
+        Args:
+            contacts (string | array): Path of a CSV file (contact field names as header, multiple emails/phones/urls separated by ";") or JSONL file, or a list of contact objects.
+            owner_id (string): Owner of the contacts (a user ID) for local contacts; the snapshot is taken for this owner. Omit for shared company contacts.
+            country_code (string): ISO 3166-1 alpha-2 country used to normalise national phone numbers.
+            concurrency (integer): Maximum number of writes in flight.
+            snapshot_max_age (number): Seconds the contacts_list snapshot is reused before it is taken again.
+            dry_run (boolean): Only count what would be written.
+
+        Returns:
+            dict[str, Any]: Number of contacts per action (create, upsert_uid, update, unchanged), the number of failed writes and their errors.
+
+        Tags:
+            contacts
+        """
+        if isinstance(contacts, (str, os.PathLike)):
+            contacts = read_contacts(contacts)
+        snapshot = self.contact_snapshots.setdefault(owner_id, ContactSnapshot(country_code))
+        if snapshot.is_stale(snapshot_max_age):
+            snapshot.build([contact async for contact in self.iter_contacts_list(owner_id=owner_id, include_local=True if owner_id is not None else None, prefetch=1)])
+        counts = {**dict.fromkeys((*WRITE_METHODS, UNCHANGED), 0), "failed": 0}
+        errors = []
+
+        def planned():
+            for contact in dedupe_contacts(contacts, country_code):
+                if owner_id is not None:
+                    contact.setdefault("owner_id", str(owner_id))
+                action, kwargs = snapshot.plan(contact)
+                if action == UNCHANGED or dry_run:
+                    counts[action] += 1
+                else:
+                    yield action, kwargs
+
+        def collect(action, kwargs, result, error):
+            if error is None:
+                counts[action] += 1
+                snapshot.record(result if isinstance(result, dict) and result.get("id") is not None else kwargs)
+            else:
+                counts["failed"] += 1
+                errors.append({"action": action, "contact": kwargs, "error": str(error)})
+
+        in_flight = {}
+        try:
+            for action, kwargs in planned():
+                if len(in_flight) >= concurrency:
+                    done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        collect(*in_flight.pop(task), None if task.exception() else task.result(), task.exception())
+                in_flight[asyncio.create_task(getattr(self, WRITE_METHODS[action])(**kwargs))] = (action, kwargs)
+            if in_flight:
+                for task in (await asyncio.wait(in_flight))[0]:
+                    collect(*in_flight.pop(task), None if task.exception() else task.result(), task.exception())
+        finally:
+            for task in in_flight:
+                task.cancel()
+        return {**counts, "errors": errors}
+
+    async def _change_blocked_numbers(self, action, numbers) -> Any:
+        method = self.blockednumbers_add if action == ADD else self.blockednumbers_remove
+        with idempotency_key(chunk_idempotency_key(action, numbers)):
+            return await method(numbers=numbers)
+
+    async def sync_blocked_numbers(self, desired, country_code="US", remove_extra=True, chunk_size=500, concurrency=4, dry_run=False) -> dict[str, Any]:
+        """
+        Converges the company's blocked numbers to a desired set: pages blockednumbers_list, computes which numbers to add and remove, and applies the difference in chunked, concurrent blockednumbers_add / blockednumbers_remove calls.
+
+        Args:
+            desired (array): Numbers that should be blocked, in E.164 or national format.
+            country_code (string): ISO 3166-1 alpha-2 country used to read national numbers.
+            remove_extra (boolean): Unblock numbers that are blocked but not desired; if False, numbers are only added.
+            chunk_size (integer): Numbers per add/remove call.
+            concurrency (integer): Maximum number of add/remove calls in flight.
+            dry_run (boolean): Only compute the difference.
+
+        Returns:
+            dict[str, Any]: Counts of added, removed and unchanged numbers, the desired entries that are not valid numbers, and the chunks that failed with their errors.
+
+        Tags:
+            blockednumbers
+        """
+        # Keep only the canonical form of each blocked number while paging, as diff_numbers would.
+        current = set()
+        async for item in self.iter_blockednumbers_list(prefetch=1):
+            current.add(canonical_number(item.get("number"), country_code))
+        current.discard(None)
+        to_add, to_remove, unchanged, invalid = diff_numbers(current, desired, country_code)
+        if not remove_extra:
+            to_remove = []
+        report = {"added": 0, "removed": 0, "unchanged": unchanged, "invalid": invalid, "failed": []}
+        if dry_run:
+            return {**report, "added": len(to_add), "removed": len(to_remove)}
+        calls = [(ADD, chunk) for chunk in chunks(to_add, chunk_size)] + [(REMOVE, chunk) for chunk in chunks(to_remove, chunk_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def apply(action, chunk):
+            async with semaphore:
+                return await self._change_blocked_numbers(action, chunk)
+
+        outcomes = await asyncio.gather(*(apply(action, chunk) for action, chunk in calls), return_exceptions=True)
+        for (action, chunk), outcome in zip(calls, outcomes):
+            if not isinstance(outcome, BaseException):
+                report["added" if action == ADD else "removed"] += len(chunk)
+            else:
+                report["failed"].append({"action": action, "numbers": chunk, "error": str(outcome)})
+        return report
+
+    async def reconcile_operators(self, rosters, remove_extra=True, concurrency=8, dry_run=False) -> dict[str, Any]:
+        """
+        Reconciles the operator rosters of many call centers, departments and offices at once: fetches every current roster concurrently, computes the minimal additions and removals against the desired operators, and applies them in parallel.
+
+        Args:
+            rosters (array): Desired rosters, each with group_type (callcenter, department or office), group_id and operators: user IDs, or objects with id and optionally type (user or room; call centers take users only), role and, for call centers, skill_level, license_type and keep_paid_numbers.
+            remove_extra (boolean): Remove operators that are on a roster but not desired; if False, operators are only added.
+            concurrency (integer): Maximum number of API calls in flight. Pair with the app's rate_limiter to stay within Dialpad's limits.
+            dry_run (boolean): Only fetch the rosters and report the changes that would be made.
+
+        Returns:
+            dict[str, Any]: Totals of added, removed and failed operator changes, and per group the operators added and removed, the failed changes with their errors, and an error if its roster could not be fetched.
+
+        Tags:
+            callcenters, departments, offices
+        """
+        groups = {}
+        for roster in rosters:
+            group_type = normalize_group_type(roster["group_type"])
+            if (group_type, str(roster["group_id"])) in groups:
+                raise ValueError(f"Duplicate roster for {group_type} {roster['group_id']}")
+            groups[(group_type, str(roster["group_id"]))] = (group_type, roster["group_id"], desired_operators(group_type, roster.get("operators") or ()))
+        reports = [{"group_type": group_type, "group_id": group_id, "added": [], "removed": [], "failed": []} for group_type, group_id, _ in groups.values()]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(method, *args, **kwargs):
+            async with semaphore:
+                return await getattr(self, method)(*args, **kwargs)
+
+        fetches = await asyncio.gather(*(call(f"{GROUP_ENDPOINTS[group_type]}_get", group_id) for group_type, group_id, _ in groups.values()), return_exceptions=True)
+        changes = []
+        for report, (group_type, group_id, desired), fetched in zip(reports, groups.values(), fetches):
+            if isinstance(fetched, BaseException):
+                report["error"] = str(fetched)
+                continue
+            for action, operator in roster_diff(current_operators(fetched), desired, remove_extra):
+                if dry_run:
+                    record_change(report, action, operator)
+                else:
+                    changes.append((report, action, operator, operator_call(group_type, group_id, action, operator)))
+        outcomes = await asyncio.gather(*(call(method, **kwargs) for _, _, _, (method, kwargs) in changes), return_exceptions=True)
+        for (report, action, operator, _), outcome in zip(changes, outcomes):
+            record_change(report, action, operator, outcome if isinstance(outcome, BaseException) else None)
+        return roster_report(reports)
+
+    async def update_operators(self, updates, deadline=30.0, concurrency=16, max_attempts=3) -> dict[str, Any]:
+        """
+        Updates the duty status and/or skill level of many call center operators at once, e.g. at a shift change. Updates run concurrently under a deadline; failed updates are retried with backoff while time remains.
+
+        Args:
+            updates (array): Operator updates, each with user_id and on_duty and/or duty_status_reason (callcenters_operators_dutystatus) and/or skill_level with the call_center_id it applies to (callcenters_operators_skilllevel).
+            deadline (number): Seconds within which all updates must be done; updates not sent by then are reported as timed out, and updates sent but not yet answered as in flight (Dialpad may still apply them).
+            concurrency (integer): Maximum number of updates in flight. Pair with the app's rate_limiter to stay within Dialpad's limits.
+            max_attempts (integer): Attempts per update, counting the first. Only connection errors, throttling and server errors are retried, by this tool rather than the app's retry policy.
+
+        Returns:
+            dict[str, Any]: Counts of succeeded, failed, timed-out and in-flight updates, and per operator (in input order) the status, attempts and last error of its duty status and skill level updates.
+
+        Tags:
+            callcenters
+        """
+        run = OperatorUpdateRun(updates, deadline, max_attempts)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        started = set()
+
+        async def execute(index, kind, method, kwargs):
+            async with semaphore:
+                started.add((index, kind))
+                # OperatorUpdateRun retries within the deadline itself.
+                with without_retries():
+                    return await getattr(self, method)(**kwargs)
+
+        in_flight = {}
+        try:
+            while not run.done and not run.expired:
+                for index, kind, method, kwargs in run.ready():
+                    in_flight[asyncio.create_task(execute(index, kind, method, kwargs))] = (index, kind)
+                if not in_flight:
+                    await asyncio.sleep(run.wait_time())
+                    continue
+                done, _ = await asyncio.wait(in_flight, timeout=run.wait_time(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, kind = in_flight.pop(task)
+                    if task.exception() is None:
+                        run.complete(index, kind)
+                    else:
+                        run.fail(index, kind, task.exception())
+        finally:
+            for task, (index, kind) in in_flight.items():
+                task.cancel()
+                if (index, kind) not in started:
+                    run.withdraw(index, kind)
+        return run.report()
+
+
+# The generated DialpadApp endpoints: each sends exactly one request, built by the sync endpoint,
+# so its coroutine version is derived with _coroutine_endpoint. Hand-written tools are not listed;
+# AsyncDialpadApp defines their coroutine versions above. Keep this in step with the generated
+# endpoints of app.py.
+GENERATED_ENDPOINTS = (
+    "accesscontrolpolicies_assign",
+    "accesscontrolpolicies_list",
+    "accesscontrolpolicies_create",
+    "accesscontrolpolicies_delete",
+    "accesscontrolpolicies_get",
+    "accesscontrolpolicies_update",
+    "accesscontrolpolicies_assignments",
+    "accesscontrolpolicies_unassign",
+    "app_settings_get",
+    "blockednumbers_add",
+    "blockednumbers_get",
+    "blockednumbers_remove",
+    "blockednumbers_list",
+    "call_participants_add",
+    "call_get_call_info",
+    "call_initiate_ivr_call",
+    "call_list",
+    "call_call",
+    "call_transfer_call",
+    "call_unpark",
+    "call_actions_hangup",
+    "call_put_call_labels",
+    "call_callback",
+    "call_validate_callback",
+    "callcenters_listall",
+    "callcenters_create",
+    "callcenters_delete",
+    "callcenters_get",
+    "callcenters_update",
+    "callcenters_status",
+    "callcenters_operators_get_dutystatus",
+    "callcenters_operators_dutystatus",
+    "callcenters_operators_get_skilllevel",
+    "callcenters_operators_skilllevel",
+    "callcenters_operators_delete",
+    "callcenters_operators_get",
+    "callcenters_operators_post",
+    "calllabel_list",
+    "call_review_share_link_create",
+    "call_review_share_link_delete",
+    "call_review_share_link_get",
+    "call_review_share_link_update",
+    "callrouters_list",
+    "callrouters_create",
+    "callrouters_delete",
+    "callrouters_get",
+    "callrouters_update",
+    "numbers_assign_call_router_number_post",
+    "channels_delete",
+    "channels_get",
+    "channels_list",
+    "channels_post",
+    "channels_members_delete",
+    "channels_members_list",
+    "channels_members_post",
+    "coaching_team_members_get",
+    "coaching_team_members_add",
+    "coaching_team_get",
+    "coaching_team_listall",
+    "company_get",
+    "company_sms_opt_out",
+    "conference_rooms_list",
+    "conference_meetings_list",
+    "contacts_delete",
+    "contacts_get",
+    "contacts_update",
+    "contacts_list",
+    "contacts_create",
+    "contacts_create_with_uid",
+    "ivr_delete",
+    "ivr_update",
+    "custom_ivrs_get",
+    "ivr_create",
+    "ivr_details_update",
+    "departments_delete",
+    "departments_get",
+    "departments_update",
+    "departments_listall",
+    "departments_create",
+    "departments_operators_delete",
+    "departments_operators_get",
+    "departments_operators_post",
+    "faxline_create",
+    "numbers_assign_number_post",
+    "numbers_assign_target_number_post",
+    "numbers_delete",
+    "numbers_get",
+    "numbers_list",
+    "format_post",
+    "oauth2_authorize_get",
+    "oauth2_deauthorize_post",
+    "plan_get",
+    "callcenters_list",
+    "coaching_team_list",
+    "departments_list",
+    "numbers_assign_office_number_post",
+    "numbers_office_unassign_number_post",
+    "offices_e911_get",
+    "offices_e911_update",
+    "plan_available_licenses_get",
+    "offices_offdutystatuses_get",
+    "offices_get",
+    "offices_list",
+    "offices_create",
+    "offices_operators_delete",
+    "offices_operators_get",
+    "offices_operators_post",
+    "recording_share_link_create",
+    "recording_share_link_delete",
+    "recording_share_link_get",
+    "recording_share_link_update",
+    "numbers_assign_room_number_post",
+    "numbers_room_unassign_number_post",
+    "rooms_delete",
+    "rooms_get",
+    "rooms_patch",
+    "rooms_list",
+    "rooms_post",
+    "deskphones_rooms_create_international_pin",
+    "deskphones_rooms_delete",
+    "deskphones_rooms_get",
+    "deskphones_rooms_list",
+    "schedule_reports_delete",
+    "schedule_reports_get",
+    "schedule_reports_update",
+    "schedule_reports_list",
+    "schedule_reports_create",
+    "sms_send",
+    "stats_get",
+    "stats_create",
+    "webhook_agent_status_event_subscription_list",
+    "webhook_agent_status_event_subscription_create",
+    "webhook_agent_status_event_subscription_delete",
+    "webhook_agent_status_event_subscription_get",
+    "webhook_agent_status_event_subscription_update",
+    "webhook_call_event_subscription_list",
+    "webhook_call_event_subscription_create",
+    "webhook_call_event_subscription_delete",
+    "webhook_call_event_subscription_get",
+    "webhook_call_event_subscription_update",
+    "webhook_change_log_event_subscription_list",
+    "webhook_change_log_event_subscription_create",
+    "webhook_change_log_event_subscription_delete",
+    "webhook_change_log_event_subscription_get",
+    "webhook_change_log_event_subscription_update",
+    "webhook_contact_event_subscription_list",
+    "webhook_contact_event_subscription_create",
+    "webhook_contact_event_subscription_delete",
+    "webhook_contact_event_subscription_get",
+    "webhook_contact_event_subscription_update",
+    "webhook_sms_event_subscription_list",
+    "webhook_sms_event_subscription_create",
+    "webhook_sms_event_subscription_delete",
+    "webhook_sms_event_subscription_get",
+    "webhook_sms_event_subscription_update",
+    "transcripts_get",
+    "transcripts_get_url",
+    "userdevices_get",
+    "userdevices_list",
+    "users_initiate_call",
+    "users_update_active_call",
+    "users_toggle_call_vi",
+    "caller_id_users_get",
+    "caller_id_users_post",
+    "deskphones_users_delete",
+    "deskphones_users_get",
+    "deskphones_users_list",
+    "numbers_assign_user_number_post",
+    "numbers_user_unassign_number_post",
+    "users_toggle_dnd",
+    "users_e911_get",
+    "users_e911_update",
+    "users_personas_get",
+    "screen_pop_initiate",
+    "users_delete",
+    "users_get",
+    "users_update",
+    "users_list",
+    "users_create",
+    "users_move_office_patch",
+    "users_update_status",
+    "webhooks_list",
+    "webhooks_create",
+    "webhooks_delete",
+    "webhooks_get",
+    "webhook_update",
+    "websockets_list",
+    "websockets_create",
+    "websockets_delete",
+    "websockets_get",
+    "websockets_update",
+)
+
+for _name in GENERATED_ENDPOINTS:
+    setattr(AsyncDialpadApp, _name, _coroutine_endpoint(getattr(DialpadApp, _name)))
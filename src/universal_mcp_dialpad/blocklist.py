@@ -0,0 +1,49 @@
+import hashlib
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import Any
+
+from universal_mcp_dialpad.phones import canonical_number
+
+ADD = "add"
+REMOVE = "remove"
+
+
+def diff_numbers(current: Iterable[Any], desired: Iterable[Any], country: str = "US") -> tuple[list[str], list[str], int, list[Any]]:
+    """
+    Computes the changes that turn the current blocked numbers into the desired ones, comparing
+    the canonical forms PhoneIndex uses (E.164, or ``+digits`` for numbers the offline rules are
+    unsure about). Blocked numbers that cannot be read at all are never scheduled for removal.
+
+    Returns:
+        tuple[list[str], list[str], int, list[Any]]: The numbers to add and to remove (sorted), how many
+        are already blocked as desired, and the desired entries that are not valid phone numbers.
+    """
+    existing = set()
+    for number in current:
+        key = canonical_number(number, country)
+        if key is not None:
+            existing.add(key)
+    wanted = set()
+    invalid = []
+    for number in desired:
+        e164 = canonical_number(number, country)
+        if e164 is None:
+            invalid.append(number)
+        else:
+            wanted.add(e164)
+    return sorted(wanted - existing), sorted(existing - wanted), len(wanted & existing), invalid
+
+
+def chunks(numbers: Iterable[str], size: int) -> Iterator[list[str]]:
+    numbers = iter(numbers)
+    while chunk := list(islice(numbers, max(1, size))):
+        yield chunk
+
+
+def chunk_idempotency_key(action: str, chunk: list[str]) -> str:
+    """
+    Stable Idempotency-Key for one add/remove call. Blocking and unblocking a set of numbers is
+    idempotent, so marking the call lets the retry policy repeat it.
+    """
+    return f"blockednumbers-{action}-{hashlib.sha256(','.join(chunk).encode()).hexdigest()[:24]}"
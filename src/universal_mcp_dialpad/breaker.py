@@ -0,0 +1,128 @@
+import threading
+import time
+from collections.abc import Callable
+
+from universal_mcp_dialpad.routes import api_path, template_for
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while its endpoint's circuit is open.
+    """
+
+    def __init__(self, endpoint: str, retry_in: float) -> None:
+        super().__init__(f"Dialpad endpoint {endpoint} is failing repeatedly; not calling it for another {retry_in:.0f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class _Circuit:
+    __slots__ = ("failures", "opened_at", "probe_started", "probes", "state")
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_started = 0.0
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker keyed by URL template, e.g. ``/stats/{id}``.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and requests fail fast
+    with CircuitOpenError. Once ``reset_timeout`` has passed, up to ``half_open_max_calls``
+    probe requests are let through; a successful probe closes the circuit, a failed one
+    opens it again.
+
+    Every admitted request must end in exactly one of record_success, record_failure or
+    release (for requests that ended without an outcome, e.g. cancelled ones). A failure is
+    one logical request, however many retry attempts it took. Probe slots not released
+    within ``reset_timeout`` are reclaimed, so a lost probe cannot keep the circuit shut.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return template_for(url) or api_path(url)
+
+    def before_request(self, url: str) -> str:
+        """
+        Admits a request or fails fast.
+
+        Returns:
+            str: The circuit key, to be passed to record_success / record_failure.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open, or half-open with all probe slots taken.
+        """
+        key = self.key_for(url)
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if circuit.state == OPEN:
+                remaining = circuit.opened_at + self.reset_timeout - self._clock()
+                if remaining > 0:
+                    raise CircuitOpenError(key, remaining)
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+            if circuit.state == HALF_OPEN:
+                now = self._clock()
+                if circuit.probes >= self.half_open_max_calls:
+                    if now - circuit.probe_started < self.reset_timeout:
+                        raise CircuitOpenError(key, circuit.probe_started + self.reset_timeout - now)
+                    circuit.probes = 0
+                circuit.probes += 1
+                circuit.probe_started = now
+        return key
+
+    def release(self, key: str) -> None:
+        """
+        Frees the probe slot of an admitted request that ended without a success or failure.
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is not None and circuit.state == HALF_OPEN and circuit.probes > 0:
+                circuit.probes -= 1
+
+    def record_success(self, key: str) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            circuit.state = CLOSED
+            circuit.failures = 0
+
+    def record_failure(self, key: str) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.state = OPEN
+                circuit.opened_at = self._clock()
+
+    def state(self, url_or_key: str) -> str:
+        key = url_or_key if url_or_key in self._circuits else self.key_for(url_or_key)
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return circuit.state if circuit is not None else CLOSED
+
+    def stats(self) -> dict[str, dict[str, object]]:
+        """
+        Returns the state and consecutive failure count of every circuit that is not closed.
+        """
+        with self._lock:
+            return {
+                key: {"state": circuit.state, "failures": circuit.failures}
+                for key, circuit in self._circuits.items()
+                if circuit.state != CLOSED
+            }
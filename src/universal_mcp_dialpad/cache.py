@@ -0,0 +1,215 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import Any
+from urllib.parse import urlencode
+
+from universal_mcp_dialpad.routes import DEPENDENTS, api_path, entity_for, template_for
+
+# Seconds a response may be served from cache, keyed by URL template (see routes.ROUTES).
+# Only read-only endpoints whose data changes slowly are listed; live state such as
+# call center status or operator duty status is deliberately left out. A TTL of 0 keeps
+# the response only to revalidate it (ETag / Last-Modified) on every use.
+DEFAULT_TTLS = {
+    "/company": 3600,
+    "/app/settings": 3600,
+    "/calllabels": 3600,
+    "/offices/{office_id}/plan": 3600,
+    "/offices": 600,
+    "/offices/{id}": 600,
+    "/departments/{id}": 600,
+    "/callcenters/{id}": 600,
+    "/users/{id}": 300,
+    "/numbers/{number}": 300,
+    "/contacts/{id}": 0,
+    "/users": 0,
+    "/contacts": 0,
+    "/callcenters": 0,
+    "/departments": 0,
+    "/numbers": 0,
+    "/rooms": 0,
+    "/callrouters": 0,
+}
+
+
+class _Entry:
+    __slots__ = ("entity", "etag", "expires_at", "last_modified", "template", "value")
+
+    def __init__(self, expires_at: float, template: str, entity: tuple[str, str | None], value: Any, etag: str | None, last_modified: str | None) -> None:
+        self.expires_at = expires_at
+        self.template = template
+        self.entity = entity
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with per-endpoint TTLs for GET responses.
+
+    Entries are keyed by API path plus normalised query parameters, so parameter order
+    and ``None`` values never cause spurious misses. Expired entries that carry an ETag or
+    Last-Modified validator are kept so they can be revalidated with a conditional request
+    instead of refetched. Safe to share between threads.
+    """
+
+    def __init__(self, ttls: Mapping[str, float] | None = None, maxsize: int = 1024, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.revalidations = 0
+
+    @staticmethod
+    def key(url: str, params: Mapping[str, Any] | None = None) -> str:
+        query = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+        return api_path(url) + ("?" + urlencode(query) if query else "")
+
+    def ttl_for(self, url: str) -> float | None:
+        """
+        Returns the TTL configured for the endpoint behind ``url``, or None if it is not cacheable.
+        """
+        template = template_for(url)
+        return self.ttls.get(template) if template else None
+
+    def get(self, url: str, params: Mapping[str, Any] | None = None) -> Any | None:
+        """
+        Returns the cached value for a request, or None on a miss or for uncacheable endpoints.
+        """
+        if self.ttl_for(url) is None:
+            return None
+        key = self.key(url, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= self._clock():
+                if entry is not None and entry.etag is None and entry.last_modified is None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def conditional_headers(self, url: str, params: Mapping[str, Any] | None = None) -> dict[str, str]:
+        """
+        Returns If-None-Match / If-Modified-Since headers for a stale entry, or an empty dict.
+        """
+        if self.ttl_for(url) is None:
+            return {}
+        with self._lock:
+            entry = self._entries.get(self.key(url, params))
+        headers = {}
+        if entry is not None:
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def revalidate(self, url: str, params: Mapping[str, Any] | None = None) -> Any | None:
+        """
+        Handles a 304 Not Modified answer: restarts the entry's TTL and returns the stored value,
+        or None if the entry has been evicted or invalidated in the meantime.
+        """
+        ttl = self.ttl_for(url)
+        if ttl is None:
+            return None
+        key = self.key(url, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = self._clock() + ttl
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+            return entry.value
+
+    def set(self, url: str, params: Mapping[str, Any] | None, value: Any, etag: str | None = None, last_modified: str | None = None) -> None:
+        """
+        Stores a value and its validators for a request; silently ignored for uncacheable endpoints,
+        and for revalidate-only (TTL 0) endpoints when the response carried no validator.
+        """
+        ttl = self.ttl_for(url)
+        if ttl is None or (ttl <= 0 and etag is None and last_modified is None):
+            return
+        key = self.key(url, params)
+        with self._lock:
+            self._entries[key] = _Entry(self._clock() + ttl, template_for(url), entity_for(url), value, etag, last_modified)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, resource: str, entity_id: str | None = None) -> int:
+        """
+        Drops cached responses that may contain a resource's data.
+
+        Args:
+            resource (string): First path segment of the resource, e.g. "users".
+            entity_id (string): Id of a single changed entity. Its entries and every collection-level
+                entry of the resource (list pages that may contain it) are dropped. If omitted, only
+                collection-level entries are dropped.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry.entity[0] == resource and entry.entity[1] in (None, entity_id)
+            ]
+            return self._drop(stale)
+
+    def invalidate_resource(self, resource: str) -> int:
+        """
+        Drops every cached response belonging to a resource.
+        """
+        with self._lock:
+            return self._drop([key for key, entry in self._entries.items() if entry.entity[0] == resource])
+
+    def invalidate_url(self, url: str) -> int:
+        """
+        Applies write-through invalidation for a mutating request to ``url``, using the resource
+        map and DEPENDENTS in routes.py.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        entity = entity_for(url)
+        if entity is None:
+            return 0
+        removed = self.invalidate(*entity)
+        for resource in DEPENDENTS.get(template_for(url), ()):
+            removed += self.invalidate_resource(resource)
+        return removed
+
+    def _drop(self, keys: list[str]) -> int:
+        for key in keys:
+            del self._entries[key]
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns hit, miss, revalidation, eviction and invalidation counters along with the current number of entries.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
@@ -0,0 +1,183 @@
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from universal_mcp_dialpad.stats import iter_column_batches
+
+FORMATS = ("parquet", "arrow")
+
+# Fixed column layout of call log exports: (column, Arrow type name). Timestamps are
+# milliseconds since the epoch, as returned by call_list.
+CALL_COLUMNS = (
+    ("call_id", "int64"),
+    ("master_call_id", "int64"),
+    ("date_started", "timestamp"),
+    ("date_rang", "timestamp"),
+    ("date_connected", "timestamp"),
+    ("date_ended", "timestamp"),
+    ("duration", "float64"),
+    ("direction", "string"),
+    ("state", "string"),
+    ("external_number", "string"),
+    ("internal_number", "string"),
+    ("target_id", "int64"),
+    ("target_type", "string"),
+    ("target_name", "string"),
+    ("contact_id", "string"),
+    ("contact_type", "string"),
+    ("contact_name", "string"),
+    ("was_recorded", "bool"),
+    ("labels", "list<string>"),
+)
+
+
+def require_pyarrow():
+    """
+    Imports pyarrow, which columnar output needs but the package does not install by default.
+
+    Raises:
+        ImportError: With installation instructions if pyarrow is missing.
+    """
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError("Columnar output requires pyarrow: pip install 'universal-mcp-dialpad[arrow]'") from exc
+    return pyarrow
+
+
+def _int(value: Any) -> int | None:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value: Any) -> float | None:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _str(value: Any) -> str | None:
+    return str(value) if value not in (None, "") else None
+
+
+def flatten_call(call: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Flattens a call_list item into the CALL_COLUMNS layout.
+    """
+    target = call.get("target") or {}
+    contact = call.get("contact") or {}
+    labels = call.get("labels") or []
+    recorded = call.get("was_recorded")
+    return {
+        "call_id": _int(call.get("call_id")),
+        "master_call_id": _int(call.get("master_call_id")),
+        "date_started": _int(call.get("date_started")),
+        "date_rang": _int(call.get("date_rang")),
+        "date_connected": _int(call.get("date_connected")),
+        "date_ended": _int(call.get("date_ended")),
+        "duration": _float(call.get("duration")),
+        "direction": _str(call.get("direction")),
+        "state": _str(call.get("state")),
+        "external_number": _str(call.get("external_number")),
+        "internal_number": _str(call.get("internal_number")),
+        "target_id": _int(target.get("id")),
+        "target_type": _str(target.get("type")),
+        "target_name": _str(target.get("name")),
+        "contact_id": _str(contact.get("id")),
+        "contact_type": _str(contact.get("type")),
+        "contact_name": _str(contact.get("name")),
+        "was_recorded": bool(recorded) if recorded is not None else None,
+        "labels": [str(label) for label in labels],
+    }
+
+
+def call_schema():
+    """
+    Returns the pyarrow schema for CALL_COLUMNS.
+    """
+    pa = require_pyarrow()
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("ms", tz="UTC"),
+        "list<string>": pa.list_(pa.string()),
+    }
+    return pa.schema([(name, types[type_name]) for name, type_name in CALL_COLUMNS])
+
+
+def iter_call_batches(calls: Iterable[Mapping[str, Any]], batch_size: int = 10_000) -> Iterator[dict[str, list[Any]]]:
+    """
+    Flattens calls and groups them into columnar batches of at most ``batch_size`` rows.
+    """
+    return iter_column_batches((flatten_call(call) for call in calls), batch_size=batch_size)
+
+
+class ColumnarWriter:
+    """
+    Writes columnar batches to a Parquet or Arrow IPC file, one compressed batch at a time.
+
+    Without an explicit schema, the schema is inferred from the first batch and later batches
+    are cast to it, so columns should have a stable type across batches (pass converters via
+    ``types`` rather than relying on per-batch inference). Use as a context manager so the file
+    footer is always written.
+    """
+
+    def __init__(self, path: str | Path, schema=None, format: str = "parquet", compression: str | None = "zstd") -> None:
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported format {format!r}; expected one of {FORMATS}")
+        self._pa = require_pyarrow()
+        self.path = Path(path)
+        self.schema = schema
+        self.format = format
+        self.compression = compression
+        self.rows = 0
+        self._writer = None
+
+    def _open(self) -> None:
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression or "none")
+        else:
+            options = self._pa.ipc.IpcWriteOptions(compression=self.compression)
+            self._writer = self._pa.ipc.new_file(self.path, self.schema, options=options)
+
+    def write(self, columns: Mapping[str, list[Any]]) -> None:
+        """
+        Appends one dict-of-lists batch, casting it to the file's schema.
+        """
+        pa = self._pa
+        if self.schema is None:
+            table = pa.Table.from_pydict(dict(columns))
+            # An all-empty column in the first batch says nothing about its type; store it as text.
+            self.schema = pa.schema([pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field for field in table.schema])
+        else:
+            length = _length(columns)
+            table = pa.Table.from_pydict({name: columns.get(name) or [None] * length for name in self.schema.names})
+        table = table.cast(self.schema)
+        if self._writer is None:
+            self._open()
+        self._writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self) -> None:
+        if self._writer is None and self.schema is not None:
+            self._open()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _length(columns: Mapping[str, list[Any]]) -> int:
+    return max((len(values) for values in columns.values()), default=0)
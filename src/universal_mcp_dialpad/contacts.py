@@ -0,0 +1,190 @@
+import csv
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from universal_mcp_dialpad.phones import normalize_number
+
+SCALAR_FIELDS = ("company_name", "extension", "first_name", "job_title", "last_name", "trunk_group")
+LIST_FIELDS = ("emails", "phones", "urls")
+CONTACT_FIELDS = SCALAR_FIELDS + LIST_FIELDS
+
+CREATE = "create"
+UPSERT_UID = "upsert_uid"
+UPDATE = "update"
+UNCHANGED = "unchanged"
+
+# DialpadApp method performing each write action.
+WRITE_METHODS = {CREATE: "contacts_create", UPSERT_UID: "contacts_create_with_uid", UPDATE: "contacts_update"}
+
+# Separator for multi-valued columns (emails, phones, urls) in CSV input.
+CSV_LIST_SEPARATOR = ";"
+
+
+def read_contacts(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Streams contact records from a CSV file (header row with the contact field names, several
+    emails/phones/urls separated by ``;``) or a JSONL file (one JSON object per line).
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8", newline="") as file:
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            for row in csv.DictReader(file):
+                yield {
+                    column: [part.strip() for part in value.split(CSV_LIST_SEPARATOR) if part.strip()] if column in LIST_FIELDS else value
+                    for column, value in row.items()
+                    if column and value not in (None, "")
+                }
+
+
+def _unique(values: Iterable[Any]) -> list[Any]:
+    return list(dict.fromkeys(value for value in values if value))
+
+
+def normalize_contact(record: Mapping[str, Any], country: str = "US") -> dict[str, Any]:
+    """
+    Keeps the contact fields (plus uid and owner_id) of a record, with E.164 phones where they can be
+    normalised offline, lower-cased emails and de-duplicated lists. Empty fields are dropped.
+    """
+    contact: dict[str, Any] = {}
+    for field in ("uid", "owner_id", *SCALAR_FIELDS):
+        value = record.get(field)
+        if value not in (None, ""):
+            contact[field] = str(value).strip()
+    for field in LIST_FIELDS:
+        values = record.get(field) or []
+        if isinstance(values, str):
+            values = values.split(CSV_LIST_SEPARATOR)
+        values = [str(value).strip() for value in values]
+        if field == "phones":
+            values = [normalize_number(value, country) or value for value in values]
+        elif field == "emails":
+            values = [value.lower() for value in values]
+        values = _unique(values)
+        if values:
+            contact[field] = values
+    return contact
+
+
+def contact_keys(contact: Mapping[str, Any]) -> list[str]:
+    """
+    Identity keys of a normalised contact: its uid, phones and emails.
+    """
+    keys = [f"uid:{contact['uid']}"] if contact.get("uid") else []
+    keys += [f"phone:{phone}" for phone in contact.get("phones") or ()]
+    keys += [f"email:{email}" for email in contact.get("emails") or ()]
+    return keys
+
+
+def merge_contacts(first: Mapping[str, Any], second: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Merges a later duplicate into an earlier record: its scalar fields win, lists are combined.
+    """
+    merged = {**first, **{field: value for field, value in second.items() if field not in LIST_FIELDS}}
+    for field in LIST_FIELDS:
+        values = _unique([*(first.get(field) or ()), *(second.get(field) or ())])
+        if values:
+            merged[field] = values
+    return merged
+
+
+def dedupe_contacts(records: Iterable[Mapping[str, Any]], country: str = "US") -> list[dict[str, Any]]:
+    """
+    Normalises records and merges each one into the first earlier record sharing its uid, a phone or
+    an email, keeping first-seen order. Records with different uids are never merged.
+    """
+    contacts: list[dict[str, Any]] = []
+    owners: dict[str, int] = {}
+    for record in records:
+        contact = normalize_contact(record, country)
+        index = next((owners[key] for key in contact_keys(contact) if key in owners and _compatible(contacts[owners[key]], contact)), None)
+        if index is None:
+            index = len(contacts)
+            contacts.append(contact)
+        else:
+            contacts[index] = merge_contacts(contacts[index], contact)
+        for key in contact_keys(contacts[index]):
+            owners.setdefault(key, index)
+    return contacts
+
+
+def _compatible(first: Mapping[str, Any], second: Mapping[str, Any]) -> bool:
+    return not (first.get("uid") and second.get("uid") and first["uid"] != second["uid"])
+
+
+def contact_changes(contact: Mapping[str, Any], existing: Mapping[str, Any], country: str = "US") -> dict[str, Any]:
+    """
+    Returns the fields of ``contact`` that differ from the existing Dialpad contact.
+    """
+    current = normalize_contact(existing, country)
+    return {field: contact[field] for field in CONTACT_FIELDS if field in contact and contact[field] != current.get(field)}
+
+
+class ContactSnapshot:
+    """
+    Local snapshot of contacts_list, indexed by uid, phone and email, used to skip no-op writes.
+
+    Refresh it with build() when ``is_stale``; record() keeps it current with the contacts written since.
+    """
+
+    def __init__(self, country: str = "US", clock: Callable[[], float] = time.monotonic) -> None:
+        self.country = country
+        self._clock = clock
+        self._by_key: dict[str, dict[str, Any]] = {}
+        self.built_at: float | None = None
+
+    def is_stale(self, max_age: float) -> bool:
+        return self.built_at is None or self._clock() - self.built_at > max_age
+
+    def build(self, contacts: Iterable[Mapping[str, Any]]) -> int:
+        by_key: dict[str, dict[str, Any]] = {}
+        count = 0
+        for contact in contacts:
+            for key in contact_keys(normalize_contact(contact, self.country)):
+                by_key.setdefault(key, dict(contact))
+            count += 1
+        self._by_key = by_key
+        self.built_at = self._clock()
+        return count
+
+    def record(self, contact: Mapping[str, Any]) -> None:
+        for key in contact_keys(normalize_contact(contact, self.country)):
+            self._by_key[key] = dict(contact)
+
+    def match(self, contact: Mapping[str, Any]) -> dict[str, Any] | None:
+        """
+        Finds the existing contact for a normalised record: by uid if it has one, else by phone, then by email.
+        """
+        if contact.get("uid"):
+            return self._by_key.get(f"uid:{contact['uid']}")
+        for key in contact_keys(contact):
+            existing = self._by_key.get(key)
+            if existing is not None:
+                return existing
+        return None
+
+    def plan(self, contact: Mapping[str, Any]) -> tuple[str, dict[str, Any]]:
+        """
+        Decides how to write a normalised record.
+
+        Returns:
+            tuple[str, dict[str, Any]]: UNCHANGED, UPSERT_UID (contacts_create_with_uid with the full record),
+            UPDATE (contacts_update with the id and the changed fields only) or CREATE (contacts_create), with
+            the keyword arguments for that call.
+        """
+        existing = self.match(contact)
+        changes = contact_changes(contact, existing, self.country) if existing is not None else None
+        if changes == {}:
+            return UNCHANGED, {}
+        fields = {field: contact[field] for field in CONTACT_FIELDS if field in contact}
+        if contact.get("uid"):
+            return UPSERT_UID, {"uid": contact["uid"], **fields}
+        if existing is not None and existing.get("id") is not None:
+            return UPDATE, {"id": existing["id"], **changes}
+        return CREATE, {"owner_id": contact.get("owner_id"), **fields}
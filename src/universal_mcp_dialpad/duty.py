@@ -0,0 +1,153 @@
+import time
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from universal_mcp_dialpad.retry import RETRY_STATUSES
+
+DUTY_STATUS = "duty_status"
+SKILL_LEVEL = "skill_level"
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+IN_FLIGHT = "in_flight"
+
+
+def operator_calls(update: Mapping[str, Any]) -> dict[str, tuple[str, dict[str, Any]]]:
+    """
+    Returns the DialpadApp calls one operator update asks for, keyed by DUTY_STATUS / SKILL_LEVEL.
+
+    An update has a ``user_id`` and ``on_duty`` and/or ``duty_status_reason`` for the duty status,
+    and/or ``skill_level`` with the ``call_center_id`` it applies to.
+    """
+    if update.get("user_id") is None:
+        raise ValueError(f"Operator update needs a user_id: {dict(update)!r}")
+    calls = {}
+    if update.get("on_duty") is not None or update.get("duty_status_reason") is not None:
+        calls[DUTY_STATUS] = ("callcenters_operators_dutystatus", {"id": update["user_id"], "on_duty": update.get("on_duty"), "duty_status_reason": update.get("duty_status_reason")})
+    if update.get("skill_level") is not None:
+        if update.get("call_center_id") is None:
+            raise ValueError(f"A skill_level update needs a call_center_id: {dict(update)!r}")
+        calls[SKILL_LEVEL] = ("callcenters_operators_skilllevel", {"call_center_id": update["call_center_id"], "user_id": update["user_id"], "skill_level": update["skill_level"]})
+    if not calls:
+        raise ValueError(f"Operator update sets neither a duty status nor a skill level: {dict(update)!r}")
+    return calls
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Failures worth another attempt: errors without an HTTP response (connection errors, an open
+    circuit) and throttling or server-side statuses. Other 4xx responses will not change on retry.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status is None or status in RETRY_STATUSES or status >= 500
+
+
+class _Call:
+    __slots__ = ("attempts", "due", "error", "kwargs", "method", "status")
+
+    def __init__(self, method: str, kwargs: dict[str, Any]) -> None:
+        self.method = method
+        self.kwargs = kwargs
+        self.attempts = 0
+        self.due = 0.0
+        self.status: str | None = None
+        self.error: str | None = None
+
+
+class OperatorUpdateRun:
+    """
+    Scheduling state of a deadline-bound bulk operator update; performs no I/O.
+
+    The driver executes the ``ready()`` calls concurrently and reports each outcome through
+    ``complete()`` or ``fail()``, sleeping at most ``wait_time()`` in between, until ``done`` or
+    ``expired``. Retryable failures are attempted again with exponential backoff while attempts
+    and time remain. At the deadline, calls never sent (or waiting for a retry) are reported as
+    timed out, and calls still awaiting a response as in flight: Dialpad may yet apply those. A
+    driver that cancels a call before sending it reports that through ``withdraw()``.
+    """
+
+    def __init__(self, updates: Iterable[Mapping[str, Any]], deadline: float, max_attempts: int = 3, backoff: float = 0.25, clock: Callable[[], float] = time.monotonic) -> None:
+        self.updates = [dict(update) for update in updates]
+        self.calls = [{kind: _Call(method, kwargs) for kind, (method, kwargs) in operator_calls(update).items()} for update in self.updates]
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._clock = clock
+        self.deadline = clock() + deadline
+        self.running: set[tuple[int, str]] = set()
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def _pending(self) -> list[tuple[int, str, _Call]]:
+        return [(index, kind, call) for index, calls in enumerate(self.calls) for kind, call in calls.items() if call.status is None and (index, kind) not in self.running]
+
+    @property
+    def done(self) -> bool:
+        return not self.running and not self._pending()
+
+    def ready(self) -> list[tuple[int, str, str, dict[str, Any]]]:
+        """
+        Marks and returns the calls due now, as (index, kind, method name, keyword arguments).
+        """
+        now = self._clock()
+        steps = []
+        for index, kind, call in self._pending():
+            if call.due <= now:
+                call.attempts += 1
+                self.running.add((index, kind))
+                steps.append((index, kind, call.method, call.kwargs))
+        return steps
+
+    def wait_time(self) -> float:
+        """
+        Seconds the driver may wait for outcomes before the next retry is due or the deadline passes.
+        """
+        now = self._clock()
+        retries = [call.due - now for _, _, call in self._pending()]
+        return max(0.0, min([self.deadline - now, *retries]))
+
+    def complete(self, index: int, kind: str) -> None:
+        self.running.discard((index, kind))
+        call = self.calls[index][kind]
+        call.status, call.error = SUCCEEDED, None
+
+    def withdraw(self, index: int, kind: str) -> None:
+        """
+        Records that a call returned by ``ready()`` was cancelled before it was sent.
+        """
+        self.running.discard((index, kind))
+        self.calls[index][kind].attempts -= 1
+
+    def fail(self, index: int, kind: str, error: BaseException) -> None:
+        self.running.discard((index, kind))
+        call = self.calls[index][kind]
+        call.error = str(error) or type(error).__name__
+        due = self._clock() + self.backoff * 2 ** (call.attempts - 1)
+        if not is_retryable(error) or call.attempts >= self.max_attempts or due >= self.deadline:
+            call.status = FAILED
+        else:
+            call.due = due
+
+    def report(self) -> dict[str, Any]:
+        """
+        Returns:
+            dict[str, Any]: Counts of succeeded, failed, timed-out and in-flight calls, and per update
+            (in input order) its user_id, call_center_id and, for each requested change, its status,
+            attempts and last error.
+        """
+        counts = {SUCCEEDED: 0, FAILED: 0, TIMED_OUT: 0, IN_FLIGHT: 0}
+        operators = []
+        for index, (update, calls) in enumerate(zip(self.updates, self.calls)):
+            result = {"user_id": update["user_id"], "call_center_id": update.get("call_center_id")}
+            for kind, call in calls.items():
+                status = call.status or (IN_FLIGHT if (index, kind) in self.running else TIMED_OUT)
+                counts[status] += 1
+                result[kind] = {"status": status, "attempts": call.attempts, "error": call.error}
+            operators.append(result)
+        return {**counts, "operators": operators}
@@ -0,0 +1,83 @@
+from collections.abc import Mapping
+from typing import Any
+
+# Marker a window's fetch puts in its buffer after its last call (see export_calls).
+SHARD_DONE = object()
+
+
+class ShardFailed:
+    """
+    Put in a window's buffer instead of SHARD_DONE when fetching the window failed.
+    """
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def split_window(start: int, end: int, shards: int) -> list[tuple[int, int]]:
+    """
+    Splits the ``[start, end]`` interval into contiguous sub-windows for call_list.
+
+    Neighbouring windows overlap by one unit on each side of their shared boundary so a
+    call starting exactly on it is returned whether the API treats ``started_after`` and
+    ``started_before`` as inclusive or exclusive; BoundaryDeduper removes the duplicates.
+
+    Args:
+        start (integer): Value for the first window's ``started_after``.
+        end (integer): Value for the last window's ``started_before``.
+        shards (integer): Number of windows; capped so every window spans at least one unit.
+
+    Returns:
+        list[tuple[int, int]]: ``(started_after, started_before)`` pairs in time order.
+    """
+    if end <= start:
+        raise ValueError("'end' must be greater than 'start'")
+    if shards < 1:
+        raise ValueError("'shards' must be at least 1")
+    shards = min(shards, end - start)
+    bounds = [start + (end - start) * i // shards for i in range(shards + 1)]
+    windows = []
+    for i in range(shards):
+        lo = bounds[i] if i == 0 else bounds[i] - 1
+        hi = bounds[i + 1] if i == shards - 1 else bounds[i + 1] + 1
+        windows.append((lo, hi))
+    return windows
+
+
+def _started(call: Mapping[str, Any]) -> int | None:
+    try:
+        return int(call["date_started"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class BoundaryDeduper:
+    """
+    Drops calls that a previous window of split_window already returned.
+
+    Only calls starting inside the overlap of two neighbouring windows (or without a usable
+    ``date_started``) can be returned twice, so only their ids are remembered; memory stays
+    proportional to the calls on the boundaries, not to the export.
+    """
+
+    def __init__(self, windows: list[tuple[int, int]]) -> None:
+        self.overlaps = [(windows[i + 1][0], windows[i][1]) for i in range(len(windows) - 1)]
+        self.seen: set[Any] = set()
+
+    def _on_boundary(self, call: Mapping[str, Any]) -> bool:
+        started = _started(call)
+        return started is None or any(lo <= started <= hi for lo, hi in self.overlaps)
+
+    def __call__(self, call: Mapping[str, Any]) -> bool:
+        """
+        Returns whether the call should be emitted, remembering boundary calls.
+        """
+        call_id = call.get("call_id")
+        if call_id is None or not self._on_boundary(call):
+            return True
+        if call_id in self.seen:
+            return False
+        self.seen.add(call_id)
+        return True
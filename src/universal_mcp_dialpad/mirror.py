@@ -0,0 +1,471 @@
+import asyncio
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterable, Callable, Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from universal_mcp_dialpad.phones import canonical_number
+
+# Mirrored kinds: kind -> (iter_* list method, get method, id field). The list and get
+# methods are looked up on the app, so DialpadApp and AsyncDialpadApp both work.
+KINDS = {
+    "offices": ("iter_offices_list", "offices_get", "id"),
+    "departments": ("iter_departments_listall", "departments_get", "id"),
+    "callcenters": ("iter_callcenters_listall", "callcenters_get", "id"),
+    "users": ("iter_users_list", "users_get", "id"),
+    "numbers": ("iter_numbers_list", "numbers_get", "number"),
+    "contacts": ("iter_contacts_list", "contacts_get", "id"),
+}
+
+# Spellings of item/target types in change-log events and number targets.
+KIND_ALIASES = {
+    "user": "users",
+    "office": "offices",
+    "department": "departments",
+    "callcenter": "callcenters",
+    "call_center": "callcenters",
+    "contact": "contacts",
+    "number": "numbers",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    office_id TEXT,
+    data TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE INDEX IF NOT EXISTS entities_by_office ON entities (kind, office_id);
+CREATE TABLE IF NOT EXISTS phone_numbers (
+    number TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (number, kind, id)
+);
+CREATE INDEX IF NOT EXISTS phone_numbers_by_entity ON phone_numbers (kind, id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    kind TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+# Items of running reconciles, held per connection until their reconcile finishes.
+_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS reconcile_items (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+"""
+
+
+def normalize_kind(kind: str | None) -> str | None:
+    if not kind:
+        return None
+    kind = str(kind).lower()
+    return kind if kind in KINDS else KIND_ALIASES.get(kind)
+
+
+def _phone_numbers(kind: str, item: Mapping[str, Any], country: str) -> set[str]:
+    if kind == "numbers":
+        values = [item.get("number")]
+    else:
+        values = item.get("phones") if kind == "contacts" else item.get("phone_numbers")
+    numbers = set()
+    for value in values or ():
+        if isinstance(value, Mapping):
+            value = value.get("number") or value.get("phone")
+        number = canonical_number(value, country) if value else None
+        if number is not None:
+            numbers.add(number)
+    return numbers
+
+
+class _Reconcile:
+    # State of one running reconcile: its generation, the ids changed by events meanwhile (which
+    # the listing must not overwrite or resurrect) and the items not staged yet.
+
+    def __init__(self, generation: int) -> None:
+        self.generation = generation
+        self.touched: set[str] = set()
+        self.pending: list[tuple[str, str, str]] = []
+
+
+class DirectoryMirror:
+    """
+    Local SQLite mirror of the company directory: offices, departments, call centers, users,
+    numbers and contacts.
+
+    full_sync() pages every list endpoint and removes entities that disappeared, committing each
+    kind once; apply_change_log_event() keeps the mirror current between reconciles from the
+    change-log webhook (see subscribe_change_log and apply_change_log_events), and refresh()
+    reconciles whenever the last full sync is older than ``max_age``; refresh_in_background()
+    does the same on a thread while lookups keep answering from the current state. Every write is
+    its own transaction: a reconcile stages its listing and applies it in one transaction when it
+    finishes, so events and other kinds never commit or roll back part of it. Entities changed by
+    events while a reconcile of their kind is running are kept by it. Lookups such as owner_of_number()
+    and office_of_user() are answered from the local database without any API call; numbers are
+    keyed in the canonical form PhoneIndex uses. The ``a``-prefixed methods are the counterparts
+    for an AsyncDialpadApp.
+    """
+
+    def __init__(self, app, path: str | Path = ":memory:", country: str = "US", clock: Callable[[], float] = time.time, stage_batch: int = 500) -> None:
+        self.app = app
+        self.country = country
+        self._clock = clock
+        self.stage_batch = stage_batch
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript(_SCHEMA + _STAGING)
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._arefresh_lock: asyncio.Lock | None = None
+        self._refresh_thread: threading.Thread | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._reconciling: dict[str, _Reconcile] = {}
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _entity_id(self, kind: str, entity_id: Any) -> str:
+        if kind == "numbers":
+            return canonical_number(entity_id, self.country) or str(entity_id)
+        return str(entity_id)
+
+    # Writes
+
+    def _write(self, kind: str, item: Mapping[str, Any], generation: int) -> None:
+        entity_id = self._entity_id(kind, item[KINDS[kind][2]])
+        office_id = item.get("office_id")
+        self._db.execute(
+            "INSERT OR REPLACE INTO entities (kind, id, office_id, data, generation) VALUES (?, ?, ?, ?, ?)",
+            (kind, entity_id, str(office_id) if office_id is not None else None, json.dumps(item), generation),
+        )
+        self._db.execute("DELETE FROM phone_numbers WHERE kind = ? AND id = ?", (kind, entity_id))
+        self._db.executemany(
+            "INSERT OR IGNORE INTO phone_numbers (number, kind, id) VALUES (?, ?, ?)",
+            [(number, kind, entity_id) for number in _phone_numbers(kind, item, self.country)],
+        )
+
+    def upsert(self, kind: str, item: Mapping[str, Any]) -> None:
+        """
+        Inserts or replaces one entity and its phone numbers. While a reconcile of ``kind`` is
+        running the entity joins it, so the reconcile does not delete it as unseen.
+        """
+        with self._lock, self._db:
+            reconcile = self._reconciling.get(kind)
+            if reconcile is not None:
+                reconcile.touched.add(self._entity_id(kind, item[KINDS[kind][2]]))
+            self._write(kind, item, reconcile.generation if reconcile is not None else self._generation(kind))
+
+    def delete(self, kind: str, entity_id: Any) -> None:
+        entity_id = self._entity_id(kind, entity_id)
+        with self._lock, self._db:
+            if kind in self._reconciling:
+                self._reconciling[kind].touched.add(entity_id)
+            self._db.execute("DELETE FROM entities WHERE kind = ? AND id = ?", (kind, entity_id))
+            self._db.execute("DELETE FROM phone_numbers WHERE kind = ? AND id = ?", (kind, entity_id))
+
+    def _generation(self, kind: str) -> int:
+        row = self._db.execute("SELECT generation FROM sync_state WHERE kind = ?", (kind,)).fetchone()
+        return row[0] if row else 0
+
+    # A reconcile stages the items of its listing in reconcile_items, a batch per transaction, and
+    # _finish_reconcile moves them into entities, deletes what was not seen and records the sync in
+    # a single transaction. No transaction stays open while the listing is paged, and only the
+    # database calls hold the lock, so lookups and events are not blocked meanwhile.
+
+    def _begin_reconcile(self, kind: str) -> int:
+        with self._lock:
+            if kind in self._reconciling:
+                raise RuntimeError(f"A reconcile of {kind!r} is already running")
+            # Events of an aborted reconcile may carry its generation; never reuse it.
+            row = self._db.execute("SELECT MAX(generation) FROM entities WHERE kind = ?", (kind,)).fetchone()
+            generation = max(self._generation(kind), row[0] or 0) + 1
+            self._reconciling[kind] = _Reconcile(generation)
+            return generation
+
+    def _reconcile_item(self, kind: str, item: Mapping[str, Any], generation: int) -> None:
+        reconcile = self._reconciling[kind]
+        reconcile.pending.append((kind, self._entity_id(kind, item[KINDS[kind][2]]), json.dumps(item)))
+        if len(reconcile.pending) >= self.stage_batch:
+            self._stage(reconcile)
+
+    def _stage(self, reconcile: _Reconcile) -> None:
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO reconcile_items (kind, id, data) VALUES (?, ?, ?)", reconcile.pending)
+        reconcile.pending = []
+
+    def _finish_reconcile(self, kind: str, generation: int) -> None:
+        reconcile = self._reconciling[kind]
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO reconcile_items (kind, id, data) VALUES (?, ?, ?)", reconcile.pending)
+            for entity_id, data in self._db.execute("SELECT id, data FROM reconcile_items WHERE kind = ?", (kind,)):
+                if entity_id not in reconcile.touched:
+                    self._write(kind, json.loads(data), generation)
+            self._db.execute("DELETE FROM reconcile_items WHERE kind = ?", (kind,))
+            stale = self._db.execute("SELECT id FROM entities WHERE kind = ? AND generation < ?", (kind, generation)).fetchall()
+            self._db.executemany("DELETE FROM phone_numbers WHERE kind = ? AND id = ?", [(kind, row[0]) for row in stale])
+            self._db.execute("DELETE FROM entities WHERE kind = ? AND generation < ?", (kind, generation))
+            self._db.execute("INSERT OR REPLACE INTO sync_state (kind, generation, synced_at) VALUES (?, ?, ?)", (kind, generation, self._clock()))
+            del self._reconciling[kind]
+
+    def _abort_reconcile(self, kind: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM reconcile_items WHERE kind = ?", (kind,))
+            self._reconciling.pop(kind, None)
+
+    def replace_all(self, kind: str, items: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Reconciles one kind against a complete listing: upserts every item, then deletes the
+        entities that were neither part of it nor changed by an event meanwhile. Nothing is
+        deleted if the listing fails part-way.
+
+        Returns:
+            int: Number of items seen.
+        """
+        generation = self._begin_reconcile(kind)
+        count = 0
+        try:
+            for item in items:
+                self._reconcile_item(kind, item, generation)
+                count += 1
+            self._finish_reconcile(kind, generation)
+        except BaseException:
+            self._abort_reconcile(kind)
+            raise
+        return count
+
+    async def areplace_all(self, kind: str, items: AsyncIterable[Mapping[str, Any]]) -> int:
+        generation = self._begin_reconcile(kind)
+        count = 0
+        try:
+            async for item in items:
+                self._reconcile_item(kind, item, generation)
+                count += 1
+            self._finish_reconcile(kind, generation)
+        except BaseException:
+            self._abort_reconcile(kind)
+            raise
+        return count
+
+    # Sync drivers
+
+    def full_sync(self, kinds: Iterable[str] | None = None, prefetch: int = 1) -> dict[str, int]:
+        """
+        Pages every list endpoint of the given kinds (all of KINDS by default) into the mirror.
+
+        Returns:
+            dict[str, int]: Number of entities seen per kind.
+        """
+        return {kind: self.replace_all(kind, getattr(self.app, KINDS[kind][0])(prefetch=prefetch)) for kind in kinds or KINDS}
+
+    async def afull_sync(self, kinds: Iterable[str] | None = None, prefetch: int = 1) -> dict[str, int]:
+        return {kind: await self.areplace_all(kind, getattr(self.app, KINDS[kind][0])(prefetch=prefetch)) for kind in kinds or KINDS}
+
+    def stale_kinds(self, max_age: float) -> list[str]:
+        """
+        Returns the kinds whose last full sync is older than ``max_age`` seconds (or never happened).
+        """
+        now = self._clock()
+        with self._lock:
+            synced = dict(self._db.execute("SELECT kind, synced_at FROM sync_state").fetchall())
+        return [kind for kind in KINDS if now - synced.get(kind, float("-inf")) > max_age]
+
+    def refresh(self, max_age: float = 3600.0) -> dict[str, int]:
+        """
+        Runs a full reconcile of every kind not synced within ``max_age`` seconds. Concurrent
+        callers wait for one reconcile instead of each running their own.
+        """
+        with self._refresh_lock:
+            stale = self.stale_kinds(max_age)
+            return self.full_sync(stale) if stale else {}
+
+    async def arefresh(self, max_age: float = 3600.0) -> dict[str, int]:
+        if self._arefresh_lock is None:
+            self._arefresh_lock = asyncio.Lock()
+        async with self._arefresh_lock:
+            stale = self.stale_kinds(max_age)
+            return await self.afull_sync(stale) if stale else {}
+
+    def _refresh_in_background(self, max_age: float) -> None:
+        # Called with _refresh_lock held. On failure the mirror keeps answering from what it has
+        # and the next refresh_in_background tries again.
+        try:
+            stale = self.stale_kinds(max_age)
+            if stale:
+                self.full_sync(stale)
+        except Exception:
+            pass
+        finally:
+            self._refresh_lock.release()
+
+    def refresh_in_background(self, max_age: float = 3600.0) -> bool:
+        """
+        Starts a refresh() on a thread unless one is already running, so the caller can answer
+        from the current state right away.
+
+        Returns:
+            bool: Whether some kind was not synced within ``max_age`` seconds, i.e. answers given
+            now may be out of date.
+        """
+        if not self.stale_kinds(max_age):
+            return False
+        if self._refresh_lock.acquire(blocking=False):
+            self._refresh_thread = threading.Thread(target=self._refresh_in_background, args=(max_age,), daemon=True)
+            self._refresh_thread.start()
+        return True
+
+    async def _arefresh_in_background(self, max_age: float) -> None:
+        try:
+            await self.arefresh(max_age)
+        except Exception:
+            pass
+
+    async def arefresh_in_background(self, max_age: float = 3600.0) -> bool:
+        if not self.stale_kinds(max_age):
+            return False
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._arefresh_in_background(max_age))
+        return True
+
+    @staticmethod
+    def parse_change_log_event(event: Mapping[str, Any]) -> tuple[str, str, Mapping[str, Any] | None, bool] | None:
+        """
+        Extracts ``(kind, id, item, deleted)`` from a change-log webhook event, or None if the event
+        concerns a kind that is not mirrored. ``item`` is None when the event carries no full object.
+        """
+        item = event.get("item") or event.get("target") or event.get("data")
+        item = item if isinstance(item, Mapping) else None
+        kind = normalize_kind(event.get("item_type") or event.get("target_type") or event.get("type") or (item or {}).get("type"))
+        if kind is None:
+            return None
+        id_field = KINDS[kind][2]
+        entity_id = event.get("item_id") or event.get("target_id") or (item or {}).get(id_field)
+        if entity_id is None:
+            return None
+        change = str(event.get("change_type") or event.get("event_type") or event.get("state") or "").lower()
+        if item is not None and id_field not in item:
+            item = None
+        return kind, str(entity_id), item, "delete" in change or "remove" in change
+
+    def apply_change_log_event(self, event: Mapping[str, Any]) -> bool:
+        """
+        Applies one change-log webhook event. Events without the full object refetch the entity
+        with its get endpoint.
+
+        Returns:
+            bool: Whether the event concerned a mirrored entity.
+        """
+        parsed = self.parse_change_log_event(event)
+        if parsed is None:
+            return False
+        kind, entity_id, item, deleted = parsed
+        if deleted:
+            self.delete(kind, entity_id)
+        else:
+            self.upsert(kind, item if item is not None else getattr(self.app, KINDS[kind][1])(entity_id))
+        return True
+
+    async def aapply_change_log_event(self, event: Mapping[str, Any]) -> bool:
+        parsed = self.parse_change_log_event(event)
+        if parsed is None:
+            return False
+        kind, entity_id, item, deleted = parsed
+        if deleted:
+            self.delete(kind, entity_id)
+        else:
+            self.upsert(kind, item if item is not None else await getattr(self.app, KINDS[kind][1])(entity_id))
+        return True
+
+    def apply_change_log_events(self, events: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Applies a batch of change-log events, e.g. as the consumer of a WebhookReceiver route::
+
+            receiver.route("directory", mirror.apply_change_log_events)
+
+        (use aapply_change_log_events with an AsyncDialpadApp).
+
+        Returns:
+            int: Number of events that concerned a mirrored entity.
+        """
+        return sum(self.apply_change_log_event(event) for event in events)
+
+    async def aapply_change_log_events(self, events: Iterable[Mapping[str, Any]]) -> int:
+        count = 0
+        for event in events:
+            count += await self.aapply_change_log_event(event)
+        return count
+
+    def subscribe_change_log(self, endpoint_id: int) -> dict[str, Any]:
+        """
+        Subscribes a webhook endpoint (see webhooks_create) to change-log events, whose payloads
+        should then be passed to apply_change_log_event. Use asubscribe_change_log with an
+        AsyncDialpadApp.
+        """
+        create = self.app.webhook_change_log_event_subscription_create
+        if inspect.iscoroutinefunction(create):
+            raise TypeError("The app is asynchronous; await asubscribe_change_log instead")
+        return create(enabled=True, endpoint_id=endpoint_id)
+
+    async def asubscribe_change_log(self, endpoint_id: int) -> dict[str, Any]:
+        return await self.app.webhook_change_log_event_subscription_create(enabled=True, endpoint_id=endpoint_id)
+
+    # Lookups
+
+    def get(self, kind: str, entity_id: Any) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._db.execute("SELECT data FROM entities WHERE kind = ? AND id = ?", (kind, self._entity_id(kind, entity_id))).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def all(self, kind: str, office_id: Any = None) -> list[dict[str, Any]]:
+        """
+        Returns every mirrored entity of a kind, optionally restricted to one office.
+        """
+        query = "SELECT data FROM entities WHERE kind = ?"
+        params: tuple = (kind,)
+        if office_id is not None:
+            query += " AND office_id = ?"
+            params += (str(office_id),)
+        with self._lock:
+            return [json.loads(row[0]) for row in self._db.execute(query, params)]
+
+    def owner_of_number(self, number: str) -> dict[str, Any] | None:
+        """
+        Answers "who owns number X" from the mirror.
+
+        Returns:
+            dict[str, Any] | None: {"kind", "id", "entity"} for the owning user, office, department,
+            call center, room or contact; "entity" is None for kinds that are not mirrored.
+        """
+        number = canonical_number(number, self.country)
+        if number is None:
+            return None
+        assignment = self.get("numbers", number)
+        if assignment is not None and assignment.get("target_id") is not None:
+            kind = normalize_kind(assignment.get("target_type")) or str(assignment.get("target_type"))
+            entity = self.get(kind, assignment["target_id"]) if kind in KINDS else None
+            return {"kind": kind, "id": str(assignment["target_id"]), "entity": entity}
+        with self._lock:
+            row = self._db.execute(
+                "SELECT kind, id FROM phone_numbers WHERE number = ? AND kind != 'numbers' ORDER BY kind = 'contacts'", (number,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"kind": row[0], "id": row[1], "entity": self.get(row[0], row[1])}
+
+    def office_of_user(self, user_id: Any) -> dict[str, Any] | None:
+        """
+        Answers "which office is user Y in" from the mirror.
+        """
+        user = self.get("users", user_id)
+        if user is None or user.get("office_id") is None:
+            return None
+        return self.get("offices", user["office_id"])
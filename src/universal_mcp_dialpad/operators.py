@@ -0,0 +1,108 @@
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+CALLCENTER = "callcenter"
+DEPARTMENT = "department"
+OFFICE = "office"
+
+# Group type -> DialpadApp method prefix of its operator endpoints (<prefix>_get/_post/_delete).
+GROUP_ENDPOINTS = {CALLCENTER: "callcenters_operators", DEPARTMENT: "departments_operators", OFFICE: "offices_operators"}
+GROUP_ALIASES = {"callcenters": CALLCENTER, "call_center": CALLCENTER, "call_centers": CALLCENTER, "departments": DEPARTMENT, "offices": OFFICE}
+
+ADD = "add"
+REMOVE = "remove"
+
+USER = "user"
+ROOM = "room"
+
+
+def normalize_group_type(group_type: str) -> str:
+    group_type = GROUP_ALIASES.get(group_type, group_type)
+    if group_type not in GROUP_ENDPOINTS:
+        raise ValueError(f"Unknown operator group type {group_type!r}; expected one of {sorted(GROUP_ENDPOINTS)}")
+    return group_type
+
+
+def desired_operators(group_type: str, operators: Iterable[Any]) -> dict[tuple[str, str], dict[str, Any]]:
+    """
+    Normalises a desired roster. Operators are user IDs or mappings with ``id`` and optionally
+    ``type`` (user or room), ``role`` and, for call centers, ``skill_level`` and ``license_type``.
+
+    Returns:
+        dict[tuple[str, str], dict[str, Any]]: (operator type, operator id) -> the operator options.
+    """
+    roster = {}
+    for operator in operators:
+        spec = dict(operator) if isinstance(operator, Mapping) else {"id": operator}
+        spec.setdefault("type", USER)
+        if spec["type"] not in (USER, ROOM):
+            raise ValueError(f"Unknown operator type {spec['type']!r}")
+        if group_type == CALLCENTER and spec["type"] != USER:
+            raise ValueError("Call center operators must be users")
+        roster[(spec["type"], str(spec["id"]))] = spec
+    return roster
+
+
+def current_operators(response: Mapping[str, Any] | None) -> set[tuple[str, str]]:
+    """
+    Reads the (operator type, operator id) pairs of an ``*_operators_get`` response, which lists
+    operators under ``users`` and ``rooms``.
+    """
+    response = response or {}
+    current = {(USER, str(user["id"])) for user in response.get("users") or () if user.get("id") is not None}
+    current |= {(ROOM, str(room["id"])) for room in response.get("rooms") or () if room.get("id") is not None}
+    return current
+
+
+def roster_diff(current: Iterable[tuple[str, str]], desired: Mapping[tuple[str, str], dict[str, Any]], remove_extra: bool = True) -> list[tuple[str, dict[str, Any]]]:
+    """
+    Returns the minimal changes that turn the current roster into the desired one, as (action,
+    operator) pairs: additions for desired operators not on the roster, then, unless ``remove_extra``
+    is False, removals for operators that are not desired. Operators already present are left alone.
+    """
+    current = set(current)
+    changes = [(ADD, spec) for key, spec in sorted(desired.items()) if key not in current]
+    if remove_extra:
+        changes += [(REMOVE, {"type": kind, "id": operator_id}) for kind, operator_id in sorted(current - set(desired))]
+    return changes
+
+
+def _operator_id(operator_id: Any) -> Any:
+    return int(operator_id) if str(operator_id).isdigit() else operator_id
+
+
+def operator_call(group_type: str, group_id: Any, action: str, operator: Mapping[str, Any]) -> tuple[str, dict[str, Any]]:
+    """
+    Returns the DialpadApp method and keyword arguments that add an operator to, or remove it from, a group.
+    """
+    method = f"{GROUP_ENDPOINTS[group_type]}_{'post' if action == ADD else 'delete'}"
+    operator_id = _operator_id(operator["id"])
+    if group_type == CALLCENTER:
+        if action == REMOVE:
+            return method, {"id": group_id, "user_id": operator_id}
+        options = ("keep_paid_numbers", "license_type", "role", "skill_level")
+        return method, {"id": group_id, "user_id": operator_id, **{option: operator.get(option) for option in options}}
+    kwargs = {"id": group_id, "operator_id": operator_id, "operator_type": operator.get("type", USER)}
+    if action == ADD:
+        kwargs["role"] = operator.get("role")
+    return method, kwargs
+
+
+def record_change(report: dict[str, Any], action: str, operator: Mapping[str, Any], error: BaseException | None = None) -> None:
+    """
+    Records the outcome of one roster change in its group report.
+    """
+    entry = {"type": operator.get("type", USER), "id": operator["id"]}
+    if error is None:
+        report["added" if action == ADD else "removed"].append(entry)
+    else:
+        report["failed"].append({"action": action, **entry, "error": str(error) or type(error).__name__})
+
+
+def roster_report(groups: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "added": sum(len(group["added"]) for group in groups),
+        "removed": sum(len(group["removed"]) for group in groups),
+        "failed": sum(len(group["failed"]) for group in groups),
+        "groups": groups,
+    }
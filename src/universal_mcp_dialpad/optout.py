@@ -0,0 +1,245 @@
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import AsyncIterable, Callable, Iterable, Iterator, Mapping
+from typing import Any
+
+from universal_mcp_dialpad.phones import normalize_number
+
+OPTED_OUT = "opted_out"
+OPTED_BACK_IN = "opted_back_in"
+# Status of a recipient whose number cannot be read, so it cannot be checked against the set.
+INVALID = "invalid"
+
+# A ``tel:`` URI scheme, and an extension or URI parameters after the number.
+_TEL_PREFIX = re.compile(r"^\s*tel:", re.IGNORECASE)
+_EXTENSION = re.compile(r"\s*(?:;|#|(?:x|ext|extension)\.?\s*\d).*$", re.IGNORECASE)
+
+
+def _encode(number: Any) -> int | None:
+    # E.164 numbers have at most 15 digits and no leading zero, so they map one-to-one onto integers.
+    if number is None:
+        return None
+    e164 = normalize_number(_EXTENSION.sub("", _TEL_PREFIX.sub("", str(number))))
+    return int(e164[1:]) if e164 is not None else None
+
+
+def with_state(entries: Iterable[Mapping[str, Any]], state: str) -> Iterator[dict[str, Any]]:
+    """
+    Tags company_sms_opt_out entries with the opt_out_state they were listed under, which the
+    listing items do not necessarily carry themselves.
+    """
+    for entry in entries:
+        yield {**entry, "opt_out_state": state}
+
+
+def _date(entry: Mapping[str, Any]) -> int:
+    try:
+        return int(entry.get("date") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class _Snapshot:
+    # Latest (date, opted out) per number and the watermark of a full company_sms_opt_out pass.
+
+    def __init__(self) -> None:
+        self.latest: dict[int, tuple[int, bool]] = {}
+        self.watermark = 0
+        self.at_watermark: set[tuple[int, bool]] = set()
+        self.skipped = 0
+
+    def add(self, entry: Mapping[str, Any]) -> None:
+        key = _encode(entry.get("recipient"))
+        if key is None:
+            self.skipped += 1
+            return
+        date = _date(entry)
+        opted_out = entry.get("opt_out_state") != OPTED_BACK_IN
+        if date > self.watermark:
+            self.watermark, self.at_watermark = date, set()
+        if date == self.watermark:
+            self.at_watermark.add((key, opted_out))
+        if key not in self.latest or date >= self.latest[key][0]:
+            self.latest[key] = (date, opted_out)
+
+
+class _Changes:
+    # The entries of an OptOutSet.apply pass that the set has not seen yet.
+
+    def __init__(self, opt_outs: "OptOutSet") -> None:
+        self.watermark = opt_outs.watermark
+        self.at_watermark = opt_outs._at_watermark
+        self.newer: list[tuple[int, int, bool, Mapping[str, Any]]] = []
+        self.skipped = 0
+
+    def add(self, entry: Mapping[str, Any]) -> None:
+        key, date = _encode(entry.get("recipient")), _date(entry)
+        if key is None:
+            self.skipped += 1
+            return
+        if date < self.watermark:
+            return
+        opted_out = entry.get("opt_out_state") != OPTED_BACK_IN
+        if date == self.watermark and (key, opted_out) in self.at_watermark:
+            return
+        self.newer.append((date, key, opted_out, entry))
+
+
+class OptOutSet:
+    """
+    Compact, exact set of the numbers that opted out of SMS, built from company_sms_opt_out.
+
+    Numbers are stored as a sorted ``array('Q')`` (8 bytes per number, binary-searched), with
+    small add/remove sets on top for incremental updates that are merged in once they grow past
+    ``compact_threshold``. Unlike a Bloom filter it never reports a number as opted out by mistake.
+    ``watermark`` is the newest entry date seen, so refreshes only apply entries from that date
+    on; entries dated exactly at the watermark that were already applied are skipped. Numbers are
+    read after dropping a ``tel:`` prefix and any extension; entries whose recipient still cannot
+    be read are counted in ``skipped``. abuild()
+    and aapply() take the async iterators of an AsyncDialpadApp.
+    """
+
+    def __init__(self, compact_threshold: int = 4096, clock: Callable[[], float] = time.monotonic) -> None:
+        self.compact_threshold = compact_threshold
+        self._clock = clock
+        self._numbers = array("Q")
+        self._added: set[int] = set()
+        self._removed: set[int] = set()
+        self.watermark = 0
+        # (number, state) of the entries applied with date == watermark.
+        self._at_watermark: set[tuple[int, bool]] = set()
+        # Entries of the last build or apply whose recipient could not be read.
+        self.skipped = 0
+        self.built_at: float | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._numbers) + len(self._added) - len(self._removed)
+
+    def __contains__(self, number: Any) -> bool:
+        key = _encode(number)
+        return key is not None and self._contains(key)
+
+    def _contains(self, key: int) -> bool:
+        if key in self._added:
+            return True
+        if key in self._removed:
+            return False
+        index = bisect_left(self._numbers, key)
+        return index < len(self._numbers) and self._numbers[index] == key
+
+    def is_stale(self, max_age: float) -> bool:
+        return self.built_at is None or self._clock() - self.built_at > max_age
+
+    def build(self, entries: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Replaces the set with company_sms_opt_out entries of both states; the latest entry per number wins.
+
+        Returns:
+            int: Number of opted-out numbers.
+        """
+        snapshot = _Snapshot()
+        for entry in entries:
+            snapshot.add(entry)
+        return self._install(snapshot)
+
+    async def abuild(self, entries: AsyncIterable[Mapping[str, Any]]) -> int:
+        snapshot = _Snapshot()
+        async for entry in entries:
+            snapshot.add(entry)
+        return self._install(snapshot)
+
+    def _install(self, snapshot: "_Snapshot") -> int:
+        numbers = array("Q", sorted(key for key, (_, opted_out) in snapshot.latest.items() if opted_out))
+        with self._lock:
+            self._numbers, self._added, self._removed = numbers, set(), set()
+            self.watermark, self._at_watermark = snapshot.watermark, snapshot.at_watermark
+            self.skipped = snapshot.skipped
+            self.built_at = self._clock()
+        return len(numbers)
+
+    def apply(self, entries: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Applies the entries not yet seen, dated at or after ``watermark``, in date order, e.g. from
+        a fresh pass over company_sms_opt_out or from SMS opt-out webhook events.
+
+        Returns:
+            int: Number of entries applied.
+        """
+        changes = _Changes(self)
+        for entry in entries:
+            changes.add(entry)
+        return self._apply(changes)
+
+    async def aapply(self, entries: AsyncIterable[Mapping[str, Any]]) -> int:
+        changes = _Changes(self)
+        async for entry in entries:
+            changes.add(entry)
+        return self._apply(changes)
+
+    def _apply(self, changes: "_Changes") -> int:
+        newer = sorted(changes.newer, key=lambda item: item[0])
+        for _, _, opted_out, entry in newer:
+            if opted_out:
+                self.add(entry.get("recipient"))
+            else:
+                self.discard(entry.get("recipient"))
+        with self._lock:
+            for date, key, opted_out, _ in newer:
+                if date > self.watermark:
+                    self.watermark, self._at_watermark = date, set()
+                if date == self.watermark:
+                    self._at_watermark.add((key, opted_out))
+            self.skipped = changes.skipped
+            self.built_at = self._clock()
+        return len(newer)
+
+    def add(self, number: Any) -> None:
+        key = _encode(number)
+        if key is None:
+            return
+        with self._lock:
+            self._removed.discard(key)
+            if not self._contains(key):
+                self._added.add(key)
+            self._maybe_compact()
+
+    def discard(self, number: Any) -> None:
+        key = _encode(number)
+        if key is None:
+            return
+        with self._lock:
+            self._added.discard(key)
+            if self._contains(key):
+                self._removed.add(key)
+            self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if len(self._added) + len(self._removed) > self.compact_threshold:
+            kept = (key for key in self._numbers if key not in self._removed)
+            self._numbers = array("Q", sorted([*kept, *self._added]))
+            self._added, self._removed = set(), set()
+
+    def status(self, number: Any) -> str | None:
+        """
+        Returns OPTED_OUT for a number in the set, INVALID for one that cannot be read (and so
+        cannot be cleared against the set), and None for a number that may be messaged.
+        """
+        key = _encode(number)
+        if key is None:
+            return INVALID
+        return OPTED_OUT if self._contains(key) else None
+
+    def filter(self, numbers: Iterable[Any]) -> tuple[list[Any], list[Any]]:
+        """
+        Splits numbers into those that may be messaged and those that may not: opted out, or
+        unreadable. It fails closed, so a number it cannot check is never let through.
+        """
+        allowed, excluded = [], []
+        for number in numbers:
+            (allowed if self.status(number) is None else excluded).append(number)
+        return allowed, excluded
@@ -0,0 +1,168 @@
+import asyncio
+import queue
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Any
+
+Page = dict[str, Any]
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def iter_pages(fetch: Callable[[str | None], Page], max_pages: int | None = None) -> Iterator[Page]:
+    """
+    Follows a Dialpad pagination cursor lazily, yielding one page at a time.
+
+    Args:
+        fetch (callable): Called with the current cursor (None for the first page) and returns the decoded page.
+        max_pages (integer): Stop after this many pages have been fetched.
+
+    Yields:
+        dict[str, Any]: Each page as returned by the API.
+    """
+    cursor = None
+    seen = set()
+    pages = 0
+    while max_pages is None or pages < max_pages:
+        page = fetch(cursor)
+        pages += 1
+        yield page
+        cursor = page.get("cursor")
+        # A repeated cursor would loop forever; treat it like the end of the listing.
+        if not cursor or cursor in seen:
+            return
+        seen.add(cursor)
+
+
+def iter_items(pages: Iterator[Page], max_items: int | None = None) -> Iterator[dict[str, Any]]:
+    """
+    Flattens pages into their ``items``, holding at most one page in memory.
+
+    Args:
+        pages (iterator): Pages as yielded by iter_pages.
+        max_items (integer): Stop after this many items have been yielded.
+
+    Yields:
+        dict[str, Any]: One item per iteration.
+    """
+    if max_items is not None and max_items <= 0:
+        return
+    count = 0
+    for page in pages:
+        for item in page.get("items") or ():
+            yield item
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
+
+
+def prefetch_pages(pages: Iterator[Page], depth: int = 1) -> Iterator[Page]:
+    """
+    Drives ``pages`` from a background thread so that the request for page N+1 is
+    in flight while the caller is still processing page N.
+
+    Args:
+        pages (iterator): Pages as yielded by iter_pages.
+        depth (integer): Maximum number of fetched pages buffered ahead of the consumer.
+
+    Yields:
+        dict[str, Any]: The same pages, in order. Errors raised while fetching are re-raised here.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max(depth, 1))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for page in pages:
+                if not put(page):
+                    return
+        except BaseException as exc:
+            put(_Failure(exc))
+        else:
+            put(_DONE)
+
+    threading.Thread(target=produce, name="dialpad-prefetch", daemon=True).start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+
+
+async def aiter_pages(fetch: Callable[[str | None], Awaitable[Page]], max_pages: int | None = None) -> AsyncIterator[Page]:
+    """
+    Async counterpart of iter_pages; ``fetch`` is a coroutine function.
+    """
+    cursor = None
+    seen = set()
+    pages = 0
+    while max_pages is None or pages < max_pages:
+        page = await fetch(cursor)
+        pages += 1
+        yield page
+        cursor = page.get("cursor")
+        if not cursor or cursor in seen:
+            return
+        seen.add(cursor)
+
+
+async def aiter_items(pages: AsyncIterator[Page], max_items: int | None = None) -> AsyncIterator[dict[str, Any]]:
+    """
+    Async counterpart of iter_items.
+    """
+    if max_items is not None and max_items <= 0:
+        return
+    count = 0
+    async for page in pages:
+        for item in page.get("items") or ():
+            yield item
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
+
+
+async def aprefetch_pages(pages: AsyncIterator[Page], depth: int = 1) -> AsyncIterator[Page]:
+    """
+    Async counterpart of prefetch_pages; the read-ahead runs as a task on the current loop.
+    """
+    buffer: asyncio.Queue = asyncio.Queue(maxsize=max(depth, 1))
+
+    async def produce() -> None:
+        try:
+            async for page in pages:
+                await buffer.put(page)
+        except Exception as exc:
+            await buffer.put(_Failure(exc))
+        else:
+            await buffer.put(_DONE)
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        task.cancel()
@@ -0,0 +1,377 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, Callable, Iterable, Mapping
+from typing import Any
+
+_NON_DIGITS = re.compile(r"\D")
+_LETTERS = re.compile(r"[A-Za-z]")
+
+# National numbering rules used offline: region -> (calling code, trunk prefix, lengths of the
+# national significant number). Numbers these rules cannot settle are left to format_post.
+REGIONS = {
+    "US": ("1", "1", {10}),
+    "CA": ("1", "1", {10}),
+    "PR": ("1", "1", {10}),
+    "GB": ("44", "0", {9, 10}),
+    "IE": ("353", "0", {7, 8, 9}),
+    "FR": ("33", "0", {9}),
+    "DE": ("49", "0", {7, 8, 9, 10, 11}),
+    "NL": ("31", "0", {9}),
+    "BE": ("32", "0", {8, 9}),
+    "CH": ("41", "0", {9}),
+    "ES": ("34", "", {9}),
+    "PT": ("351", "", {9}),
+    "IT": ("39", "", {6, 7, 8, 9, 10, 11}),
+    "SE": ("46", "0", {7, 8, 9}),
+    "NO": ("47", "", {8}),
+    "DK": ("45", "", {8}),
+    "PL": ("48", "", {9}),
+    "IL": ("972", "0", {8, 9}),
+    "AE": ("971", "0", {8, 9}),
+    "ZA": ("27", "0", {9}),
+    "IN": ("91", "0", {10}),
+    "SG": ("65", "", {8}),
+    "HK": ("852", "", {8}),
+    "PH": ("63", "0", {10}),
+    "JP": ("81", "0", {9, 10}),
+    "AU": ("61", "0", {9}),
+    "NZ": ("64", "0", {8, 9, 10}),
+    "MX": ("52", "", {10}),
+    "BR": ("55", "0", {10, 11}),
+}
+
+CALLING_CODES: dict[str, set[int]] = {}
+for _code, _trunk, _lengths in REGIONS.values():
+    CALLING_CODES.setdefault(_code, set()).update(_lengths)
+
+
+def parse_number(number: Any, country: str = "US") -> tuple[str | None, bool]:
+    """
+    Applies the offline rules to one number.
+
+    Returns:
+        tuple[str | None, bool]: The E.164 number (or None) and whether the rules were inconclusive,
+        i.e. the number should be passed to format_post. ``(None, False)`` means it is not a phone number.
+    """
+    if number is None:
+        return None, False
+    text = str(number).strip()
+    if _LETTERS.search(text):
+        return None, True
+    digits = _NON_DIGITS.sub("", text)
+    if not digits:
+        return None, False
+    region = REGIONS.get(str(country).upper())
+    if text.startswith("+"):
+        international = digits
+    elif digits.startswith("00"):
+        international = digits[2:]
+    elif region is not None and region[0] == "1" and digits.startswith("011"):
+        international = digits[3:]
+    else:
+        international = None
+    if international is not None:
+        if not 8 <= len(international) <= 15 or international.startswith("0"):
+            return None, False
+        for size in (1, 2, 3):
+            lengths = CALLING_CODES.get(international[:size])
+            if lengths is not None:
+                return (f"+{international}", False) if len(international) - size in lengths else (None, True)
+        return f"+{international}", False
+    if region is None:
+        return None, True
+    code, trunk, lengths = region
+    if trunk and digits.startswith(trunk) and len(digits) - len(trunk) in lengths:
+        digits = digits[len(trunk):]
+    if len(digits) in lengths and not (code == "1" and digits[0] in "01"):
+        return f"+{code}{digits}", False
+    return None, True
+
+
+def normalize_number(number: Any, country: str = "US") -> str | None:
+    """
+    Normalises a phone number to E.164 without calling the API.
+
+    Numbers with a leading ``+``, ``00`` (or ``011`` in NANP regions) keep their country code;
+    national numbers are read with the rules of ``country`` (ISO 3166-1 alpha-2, as for format_post).
+
+    Returns:
+        str | None: The E.164 number, or None if it cannot be normalised with confidence.
+    """
+    return parse_number(number, country)[0]
+
+
+def canonical_number(number: Any, country: str = "US") -> str | None:
+    """
+    Like normalize_number, but also keeps numbers written with a leading ``+`` that the offline
+    rules are unsure about (e.g. an unusual length for their region) as ``+digits``: numbers
+    Dialpad itself returns are E.164 already.
+    """
+    e164, ambiguous = parse_number(number, country)
+    if e164 is None and ambiguous and str(number).strip().startswith("+"):
+        e164 = f"+{_NON_DIGITS.sub('', str(number))}"
+    return e164
+
+
+def normalize_numbers(numbers: Iterable[Any], country: str = "US") -> list[str | None]:
+    """
+    Normalises a batch of numbers offline, parsing each distinct value once.
+    """
+    seen: dict[Any, str | None] = {}
+    results = []
+    for number in numbers:
+        key = str(number) if number is not None else None
+        if key not in seen:
+            seen[key] = normalize_number(number, country)
+        results.append(seen[key])
+    return results
+
+
+class NumberFormatter:
+    """
+    Offline-first E.164 formatting that only leaves the numbers the local rules cannot settle to
+    format_post, and memoises its answers (including rejections) in a bounded LRU.
+
+    Performs no I/O itself: plan() returns the results so far plus the distinct numbers that need
+    a format_post call, the caller passes each answer to record(), and complete() fills them in.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        self.maxsize = maxsize
+        self._remote: OrderedDict[tuple[str, str], str | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def plan(self, numbers: Iterable[Any], country: str = "US") -> tuple[list[dict[str, Any]], list[str]]:
+        """
+        Returns:
+            tuple[list[dict[str, Any]], list[str]]: One {"number", "e164", "source"} result per input, with
+            source "local", "cache" or None (unresolved), and the distinct numbers still needing format_post.
+        """
+        country = str(country).upper()
+        results = []
+        pending: dict[str, None] = {}
+        parsed: dict[str, tuple[str | None, bool]] = {}
+        for number in numbers:
+            key = str(number).strip() if number is not None else ""
+            if key not in parsed:
+                parsed[key] = parse_number(number, country)
+            e164, ambiguous = parsed[key]
+            if not ambiguous:
+                results.append({"number": number, "e164": e164, "source": "local"})
+                continue
+            with self._lock:
+                cached = (country, key) in self._remote
+                if cached:
+                    self._remote.move_to_end((country, key))
+                    e164 = self._remote[(country, key)]
+            if cached:
+                results.append({"number": number, "e164": e164, "source": "cache"})
+            else:
+                results.append({"number": number, "e164": None, "source": None})
+                pending[key] = None
+        return results, list(pending)
+
+    def record(self, number: str, country: str, response: Mapping[str, Any] | None) -> str | None:
+        """
+        Memoises a format_post response for ``number``; None records that the API rejected it.
+        """
+        e164 = (response or {}).get("e164_number") or None
+        key = (str(country).upper(), str(number).strip())
+        with self._lock:
+            self._remote[key] = e164
+            self._remote.move_to_end(key)
+            while len(self._remote) > self.maxsize:
+                self._remote.popitem(last=False)
+        return e164
+
+    def complete(self, results: list[dict[str, Any]], country: str = "US") -> list[dict[str, Any]]:
+        """
+        Fills the unresolved entries of plan()'s results from the recorded format_post answers.
+        """
+        country = str(country).upper()
+        with self._lock:
+            for result in results:
+                key = (country, str(result["number"]).strip() if result["number"] is not None else "")
+                if result["source"] is None and key in self._remote:
+                    result["e164"] = self._remote[key]
+                    result["source"] = "remote"
+        return results
+
+
+def _contact_name(contact: Mapping[str, Any]) -> str | None:
+    name = contact.get("display_name") or " ".join(part for part in (contact.get("first_name"), contact.get("last_name")) if part)
+    return name or None
+
+
+class _IndexState:
+    # The dicts of a PhoneIndex while build() fills them.
+
+    def __init__(self) -> None:
+        self.company: dict[str, dict[str, Any]] = {}
+        self.contacts: dict[str, dict[str, Any]] = {}
+        self.contact_numbers: dict[str, set[str]] = {}
+
+
+class PhoneIndex:
+    """
+    In-process reverse index from E.164 number to the user, room, call router, office, department,
+    call center or contact that owns it.
+
+    build() swaps in a complete index from numbers_list and contacts_list items; update_number(),
+    update_contact() and their remove_* counterparts patch it in between (DialpadApp feeds them
+    change-log webhook events through ingest_change_log_events). Company numbers take precedence over contacts sharing the same number.
+    Lookups are plain dict reads and take no lock. abuild() takes the async iterators of an
+    AsyncDialpadApp.
+    """
+
+    def __init__(self, country: str = "US", clock: Callable[[], float] = time.monotonic) -> None:
+        self.country = country
+        self._clock = clock
+        self._company: dict[str, dict[str, Any]] = {}
+        self._contacts: dict[str, dict[str, Any]] = {}
+        self._contact_numbers: dict[str, set[str]] = {}
+        self.built_at: float | None = None
+        self.refresh_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._patches: list[tuple[Callable[..., None], tuple]] | None = None
+
+    def __len__(self) -> int:
+        return len(self._company.keys() | self._contacts.keys())
+
+    def is_stale(self, max_age: float) -> bool:
+        return self.built_at is None or self._clock() - self.built_at > max_age
+
+    def _key(self, number: Any) -> str | None:
+        return canonical_number(number, self.country)
+
+    def _number_entry(self, item: Mapping[str, Any]) -> tuple[str, dict[str, Any]] | None:
+        number = self._key(item.get("number"))
+        if number is None:
+            return None
+        return number, {
+            "number": number,
+            "target_type": item.get("target_type"),
+            "target_id": item.get("target_id"),
+            "office_id": item.get("office_id"),
+            "name": None,
+        }
+
+    def _contact_entries(self, contact: Mapping[str, Any]) -> dict[str, dict[str, Any]]:
+        entries = {}
+        for phone in contact.get("phones") or ():
+            number = self._key(phone)
+            if number is not None:
+                entries[number] = {"number": number, "target_type": "contact", "target_id": contact.get("id"), "office_id": None, "name": _contact_name(contact)}
+        return entries
+
+    def build(self, numbers: Iterable[Mapping[str, Any]], contacts: Iterable[Mapping[str, Any]] = ()) -> int:
+        """
+        Replaces the index with the given numbers_list and contacts_list items. Patches applied
+        while the listings are read are replayed onto the new index, so a rebuild that runs
+        alongside lookups and change-log events does not undo them.
+
+        Returns:
+            int: Number of distinct numbers indexed.
+        """
+        state = self._begin_build()
+        try:
+            for item in numbers:
+                self._add_number(state, item)
+            for contact in contacts:
+                self._add_contact(state, contact)
+            self._finish_build(state)
+        finally:
+            self._end_build()
+        return len(self)
+
+    async def abuild(self, numbers: AsyncIterable[Mapping[str, Any]], contacts: AsyncIterable[Mapping[str, Any]] | None = None) -> int:
+        state = self._begin_build()
+        try:
+            async for item in numbers:
+                self._add_number(state, item)
+            if contacts is not None:
+                async for contact in contacts:
+                    self._add_contact(state, contact)
+            self._finish_build(state)
+        finally:
+            self._end_build()
+        return len(self)
+
+    def _begin_build(self) -> "_IndexState":
+        with self._lock:
+            self._patches = []
+        return _IndexState()
+
+    def _add_number(self, state: "_IndexState", item: Mapping[str, Any]) -> None:
+        entry = self._number_entry(item)
+        if entry is not None and entry[1]["target_id"] is not None:
+            state.company[entry[0]] = entry[1]
+
+    def _add_contact(self, state: "_IndexState", contact: Mapping[str, Any]) -> None:
+        entries = self._contact_entries(contact)
+        state.contacts.update(entries)
+        state.contact_numbers[str(contact.get("id"))] = set(entries)
+
+    def _finish_build(self, state: "_IndexState") -> None:
+        with self._lock:
+            self._company, self._contacts, self._contact_numbers = state.company, state.contacts, state.contact_numbers
+            for patch, args in self._patches:
+                patch(*args)
+            self.built_at = self._clock()
+
+    def _end_build(self) -> None:
+        with self._lock:
+            self._patches = None
+
+    def _patch(self, patch: Callable[..., None], *args: Any) -> None:
+        with self._lock:
+            patch(*args)
+            if self._patches is not None:
+                self._patches.append((patch, args))
+
+    def update_number(self, item: Mapping[str, Any]) -> None:
+        """
+        Adds or replaces one numbers_get / numbers_list item; an unassigned number is removed.
+        """
+        entry = self._number_entry(item)
+        if entry is not None:
+            self._patch(self._set_number, *entry)
+
+    def _set_number(self, number: str, entry: dict[str, Any]) -> None:
+        if entry["target_id"] is None:
+            self._company.pop(number, None)
+        else:
+            self._company[number] = entry
+
+    def remove_number(self, number: str) -> None:
+        self._patch(self._company_pop, self._key(number))
+
+    def _company_pop(self, number: str | None) -> None:
+        self._company.pop(number, None)
+
+    def update_contact(self, contact: Mapping[str, Any]) -> None:
+        self._patch(self._set_contact, str(contact.get("id")), self._contact_entries(contact))
+
+    def _set_contact(self, contact_id: str, entries: dict[str, dict[str, Any]]) -> None:
+        self._remove_contact(contact_id)
+        self._contacts.update(entries)
+        self._contact_numbers[contact_id] = set(entries)
+
+    def remove_contact(self, contact_id: Any) -> None:
+        self._patch(self._remove_contact, str(contact_id))
+
+    def _remove_contact(self, contact_id: str) -> None:
+        for number in self._contact_numbers.pop(contact_id, ()):
+            if self._contacts.get(number, {}).get("target_id") is not None and str(self._contacts[number]["target_id"]) == contact_id:
+                del self._contacts[number]
+
+    def lookup(self, number: Any) -> dict[str, Any] | None:
+        """
+        Returns the owner of a number given in any common format, or None if it is not indexed.
+        """
+        key = self._key(number)
+        if key is None:
+            return None
+        return self._company.get(key) or self._contacts.get(key)
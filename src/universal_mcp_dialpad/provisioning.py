@@ -0,0 +1,201 @@
+import json
+import os
+import tempfile
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+CREATE = "create"
+MOVE_OFFICE = "move_office"
+ASSIGN_NUMBER = "assign_number"
+CALLER_ID = "caller_id"
+E911 = "e911"
+OPERATOR = "operator"
+
+E911_FIELDS = ("address", "address2", "city", "country", "state", "zip", "use_validated_option")
+
+
+def user_key(spec: Mapping[str, Any]) -> str:
+    """
+    Identifies a user spec across runs: its ``key`` if given, else its email.
+    """
+    key = spec.get("key") or spec.get("email")
+    if not key:
+        raise ValueError(f"User spec needs an email or a key: {dict(spec)!r}")
+    return str(key)
+
+
+def _operator_offices(spec: Mapping[str, Any]) -> list[tuple[Any, str]]:
+    offices = []
+    for office in spec.get("operator_offices") or ():
+        if isinstance(office, Mapping):
+            offices.append((office["office_id"], office.get("role") or "operator"))
+        else:
+            offices.append((office, "operator"))
+    return offices
+
+
+def plan_user(spec: Mapping[str, Any]) -> dict[str, tuple[str, ...]]:
+    """
+    Builds the dependency graph of the provisioning steps one user spec asks for.
+
+    Every step needs the user to exist; numbers, E911 addresses and operator seats are set up
+    after an office move, and the caller ID after the number it may refer to is assigned.
+
+    Returns:
+        dict[str, tuple[str, ...]]: Step name -> names of the steps it depends on, in execution order.
+    """
+    plan: dict[str, tuple[str, ...]] = {CREATE: ()}
+    placed = (CREATE,)
+    if spec.get("move_office_id") is not None:
+        plan[MOVE_OFFICE] = (CREATE,)
+        placed = (MOVE_OFFICE,)
+    if spec.get("number") or spec.get("area_code"):
+        plan[ASSIGN_NUMBER] = placed
+    if spec.get("caller_id"):
+        plan[CALLER_ID] = (ASSIGN_NUMBER,) if ASSIGN_NUMBER in plan else placed
+    if spec.get("e911"):
+        plan[E911] = placed
+    for office_id, _ in _operator_offices(spec):
+        plan[f"{OPERATOR}:{office_id}"] = placed
+    return plan
+
+
+def step_call(step: str, spec: Mapping[str, Any], user_id: Any) -> tuple[str, dict[str, Any]]:
+    """
+    Returns the DialpadApp method and keyword arguments that perform ``step`` for a user.
+    """
+    if step == CREATE:
+        fields = ("auto_assign", "email", "first_name", "last_name", "license", "office_id")
+        return "users_create", {field: spec.get(field) for field in fields}
+    if step == MOVE_OFFICE:
+        return "users_move_office_patch", {"id": user_id, "office_id": spec["move_office_id"]}
+    if step == ASSIGN_NUMBER:
+        return "numbers_assign_user_number_post", {"id": user_id, "area_code": spec.get("area_code"), "number": spec.get("number"), "primary": spec.get("primary")}
+    if step == CALLER_ID:
+        return "caller_id_users_post", {"id": user_id, "caller_id": spec["caller_id"]}
+    if step == E911:
+        return "users_e911_update", {"id": user_id, **{field: spec["e911"].get(field) for field in E911_FIELDS}}
+    if step.startswith(f"{OPERATOR}:"):
+        roles = {str(office_id): role for office_id, role in _operator_offices(spec)}
+        office_id = step.split(":", 1)[1]
+        return "offices_operators_post", {"id": office_id, "operator_id": user_id, "operator_type": "user", "role": roles[office_id]}
+    raise ValueError(f"Unknown provisioning step {step!r}")
+
+
+def load_checkpoint(path: str | Path) -> dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_checkpoint(path: str | Path, state: Mapping[str, Any]) -> None:
+    """
+    Writes the checkpoint atomically, so an interrupted run never leaves a truncated file behind.
+    """
+    path = Path(path)
+    fd, temporary = tempfile.mkstemp(prefix=f".{path.name}-", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class _UserRun:
+    __slots__ = ("done", "failed", "plan", "running", "spec", "user_id")
+
+    def __init__(self, spec: Mapping[str, Any], saved: Mapping[str, Any]) -> None:
+        self.spec = spec
+        self.plan = plan_user(spec)
+        self.user_id = saved.get("user_id")
+        self.done: set[str] = set(saved.get("done") or ()) & set(self.plan)
+        self.failed: dict[str, str] = {}
+        self.running: set[str] = set()
+
+    def blocked(self) -> list[str]:
+        blocked: set[str] = set()
+        for step, dependencies in self.plan.items():
+            if any(dependency in self.failed or dependency in blocked for dependency in dependencies):
+                blocked.add(step)
+        return [step for step in self.plan if step in blocked]
+
+
+class ProvisioningRun:
+    """
+    Scheduling state of a bulk provisioning run; performs no I/O apart from the checkpoint file.
+
+    The driver repeatedly executes the ``ready()`` steps (concurrently, see step_call) and reports
+    each outcome through ``complete()`` or ``fail()`` until ``done``. Steps whose dependencies failed
+    are skipped. With a checkpoint path, finished steps and created user IDs are saved after every
+    step, and a rerun with the same specs resumes where the previous one stopped; failed steps
+    are attempted again.
+    """
+
+    def __init__(self, specs: Iterable[Mapping[str, Any]], checkpoint: str | Path | None = None) -> None:
+        self.checkpoint = checkpoint
+        saved = load_checkpoint(checkpoint) if checkpoint is not None else {}
+        self.users: dict[str, _UserRun] = {}
+        for spec in specs:
+            key = user_key(spec)
+            if key in self.users:
+                raise ValueError(f"Duplicate user spec {key!r}")
+            self.users[key] = _UserRun(spec, saved.get(key) or {})
+
+    @staticmethod
+    def _runnable(user: _UserRun) -> list[str]:
+        return [
+            step
+            for step, dependencies in user.plan.items()
+            if step not in user.done and step not in user.failed and step not in user.running and all(dependency in user.done for dependency in dependencies)
+        ]
+
+    def ready(self) -> list[tuple[str, str, Mapping[str, Any], Any]]:
+        """
+        Marks and returns the steps whose dependencies have all finished, as (key, step, spec, user_id).
+        """
+        steps = []
+        for key, user in self.users.items():
+            for step in self._runnable(user):
+                user.running.add(step)
+                steps.append((key, step, user.spec, user.user_id))
+        return steps
+
+    @property
+    def done(self) -> bool:
+        return not any(user.running or self._runnable(user) for user in self.users.values())
+
+    def complete(self, key: str, step: str, result: Mapping[str, Any] | None) -> None:
+        user = self.users[key]
+        user.running.discard(step)
+        user.done.add(step)
+        if step == CREATE:
+            user.user_id = (result or {}).get("id")
+        self._save()
+
+    def fail(self, key: str, step: str, error: BaseException) -> None:
+        user = self.users[key]
+        user.running.discard(step)
+        user.failed[step] = str(error) or type(error).__name__
+
+    def _save(self) -> None:
+        if self.checkpoint is not None:
+            state = {key: {"user_id": user.user_id, "done": sorted(user.done)} for key, user in self.users.items() if user.done}
+            save_checkpoint(self.checkpoint, state)
+
+    def report(self) -> dict[str, Any]:
+        """
+        Returns:
+            dict[str, Any]: Counts of fully provisioned and failed users, and per user its user_id
+            with the done, failed (step -> error) and blocked steps.
+        """
+        users = {
+            key: {"user_id": user.user_id, "done": [step for step in user.plan if step in user.done], "failed": dict(user.failed), "blocked": user.blocked()}
+            for key, user in self.users.items()
+        }
+        succeeded = sum(len(user.done) == len(user.plan) for user in self.users.values())
+        return {"succeeded": succeeded, "failed": len(self.users) - succeeded, "users": users}
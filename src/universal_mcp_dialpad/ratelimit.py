@@ -0,0 +1,178 @@
+import threading
+import time
+from collections.abc import Callable, Mapping
+
+from universal_mcp_dialpad.routes import template_for
+
+DEFAULT_FAMILY = "default"
+
+# Endpoint families Dialpad limits separately from the general API budget, keyed by
+# (HTTP method, URL template). Anything not listed only draws from the default bucket.
+FAMILIES = {
+    ("POST", "/sms"): "sms",
+    ("POST", "/stats"): "stats",
+    ("POST", "/call"): "call",
+    ("POST", "/call/initiate_ivr_call"): "call",
+    ("POST", "/users/{id}/initiate_call"): "call",
+}
+
+# (requests per second, burst size) per family. Conservative defaults; pass ``limits`` to
+# RateLimiter to match the limits of a specific Dialpad account.
+DEFAULT_LIMITS = {
+    DEFAULT_FAMILY: (20.0, 20),
+    "sms": (100 / 60, 10),
+    "stats": (200 / 3600, 5),
+    "call": (5.0, 5),
+}
+
+# Environment variable the MCP server reads the account's limits from, in parse_limits format.
+RATE_LIMITS_ENV = "DIALPAD_RATE_LIMITS"
+
+
+def parse_limits(spec: str | None) -> dict[str, tuple[float, float]]:
+    """
+    Parses limits written as ``family=rate:burst`` pairs separated by commas, e.g.
+    ``"default=10:10,sms=1.5:10"``, with rate in requests per second. Families left out keep
+    their DEFAULT_LIMITS.
+
+    Raises:
+        ValueError: For an unknown family or a malformed, zero or negative limit.
+    """
+    limits = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        family, _, limit = part.partition("=")
+        family = family.strip()
+        if family not in DEFAULT_LIMITS:
+            raise ValueError(f"Unknown rate limit family {family!r}; expected one of {sorted(DEFAULT_LIMITS)}")
+        try:
+            rate, capacity = (float(value) for value in limit.split(":"))
+        except ValueError:
+            raise ValueError(f"Rate limit {part.strip()!r} is not of the form family=rate:burst") from None
+        if rate <= 0 or capacity <= 0:
+            raise ValueError(f"Rate limit {part.strip()!r} must be positive")
+        limits[family] = (rate, capacity)
+    return limits
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of blocking.
+
+    ``reserve()`` always takes a token, letting the balance go negative, and returns how long
+    the caller must wait before using it. Callers therefore queue in arrival order and the
+    same bucket serves threads (``time.sleep``) and coroutines (``asyncio.sleep``) alike.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("'rate' and 'capacity' must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Takes ``tokens`` tokens (one per request by default).
+
+        Returns:
+            float: Seconds to wait before the request may be sent; 0 when a token was available.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Client-side limiter with one token bucket per (API key, endpoint family).
+
+    Every request draws from its key's default bucket and, for the families in FAMILIES,
+    from that family's bucket as well. Share one instance between apps (see shared_limiter)
+    so that parallel agents using the same key draw from the same budget.
+    """
+
+    def __init__(self, limits: Mapping[str, tuple[float, float]] | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self._clock = clock
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._metrics: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def family_for(method: str, url: str) -> str:
+        return FAMILIES.get((method.upper(), template_for(url)), DEFAULT_FAMILY)
+
+    def configure(self, limits: Mapping[str, tuple[float, float]]) -> None:
+        """
+        Replaces the limits of the given families; their buckets start over with the new limits.
+        """
+        with self._lock:
+            changed = {family for family, limit in limits.items() if self.limits.get(family) != tuple(limit)}
+            self.limits.update({family: tuple(limits[family]) for family in changed})
+            self._buckets = {(key, family): bucket for (key, family), bucket in self._buckets.items() if family not in changed}
+
+    def _bucket(self, key: str, family: str) -> TokenBucket:
+        bucket = self._buckets.get((key, family))
+        if bucket is None:
+            rate, capacity = self.limits[family]
+            bucket = self._buckets.setdefault((key, family), TokenBucket(rate, capacity, self._clock))
+        return bucket
+
+    def reserve(self, key: str, method: str, url: str) -> float:
+        """
+        Reserves capacity for one request.
+
+        Args:
+            key (string): Identifies the API credential the request is made with.
+            method (string): HTTP method of the request.
+            url (string): Request URL, used to find the endpoint family.
+
+        Returns:
+            float: Seconds the caller must wait before sending the request.
+        """
+        family = self.family_for(method, url)
+        with self._lock:
+            wait = self._bucket(key, DEFAULT_FAMILY).reserve()
+            if family != DEFAULT_FAMILY:
+                wait = max(wait, self._bucket(key, family).reserve())
+            metrics = self._metrics.setdefault(family, {"requests": 0, "delayed": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0})
+            metrics["requests"] += 1
+            if wait > 0:
+                metrics["delayed"] += 1
+                metrics["wait_seconds"] += wait
+                metrics["max_wait_seconds"] = max(metrics["max_wait_seconds"], wait)
+        return wait
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Returns queue-wait metrics per endpoint family: requests seen, how many were delayed,
+        and the total and maximum time spent waiting for a token.
+        """
+        with self._lock:
+            return {family: dict(metrics) for family, metrics in self._metrics.items()}
+
+
+_shared_limiter: RateLimiter | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter(limits: Mapping[str, tuple[float, float]] | None = None) -> RateLimiter:
+    """
+    Returns the process-wide limiter used by apps created with ``rate_limiter=True`` or a
+    mapping of limits. ``limits`` override DEFAULT_LIMITS, and those of an existing limiter.
+    """
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(limits)
+        elif limits:
+            _shared_limiter.configure(limits)
+        return _shared_limiter
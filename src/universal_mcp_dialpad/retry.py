@@ -0,0 +1,128 @@
+import random
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Methods that may be repeated without changing the outcome. PATCH is included because the
+# Dialpad updates it is used for (users_update, callcenters_operators_dutystatus, ...) set
+# fields to absolute values.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"})
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+_idempotency_key: ContextVar[str | None] = ContextVar("dialpad_idempotency_key", default=None)
+_retries_disabled: ContextVar[bool] = ContextVar("dialpad_retries_disabled", default=False)
+
+
+@contextmanager
+def idempotency_key(key: str) -> Iterator[str]:
+    """
+    Marks the requests made inside the block as safe to retry by attaching an Idempotency-Key header.
+
+    Without a key, non-idempotent requests such as sms_send or call_call are never retried::
+
+        with idempotency_key(f"campaign-{campaign_id}-{recipient}"):
+            app.sms_send(to_numbers=[recipient], text=text)
+    """
+    token = _idempotency_key.set(key)
+    try:
+        yield key
+    finally:
+        _idempotency_key.reset(token)
+
+
+def current_idempotency_key() -> str | None:
+    return _idempotency_key.get()
+
+
+@contextmanager
+def without_retries() -> Iterator[None]:
+    """
+    Sends the requests made inside the block once, whatever the app's RetryPolicy, for callers
+    that schedule their own retries (e.g. against a deadline).
+    """
+    token = _retries_disabled.set(True)
+    try:
+        yield
+    finally:
+        _retries_disabled.reset(token)
+
+
+def retries_disabled() -> bool:
+    return _retries_disabled.get()
+
+
+def parse_retry_after(value: str | None, now: Callable[[], float] = time.time) -> float | None:
+    """
+    Parses a Retry-After header given either as delay seconds or as an HTTP date.
+
+    Returns:
+        float | None: Seconds to wait, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests are repeated and how long to wait in between.
+
+    Retries cover RETRY_STATUSES and connection-level errors, for idempotent methods only, or
+    for any method when the caller supplied an idempotency key. Delays use exponential backoff
+    with full jitter; a Retry-After header takes precedence, capped at ``max_retry_after``.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 120.0,
+        statuses: frozenset[int] = RETRY_STATUSES,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.statuses = statuses
+        self._rand = rand
+
+    def allows(self, method: str, idempotency_key: str | None = None) -> bool:
+        """
+        Whether requests with this method may be retried at all.
+        """
+        return method.upper() in IDEMPOTENT_METHODS or idempotency_key is not None
+
+    def should_retry(self, attempt: int, status_code: int | None = None) -> bool:
+        """
+        Whether to try again after ``attempt`` (0-based) failed.
+
+        Args:
+            attempt (integer): Index of the attempt that just failed.
+            status_code (integer): Response status, or None for a connection-level error.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return False
+        return status_code is None or status_code in self.statuses
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """
+        Seconds to wait before the attempt following ``attempt`` (0-based).
+        """
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.max_retry_after)
+        return self._rand() * min(self.max_backoff, self.backoff * 2**attempt)
@@ -0,0 +1,216 @@
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+API_PREFIX = "/api/v2"
+
+# Every URL template used by the endpoint methods in app.py, relative to API_PREFIX.
+ROUTES = (
+    "/accesscontrolpolicies",
+    "/accesscontrolpolicies/{id}",
+    "/accesscontrolpolicies/{id}/assign",
+    "/accesscontrolpolicies/{id}/assignments",
+    "/accesscontrolpolicies/{id}/unassign",
+    "/app/settings",
+    "/blockednumbers",
+    "/blockednumbers/add",
+    "/blockednumbers/remove",
+    "/blockednumbers/{number}",
+    "/call",
+    "/call/initiate_ivr_call",
+    "/call/{id}",
+    "/call/{id}/actions/hangup",
+    "/call/{id}/labels",
+    "/call/{id}/participants/add",
+    "/call/{id}/transfer",
+    "/call/{id}/unpark",
+    "/callback",
+    "/callback/validate",
+    "/callcenters",
+    "/callcenters/operators/{id}/dutystatus",
+    "/callcenters/{call_center_id}/operators/{user_id}/skill",
+    "/callcenters/{id}",
+    "/callcenters/{id}/operators",
+    "/callcenters/{id}/status",
+    "/calllabels",
+    "/callreviewsharelink",
+    "/callreviewsharelink/{id}",
+    "/callrouters",
+    "/callrouters/{id}",
+    "/callrouters/{id}/assign_number",
+    "/channels",
+    "/channels/{id}",
+    "/channels/{id}/members",
+    "/coachingteams",
+    "/coachingteams/{id}",
+    "/coachingteams/{id}/members",
+    "/company",
+    "/company/{id}/smsoptout",
+    "/conference/meetings",
+    "/conference/rooms",
+    "/contacts",
+    "/contacts/{id}",
+    "/customivrs",
+    "/customivrs/{ivr_id}",
+    "/customivrs/{target_type}/{target_id}/{ivr_type}",
+    "/departments",
+    "/departments/{id}",
+    "/departments/{id}/operators",
+    "/faxline",
+    "/numbers",
+    "/numbers/assign",
+    "/numbers/format",
+    "/numbers/{number}",
+    "/numbers/{number}/assign",
+    "/oauth2/authorize",
+    "/oauth2/deauthorize",
+    "/oauth2/token",
+    "/offices",
+    "/offices/{id}",
+    "/offices/{id}/assign_number",
+    "/offices/{id}/e911",
+    "/offices/{id}/offdutystatuses",
+    "/offices/{id}/operators",
+    "/offices/{id}/unassign_number",
+    "/offices/{office_id}/available_licenses",
+    "/offices/{office_id}/callcenters",
+    "/offices/{office_id}/departments",
+    "/offices/{office_id}/plan",
+    "/offices/{office_id}/teams",
+    "/recordingsharelink",
+    "/recordingsharelink/{id}",
+    "/rooms",
+    "/rooms/international_pin",
+    "/rooms/{id}",
+    "/rooms/{id}/assign_number",
+    "/rooms/{id}/unassign_number",
+    "/rooms/{parent_id}/deskphones",
+    "/rooms/{parent_id}/deskphones/{id}",
+    "/schedulereports",
+    "/schedulereports/{id}",
+    "/sms",
+    "/stats",
+    "/stats/{id}",
+    "/subscriptions/agent_status",
+    "/subscriptions/agent_status/{id}",
+    "/subscriptions/call",
+    "/subscriptions/call/{id}",
+    "/subscriptions/changelog",
+    "/subscriptions/changelog/{id}",
+    "/subscriptions/contact",
+    "/subscriptions/contact/{id}",
+    "/subscriptions/sms",
+    "/subscriptions/sms/{id}",
+    "/transcripts/{call_id}",
+    "/transcripts/{call_id}/url",
+    "/userdevices",
+    "/userdevices/{id}",
+    "/users",
+    "/users/{id}",
+    "/users/{id}/activecall",
+    "/users/{id}/assign_number",
+    "/users/{id}/caller_id",
+    "/users/{id}/e911",
+    "/users/{id}/initiate_call",
+    "/users/{id}/move_office",
+    "/users/{id}/personas",
+    "/users/{id}/screenpop",
+    "/users/{id}/status",
+    "/users/{id}/togglednd",
+    "/users/{id}/togglevi",
+    "/users/{id}/unassign_number",
+    "/users/{parent_id}/deskphones",
+    "/users/{parent_id}/deskphones/{id}",
+    "/webhooks",
+    "/webhooks/{id}",
+    "/websockets",
+    "/websockets/{id}",
+)
+
+
+# Mutations whose effects show up in cached data of other resources, keyed by URL template.
+# Every entry of the listed resources is dropped when one of these succeeds.
+DEPENDENTS = {
+    "/numbers/assign": ("users", "offices", "rooms", "callrouters"),
+    "/numbers/{number}": ("users", "offices", "rooms", "callrouters"),
+    "/numbers/{number}/assign": ("users", "offices", "rooms", "callrouters"),
+    "/users/{id}/assign_number": ("numbers",),
+    "/users/{id}/unassign_number": ("numbers",),
+    "/users/{id}/move_office": ("offices",),
+    "/offices/{id}/assign_number": ("numbers",),
+    "/offices/{id}/unassign_number": ("numbers",),
+    "/rooms/{id}/assign_number": ("numbers",),
+    "/rooms/{id}/unassign_number": ("numbers",),
+    "/callrouters/{id}/assign_number": ("numbers",),
+    "/faxline": ("numbers",),
+}
+
+
+def _resource(template: str) -> tuple[str, bool]:
+    segments = template.strip("/").split("/")
+    return segments[0], len(segments) > 1 and segments[1].startswith("{")
+
+
+# Resource map derived from ROUTES: template -> (resource, whether the second segment is the entity id).
+# ``/users/{id}/e911`` belongs to entity ``users/<id>``; ``/users`` and ``/callcenters/operators/{id}/dutystatus``
+# are resource-level.
+RESOURCES = {template: _resource(template) for template in ROUTES}
+
+
+def api_path(url: str) -> str:
+    """
+    Returns the path of a request URL relative to API_PREFIX, without query string.
+
+    Only the last occurrence of the prefix is stripped, since the endpoint methods append
+    ``/api/v2/...`` to a base_url that already ends in it.
+    """
+    path = urlsplit(url).path
+    if API_PREFIX in path:
+        path = path.rsplit(API_PREFIX, 1)[1]
+    return path.rstrip("/") or "/"
+
+
+@lru_cache(maxsize=None)
+def _pattern(template: str) -> re.Pattern:
+    return re.compile("^" + re.sub(r"\\\{[^/]+?\\\}", "[^/]+", re.escape(template)) + "$")
+
+
+@lru_cache(maxsize=4096)
+def _match(path: str) -> str | None:
+    candidates = [template for template in ROUTES if _pattern(template).match(path)]
+    if not candidates:
+        return None
+    # Literal segments beat placeholders, so /numbers/format wins over /numbers/{number}.
+    return min(candidates, key=lambda template: template.count("{"))
+
+
+def template_for(url: str) -> str | None:
+    """
+    Maps a concrete request URL back to the URL template it was built from.
+
+    Args:
+        url (string): Absolute or relative request URL, e.g. ``https://dialpad.com/api/v2/users/42``.
+
+    Returns:
+        str | None: The matching entry of ROUTES, e.g. ``/users/{id}``, or None for unknown paths.
+    """
+    return _match(api_path(url))
+
+
+def entity_for(url: str) -> tuple[str, str | None] | None:
+    """
+    Identifies the Dialpad entity a request URL addresses.
+
+    Args:
+        url (string): Request URL.
+
+    Returns:
+        tuple[str, str | None] | None: ``(resource, entity_id)`` such as ``("users", "42")``; the id is
+        None for collection-level URLs. None if the URL matches no known template.
+    """
+    template = template_for(url)
+    if template is None:
+        return None
+    resource, has_entity = RESOURCES[template]
+    entity_id = api_path(url).strip("/").split("/")[1] if has_entity else None
+    return resource, entity_id
@@ -1,13 +1,16 @@
 
+import os
+
 from universal_mcp.servers import SingleMCPServer
 from universal_mcp.integrations import AgentRIntegration
 from universal_mcp.stores import EnvironmentStore
 
-from universal_mcp_dialpad.app import DialpadApp
+from universal_mcp_dialpad.async_app import AsyncDialpadApp
+from universal_mcp_dialpad.ratelimit import RATE_LIMITS_ENV, parse_limits
 
 env_store = EnvironmentStore()
 integration_instance = AgentRIntegration(name="dialpad", store=env_store)
-app_instance = DialpadApp(integration=integration_instance)
+app_instance = AsyncDialpadApp(integration=integration_instance, rate_limiter=parse_limits(os.environ.get(RATE_LIMITS_ENV)), circuit_breaker=True)
 
 mcp = SingleMCPServer(
     app_instance=app_instance,
@@ -0,0 +1,147 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Any
+
+from universal_mcp_dialpad.optout import INVALID, OPTED_OUT
+from universal_mcp_dialpad.ratelimit import TokenBucket
+
+# sms_send accepts at most this many to_numbers per request.
+MAX_TO_NUMBERS = 10
+
+SENDER_FIELDS = ("from_number", "user_id", "sender_group_id", "sender_group_type")
+
+SENT = "sent"
+FAILED = "failed"
+
+
+def sms_message(item: Any, defaults: Mapping[str, Any] | None = None) -> dict[str, Any]:
+    """
+    Normalises one bulk-send item: a ``(to_number, text)`` or ``(to_number, text, media)`` tuple, or a
+    mapping with ``to_number``, ``text``, optional ``media`` and optional sender fields overriding
+    ``defaults``.
+    """
+    if isinstance(item, Mapping):
+        message = {field: item.get(field, (defaults or {}).get(field)) for field in SENDER_FIELDS}
+        message.update(to_number=item.get("to_number") or item.get("to"), text=item.get("text"), media=item.get("media"))
+    else:
+        to_number, text, *rest = item
+        message = {field: (defaults or {}).get(field) for field in SENDER_FIELDS}
+        message.update(to_number=to_number, text=text, media=rest[0] if rest else None)
+    if not message["to_number"]:
+        raise ValueError(f"Bulk SMS item without a recipient: {item!r}")
+    return message
+
+
+def sender_key(message: Mapping[str, Any]) -> str:
+    """
+    Identifies the sender whose throughput a message counts against: from_number when given
+    (it overrides the other sender fields in sms_send), else the sender group, else the user.
+    """
+    if message.get("from_number"):
+        return str(message["from_number"])
+    if message.get("sender_group_id") is not None:
+        return f"{message.get('sender_group_type') or 'group'}:{message['sender_group_id']}"
+    if message.get("user_id") is not None:
+        return f"user:{message['user_id']}"
+    return "default"
+
+
+def iter_sms_batches(messages: Iterable[Mapping[str, Any]], max_recipients: int = 1, max_open: int = 1024) -> Iterator[dict[str, Any]]:
+    """
+    Turns normalised messages into sms_send batches. By default every recipient gets its own
+    message. With ``max_recipients`` above 1, messages with the same sender, text and media are
+    merged into batches of up to that many to_numbers; Dialpad delivers such a batch as one group
+    message, so its recipients see each other's numbers. Only opt in when that is intended.
+
+    Consumes the stream lazily; at most ``max_open`` partly filled batches are held back, the
+    oldest being flushed first.
+
+    Yields:
+        dict[str, Any]: {"sender", "sender_key", "text", "media", "to_numbers"} per batch.
+    """
+    max_recipients = max(1, min(max_recipients, MAX_TO_NUMBERS))
+    open_batches: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+    for message in messages:
+        sender = {field: message.get(field) for field in SENDER_FIELDS}
+        key = (tuple(sender.values()), message["text"], message.get("media"))
+        batch = open_batches.get(key)
+        if batch is not None and message["to_number"] in batch["to_numbers"]:
+            # Repeated recipients get their own message rather than being merged away.
+            yield open_batches.pop(key)
+            batch = None
+        if batch is None:
+            if len(open_batches) >= max_open:
+                yield open_batches.popitem(last=False)[1]
+            batch = open_batches[key] = {"sender": sender, "sender_key": sender_key(sender), "text": message["text"], "media": message.get("media"), "to_numbers": []}
+        batch["to_numbers"].append(message["to_number"])
+        if len(batch["to_numbers"]) >= max_recipients:
+            yield open_batches.pop(key)
+    yield from open_batches.values()
+
+
+def opted_out_result(message: Mapping[str, Any], status: str = OPTED_OUT) -> dict[str, Any]:
+    """
+    Report entry for a recipient that was skipped because it opted out of SMS or, with status
+    INVALID, because its number cannot be read and so cannot be checked against the opt-outs.
+    """
+    error = "Recipient number cannot be read, so it was not checked against the SMS opt-outs" if status == INVALID else None
+    return {"to_number": message["to_number"], "sender": sender_key(message), "status": status, "id": None, "error": error}
+
+
+def batch_idempotency_key(campaign_id: str, batch: Mapping[str, Any]) -> str:
+    """
+    Derives a stable Idempotency-Key for one batch of a campaign, so that it may be retried safely.
+    """
+    content = repr((batch["sender_key"], batch["text"], batch.get("media"), sorted(batch["to_numbers"])))
+    return f"{campaign_id}-{hashlib.sha256(content.encode()).hexdigest()[:24]}"
+
+
+def batch_results(batch: Mapping[str, Any], response: Mapping[str, Any] | None = None, error: BaseException | None = None) -> list[dict[str, Any]]:
+    """
+    Expands the outcome of one sms_send batch into per-recipient report entries. The message
+    ``id`` is only reported for single-recipient batches: a group message has one id shared by
+    all of its recipients, which does not identify any one delivery.
+    """
+    message_id = (response or {}).get("id") if len(batch["to_numbers"]) == 1 else None
+    return [
+        {
+            "to_number": to_number,
+            "sender": batch["sender_key"],
+            "status": FAILED if error is not None else SENT,
+            "id": message_id,
+            "error": str(error) if error is not None else None,
+        }
+        for to_number in batch["to_numbers"]
+    ]
+
+
+class SenderPacer:
+    """
+    Paces sends per sender to carrier throughput limits, one token bucket per sender key.
+
+    Each recipient counts as one message. ``rates`` overrides the default ``(rate, burst)`` for
+    specific senders, e.g. a toll-free or short code number with a higher allowance.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: float = 10, rates: Mapping[str, tuple[float, float]] | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.rates = dict(rates or {})
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, sender: str, messages: int = 1) -> float:
+        """
+        Returns:
+            float: Seconds to wait before ``messages`` messages may be sent from ``sender``.
+        """
+        with self._lock:
+            bucket = self._buckets.get(sender)
+            if bucket is None:
+                rate, burst = self.rates.get(sender, (self.rate, self.burst))
+                bucket = self._buckets[sender] = TokenBucket(rate, burst, self._clock)
+        return bucket.reserve(messages)
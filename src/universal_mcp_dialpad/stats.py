@@ -0,0 +1,295 @@
+import csv
+import os
+import re
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+COMPLETE = "complete"
+FAILED = "failed"
+PENDING = "pending"
+
+# Read timeout for fetching finished reports from their pre-signed download URL.
+DOWNLOAD_TIMEOUT = 60.0
+
+
+class StatsJobError(Exception):
+    """
+    Raised when Dialpad reports that a stats request failed.
+    """
+
+
+def poll_intervals(initial: float = 1.0, factor: float = 1.5, maximum: float = 15.0) -> Iterator[float]:
+    """
+    Yields the delays between stats_get polls: short at first, growing geometrically up to ``maximum``.
+    """
+    delay = initial
+    while True:
+        yield delay
+        delay = min(maximum, delay * factor)
+
+
+def job_state(result: dict[str, Any]) -> str:
+    """
+    Classifies a stats_get response as COMPLETE, FAILED or PENDING.
+    """
+    status = str(result.get("status") or "").lower()
+    if status == FAILED:
+        return FAILED
+    if status == COMPLETE or (not status and result.get("download_url")):
+        return COMPLETE
+    return PENDING
+
+
+class _StatsJob:
+    __slots__ = ("deadline", "delays", "next_poll", "params", "request_id")
+
+    def __init__(self, params: Mapping[str, Any]) -> None:
+        self.params = dict(params)
+        self.request_id: str | None = None
+        self.deadline = 0.0
+        self.next_poll = 0.0
+        self.delays: Iterator[float] = iter(())
+
+
+class StatsBatch:
+    """
+    Scheduling state for many stats requests handled by one polling loop; performs no I/O itself.
+
+    The driver repeatedly submits ``ready_to_submit()`` jobs with stats_create and polls ``due()``
+    jobs with stats_get, reporting each outcome through ``update()`` or ``fail()``. At most
+    ``concurrency`` jobs are in flight at once, and each job backs off independently.
+    """
+
+    def __init__(
+        self,
+        jobs: Iterable[Mapping[str, Any]],
+        concurrency: int = 8,
+        timeout: float = 600.0,
+        initial_interval: float = 1.0,
+        max_interval: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._pending = iter(jobs)
+        self._exhausted = False
+        self._active: list[_StatsJob] = []
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self._clock = clock
+
+    @property
+    def done(self) -> bool:
+        return self._exhausted and not self._active
+
+    def ready_to_submit(self) -> list[_StatsJob]:
+        """
+        Takes as many new jobs as the concurrency cap allows; each must be submitted with stats_create.
+        """
+        jobs = []
+        while not self._exhausted and len(self._active) < self.concurrency:
+            try:
+                params = next(self._pending)
+            except StopIteration:
+                self._exhausted = True
+                break
+            job = _StatsJob(params)
+            self._active.append(job)
+            jobs.append(job)
+        return jobs
+
+    def due(self) -> list[_StatsJob]:
+        """
+        Returns the submitted jobs whose next stats_get poll is due.
+        """
+        now = self._clock()
+        return [job for job in self._active if job.request_id is not None and job.next_poll <= now]
+
+    def idle_time(self) -> float:
+        """
+        Seconds until the next poll is due; 0 if there is work to do right away.
+        """
+        if not self._exhausted and len(self._active) < self.concurrency:
+            return 0.0
+        polls = [job.next_poll for job in self._active if job.request_id is not None]
+        return max(0.0, min(polls) - self._clock()) if polls else 0.0
+
+    def update(self, job: _StatsJob, response: dict[str, Any]) -> dict[str, Any] | None:
+        """
+        Records a stats_create (first call) or stats_get response for ``job``.
+
+        Returns:
+            dict[str, Any] | None: The finished job ({"job", "request_id", "result", "error"}) once it
+            has completed, failed or timed out; None while it is still pending.
+        """
+        now = self._clock()
+        if job.request_id is None:
+            job.request_id = response["request_id"]
+            job.deadline = now + self.timeout
+            job.delays = poll_intervals(self.initial_interval, maximum=self.max_interval)
+            job.next_poll = now + next(job.delays)
+            return None
+        state = job_state(response)
+        if state == COMPLETE:
+            return self._finish(job, response, None)
+        if state == FAILED:
+            return self._finish(job, response, StatsJobError(f"Stats request {job.request_id} failed: {response}"))
+        if now >= job.deadline:
+            return self._finish(job, response, TimeoutError(f"Stats request {job.request_id} was not ready after {self.timeout}s"))
+        job.next_poll = min(now + next(job.delays), job.deadline)
+        return None
+
+    def fail(self, job: _StatsJob, error: BaseException) -> dict[str, Any]:
+        """
+        Records an exception raised while submitting or polling ``job`` and finishes it.
+        """
+        return self._finish(job, None, error)
+
+    def _finish(self, job: _StatsJob, result: dict[str, Any] | None, error: BaseException | None) -> dict[str, Any]:
+        self._active.remove(job)
+        return {"job": job.params, "request_id": job.request_id, "result": result, "error": error}
+
+
+class CsvRowParser:
+    """
+    Incremental CSV parser fed one line at a time, so downloads can be parsed while they stream.
+
+    The first record is taken as the header; quoted fields spanning several lines are reassembled.
+    """
+
+    def __init__(self) -> None:
+        self.header: list[str] | None = None
+        self._pending = ""
+
+    def feed(self, line: str) -> list[dict[str, str]]:
+        """
+        Consumes one line (without its line terminator).
+
+        Returns:
+            list[dict[str, str]]: The rows completed by this line, usually zero or one.
+        """
+        self._pending = f"{self._pending}\n{line}" if self._pending else line
+        if self._pending.count('"') % 2:
+            return []
+        record = next(csv.reader([self._pending]))
+        self._pending = ""
+        if not record:
+            return []
+        if self.header is None:
+            self.header = record
+            return []
+        return [dict(zip(self.header, record))]
+
+
+_INTEGER = re.compile(r"-?(0|[1-9][0-9]*)")
+_DECIMAL = re.compile(r"-?[0-9]+\.[0-9]+")
+
+
+def infer_value(value: str) -> Any:
+    """
+    Converts a CSV cell to int or float when it is plainly numeric and empty cells to None.
+
+    Values such as phone numbers (``+14155550100``) or zero-padded ids (``0042``) stay strings.
+    """
+    if value == "":
+        return None
+    if _INTEGER.fullmatch(value):
+        return int(value)
+    if _DECIMAL.fullmatch(value):
+        return float(value)
+    return value
+
+
+def coerce_row(row: dict[str, str], types: Mapping[str, Callable[[str], Any]] | None = None, infer_types: bool = False) -> dict[str, Any]:
+    """
+    Applies per-column converters to a parsed row.
+
+    Args:
+        row (dict): Row as produced by CsvRowParser.
+        types (mapping): Column name -> converter; empty cells become None instead of being converted.
+        infer_types (boolean): Run infer_value on the columns not listed in types.
+    """
+    typed = {}
+    for column, value in row.items():
+        converter = types.get(column) if types else None
+        if converter is not None:
+            typed[column] = converter(value) if value != "" else None
+        elif infer_types:
+            typed[column] = infer_value(value)
+        else:
+            typed[column] = value
+    return typed
+
+
+def iter_csv_rows(lines: Iterable[str], types: Mapping[str, Callable[[str], Any]] | None = None, infer_types: bool = False) -> Iterator[dict[str, Any]]:
+    """
+    Parses an iterable of CSV lines into dicts keyed by the header row, one row in memory at a time.
+
+    Args:
+        lines (iterable): CSV lines without line terminators.
+        types (mapping): Optional column converters, see coerce_row.
+        infer_types (boolean): Convert plainly numeric cells of the remaining columns, see infer_value.
+    """
+    parser = CsvRowParser()
+    convert = types is not None or infer_types
+    for line in lines:
+        for row in parser.feed(line):
+            yield coerce_row(row, types, infer_types) if convert else row
+
+
+def spill_path(spill: str | Path | bool) -> Path:
+    """
+    Resolves the ``spill`` argument of the download helpers: True creates a temporary file.
+    """
+    if spill is True:
+        fd, name = tempfile.mkstemp(prefix="dialpad-stats-", suffix=".csv")
+        os.close(fd)
+        return Path(name)
+    return Path(spill)
+
+
+def iter_file_lines(path: str | Path) -> Iterator[str]:
+    """
+    Reads a spilled download back line by line, without line terminators.
+    """
+    with open(path, encoding="utf-8", newline="") as file:
+        for line in file:
+            yield line.rstrip("\r\n")
+
+
+def iter_column_batches(rows: Iterable[dict[str, Any]], batch_size: int = 10_000) -> Iterator[dict[str, list[Any]]]:
+    """
+    Groups rows into columnar batches (column name -> list of values) of at most ``batch_size`` rows.
+    """
+    columns: dict[str, list[Any]] = {}
+    count = 0
+    for row in rows:
+        for column, value in row.items():
+            columns.setdefault(column, [None] * count).append(value)
+        count += 1
+        for values in columns.values():
+            if len(values) < count:
+                values.append(None)
+        if count >= batch_size:
+            yield columns
+            columns = {}
+            count = 0
+    if count:
+        yield columns
+
+
+def iter_record_batches(batches: Iterable[dict[str, list[Any]]]) -> Iterator[Any]:
+    """
+    Converts columnar batches to ``pyarrow.RecordBatch`` objects.
+
+    Raises:
+        ImportError: If the optional pyarrow dependency is not installed.
+    """
+    from universal_mcp_dialpad.columnar import require_pyarrow
+
+    pa = require_pyarrow()
+    for batch in batches:
+        yield pa.RecordBatch.from_pydict(batch)
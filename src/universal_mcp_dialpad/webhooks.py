@@ -0,0 +1,357 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import inspect
+import json
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+ACCEPTED = 202
+BAD_REQUEST = 400
+UNAUTHORIZED = 401
+NOT_FOUND = 404
+UNAVAILABLE = 503
+
+Consumer = Callable[[list[dict[str, Any]]], Awaitable[Any] | Any]
+DeadLetter = Callable[[dict[str, Any], BaseException], Awaitable[Any] | Any]
+
+
+class WebhookAuthError(ValueError):
+    """
+    Raised when a webhook payload is not a valid JWT signed with the endpoint's secret.
+    """
+
+
+def require_starlette():
+    """
+    Imports starlette, which the HTTP receiver is served with; it is installed with the mcp
+    dependency of universal_mcp.
+
+    Raises:
+        ImportError: If starlette is missing.
+    """
+    try:
+        import starlette.applications
+        import starlette.responses
+        import starlette.routing
+    except ImportError as exc:
+        raise ImportError("The webhook receiver requires starlette: pip install starlette") from exc
+    return starlette
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def decode_jwt(token: str | bytes, secret: str, leeway: float = 60.0, now: Callable[[], float] = time.time) -> dict[str, Any]:
+    """
+    Verifies an HS256 JWT, the format Dialpad delivers events in when the webhook was created
+    with a ``secret`` (see webhooks_create), and returns its claims.
+
+    Raises:
+        WebhookAuthError: If the token is malformed, not HS256, wrongly signed or expired
+            (``exp`` older than ``leeway`` seconds).
+    """
+    if isinstance(token, bytes):
+        token = token.decode("ascii", errors="replace")
+    parts = token.strip().split(".")
+    if len(parts) != 3:
+        raise WebhookAuthError("Payload is not a JWT")
+    try:
+        header = json.loads(_b64decode(parts[0]))
+        signature = _b64decode(parts[2])
+    except (binascii.Error, ValueError) as exc:
+        raise WebhookAuthError("Malformed JWT") from exc
+    if not isinstance(header, dict) or header.get("alg") != "HS256":
+        raise WebhookAuthError("JWT is not signed with HS256")
+    expected = hmac.new(secret.encode(), f"{parts[0]}.{parts[1]}".encode("ascii"), hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise WebhookAuthError("Invalid JWT signature")
+    try:
+        claims = json.loads(_b64decode(parts[1]))
+    except (binascii.Error, ValueError) as exc:
+        raise WebhookAuthError("Malformed JWT claims") from exc
+    if not isinstance(claims, dict):
+        raise WebhookAuthError("JWT claims are not an object")
+    if isinstance(claims.get("exp"), (int, float)) and claims["exp"] + leeway < now():
+        raise WebhookAuthError("JWT has expired")
+    return claims
+
+
+def parse_event(body: bytes, secret: str | None = None) -> dict[str, Any]:
+    """
+    Decodes a webhook request body: a signed JWT when the endpoint has a secret, else plain JSON.
+
+    Raises:
+        WebhookAuthError: If a secret is set and the body is not correctly signed.
+        ValueError: If an unsigned body is not a JSON object.
+    """
+    if secret:
+        return decode_jwt(body, secret)
+    event = json.loads(body)
+    if not isinstance(event, dict):
+        raise ValueError("Webhook payload is not a JSON object")
+    return event
+
+
+class EventChannel:
+    """
+    Bounded queue of events for one webhook route and the task that hands them to its consumer.
+
+    Events are delivered in batches of up to ``batch_size``, or whatever arrived within ``max_wait``
+    seconds of the first one. A consumer may be a coroutine function or a plain callable, which runs
+    in a worker thread. A batch whose consumer raises is delivered again with capped exponential
+    backoff, up to ``max_attempts`` times; while a consumer is failing or slow the queue fills up
+    and the receiver refuses new events, which Dialpad then redelivers. A batch that still fails
+    is retried event by event, and each event the consumer keeps rejecting is dead-lettered:
+    passed to ``dead_letter(event, error)`` if given and kept in ``dead_letters`` (the most recent
+    ``dead_letter_limit``), so one bad event cannot block its route.
+    """
+
+    def __init__(
+        self,
+        consumer: Consumer,
+        maxsize: int = 10000,
+        batch_size: int = 100,
+        max_wait: float = 0.5,
+        secret: str | None = None,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        max_attempts: int = 5,
+        dead_letter: DeadLetter | None = None,
+        dead_letter_limit: int = 1000,
+    ) -> None:
+        self.consumer = consumer
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.secret = secret
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.dead_letter = dead_letter
+        self.dead_letters: deque[tuple[dict[str, Any], str]] = deque(maxlen=dead_letter_limit)
+        self.dead_lettered = 0
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize)
+        self.received = 0
+        self.delivered = 0
+        self.rejected = 0
+        self.invalid = 0
+        self.consumer_errors = 0
+        self.last_error: str | None = None
+        self.delivering = 0
+
+    def offer(self, event: dict[str, Any]) -> bool:
+        """
+        Queues an event without waiting. Returns False when the queue is full.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.received += 1
+        return True
+
+    async def next_batch(self) -> list[dict[str, Any]]:
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except TimeoutError:
+                break
+        return batch
+
+    @staticmethod
+    async def _call(function: Callable[..., Any], *args: Any) -> None:
+        if inspect.iscoroutinefunction(function):
+            await function(*args)
+        else:
+            result = await asyncio.to_thread(function, *args)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _attempt(self, batch: list[dict[str, Any]]) -> BaseException | None:
+        """
+        Hands a batch to the consumer up to ``max_attempts`` times; returns the last error if it never succeeded.
+        """
+        for attempt in range(max(1, self.max_attempts)):
+            if attempt:
+                await asyncio.sleep(min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+            try:
+                await self._call(self.consumer, batch)
+            except Exception as exc:
+                self.consumer_errors += 1
+                self.last_error = str(exc) or type(exc).__name__
+                error = exc
+            else:
+                self.delivered += len(batch)
+                return None
+        return error
+
+    async def deliver(self, batch: list[dict[str, Any]]) -> None:
+        error = await self._attempt(batch)
+        if error is None:
+            return
+        for event in batch:
+            if len(batch) > 1:
+                error = await self._attempt([event])
+            if error is not None:
+                await self._dead_letter(event, error)
+
+    async def _dead_letter(self, event: dict[str, Any], error: BaseException) -> None:
+        self.dead_lettered += 1
+        self.dead_letters.append((event, str(error) or type(error).__name__))
+        if self.dead_letter is not None:
+            try:
+                await self._call(self.dead_letter, event, error)
+            except Exception as exc:
+                self.last_error = str(exc) or type(exc).__name__
+
+    async def run(self) -> None:
+        while True:
+            batch = await self.next_batch()
+            self.delivering = len(batch)
+            try:
+                await self.deliver(batch)
+            finally:
+                self.delivering = 0
+                for _ in batch:
+                    self.queue.task_done()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "delivering": self.delivering,
+            "received": self.received,
+            "delivered": self.delivered,
+            "rejected": self.rejected,
+            "invalid": self.invalid,
+            "consumer_errors": self.consumer_errors,
+            "dead_lettered": self.dead_lettered,
+            "last_error": self.last_error,
+        }
+
+
+class WebhookReceiver:
+    """
+    Async receiver for Dialpad webhook events, served as a Starlette ASGI app.
+
+    Each route is a POST endpoint ``<path>/<name>`` with its own bounded queue and consumer; point a
+    webhook (webhooks_create with ``hook_url`` and ``secret``) at it and subscribe that webhook to
+    call, SMS, agent status, contact or change-log events::
+
+        receiver = WebhookReceiver(secret="s3cret")
+        receiver.route("calls", store_call_events, batch_size=500)
+        app = receiver.asgi_app()  # e.g. uvicorn.run(app)
+
+    Accepted events are acknowledged with 202 before the consumer sees them. When a route's queue
+    is full the receiver answers 503 with Retry-After instead of buffering without bound, and
+    Dialpad retries the delivery later. Unsigned or wrongly signed payloads get 401 when a secret is
+    configured.
+    """
+
+    def __init__(self, secret: str | None = None, path: str = "/webhooks", retry_after: int = 1) -> None:
+        self.secret = secret
+        self.path = path.rstrip("/")
+        self.retry_after = retry_after
+        self.channels: dict[str, EventChannel] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._closing = False
+
+    def route(self, name: str, consumer: Consumer, secret: str | None = None, **options: Any) -> EventChannel:
+        """
+        Registers a consumer for the events posted to ``<path>/<name>``. ``secret`` overrides the
+        receiver's secret for this route; other options are passed to EventChannel. Routes must
+        be registered before the receiver is started.
+        """
+        if self._tasks:
+            raise RuntimeError("Webhook routes must be registered before the receiver is started")
+        if name in self.channels:
+            raise ValueError(f"Webhook route {name!r} is already registered")
+        channel = EventChannel(consumer, secret=secret, **options)
+        self.channels[name] = channel
+        return channel
+
+    def accept(self, name: str, body: bytes) -> tuple[int, dict[str, Any]]:
+        """
+        Verifies and queues one webhook delivery.
+
+        Returns:
+            tuple[int, dict[str, Any]]: The HTTP status to answer with and a JSON body.
+        """
+        channel = self.channels.get(name)
+        if channel is None:
+            return NOT_FOUND, {"error": f"Unknown webhook route {name!r}"}
+        try:
+            event = parse_event(body, channel.secret or self.secret)
+        except WebhookAuthError as exc:
+            channel.invalid += 1
+            return UNAUTHORIZED, {"error": str(exc)}
+        except ValueError as exc:
+            channel.invalid += 1
+            return BAD_REQUEST, {"error": str(exc)}
+        if self._closing or not channel.offer(event):
+            return UNAVAILABLE, {"error": "Receiver is busy, retry later"}
+        return ACCEPTED, {"status": "accepted"}
+
+    async def start(self) -> None:
+        self._closing = False
+        self._tasks = [asyncio.create_task(channel.run(), name=f"dialpad-webhook-{name}") for name, channel in self.channels.items()]
+
+    async def stop(self, timeout: float = 30.0) -> int:
+        """
+        Stops accepting events and waits up to ``timeout`` seconds for the queued ones to be delivered.
+
+        Returns:
+            int: The number of events left undelivered.
+        """
+        self._closing = True
+        try:
+            await asyncio.wait_for(asyncio.gather(*(channel.queue.join() for channel in self.channels.values())), timeout)
+        except TimeoutError:
+            pass
+        undelivered = sum(channel.queue.qsize() + channel.delivering for channel in self.channels.values())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        return undelivered
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {name: channel.stats() for name, channel in self.channels.items()}
+
+    def asgi_app(self):
+        """
+        Builds the Starlette app serving the routes, with the consumers running for its lifespan.
+        Statistics (see stats) are not exposed over HTTP, since they include consumer error text.
+        """
+        starlette = require_starlette()
+        JSONResponse = starlette.responses.JSONResponse
+        Route = starlette.routing.Route
+
+        async def receive(request):
+            status, body = self.accept(request.path_params["name"], await request.body())
+            headers = {"Retry-After": str(self.retry_after)} if status == UNAVAILABLE else None
+            return JSONResponse(body, status_code=status, headers=headers)
+
+        @asynccontextmanager
+        async def lifespan(app):
+            await self.start()
+            try:
+                yield
+            finally:
+                await self.stop()
+
+        return starlette.applications.Starlette(routes=[Route(f"{self.path}/{{name}}", receive, methods=["POST"])], lifespan=lifespan)
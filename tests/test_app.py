@@ -1,11 +1,21 @@
+import asyncio
+import inspect
+import threading
 from unittest.mock import MagicMock
 
 import pytest
-from universal_mcp.utils.testing import (
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("universal_mcp")
+
+from universal_mcp.utils.testing import (  # noqa: E402
     check_application_instance,
 )
 
-from universal_mcp_dialpad.app import DialpadApp
+from universal_mcp_dialpad.app import CachedResponse, DialpadApp  # noqa: E402
+from universal_mcp_dialpad.async_app import GENERATED_ENDPOINTS, AsyncDialpadApp  # noqa: E402
+from universal_mcp_dialpad.breaker import HALF_OPEN, CircuitBreaker  # noqa: E402
+from universal_mcp_dialpad.mirror import KINDS  # noqa: E402
 
 @pytest.fixture
 def app_instance():
@@ -15,3 +25,162 @@ def app_instance():
 
 def test_application(app_instance):
     check_application_instance(app_instance, app_name="dialpad")
+
+@pytest.fixture
+def async_app_instance():
+    mock_integration = MagicMock()
+    mock_integration.get_credentials.return_value = {"access_token": "dummy_access_token"}
+    return AsyncDialpadApp(integration=mock_integration)
+
+def test_async_application(async_app_instance):
+    check_application_instance(async_app_instance, app_name="dialpad")
+
+def test_async_tools_are_coroutines(async_app_instance):
+    for tool in async_app_instance.list_tools():
+        assert inspect.iscoroutinefunction(tool), tool.__name__
+        # Anything not derived from a generated endpoint needs its own coroutine version.
+        assert tool.__name__ in GENERATED_ENDPOINTS or tool.__name__ in vars(AsyncDialpadApp), tool.__name__
+
+def test_every_generated_async_endpoint_sends_its_sync_request(app_instance, async_app_instance):
+    sent = []
+
+    def handler(request):
+        sent.append((request.method, str(request.url), request.content))
+        return httpx.Response(200, json={"ok": True})
+
+    async def handle(request):
+        return handler(request)
+
+    app_instance._client = httpx.Client(transport=httpx.MockTransport(handler))
+    async_app_instance._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+    for name in GENERATED_ENDPOINTS:
+        parameters = inspect.signature(getattr(DialpadApp, name)).parameters.values()
+        args = ["1" for parameter in parameters if parameter.name != "self" and parameter.default is inspect.Parameter.empty]
+        assert getattr(app_instance, name)(*args) == asyncio.run(getattr(async_app_instance, name)(*args)) == {"ok": True}, name
+        assert sent[-2] == sent[-1], name
+    assert len(sent) == 2 * len(GENERATED_ENDPOINTS)
+
+def test_cancelled_probe_releases_the_circuit(async_app_instance):
+    async_app_instance.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    url = "https://dialpad.com/api/v2/api/v2/users/1"
+    async_app_instance.circuit_breaker.record_failure(async_app_instance.circuit_breaker.before_request(url))
+
+    async def stalled_throttle(method, url):
+        await asyncio.sleep(3600)
+
+    async_app_instance._throttle = stalled_throttle
+
+    async def scenario():
+        probe = asyncio.create_task(async_app_instance._send("GET", url))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(scenario())
+    assert async_app_instance.circuit_breaker.state(url) == HALF_OPEN
+    async_app_instance.circuit_breaker.before_request(url)
+
+def test_cached_responses_decode_json_once():
+    response = CachedResponse.from_response(httpx.Response(200, json={"id": 1}, request=httpx.Request("GET", "https://dialpad.com/api/v2/users/1")))
+    assert response.json() == {"id": 1}
+    assert response.json() is response.json()
+
+def test_directory_tools_answer_from_the_mirror(app_instance):
+    listings = {
+        "iter_offices_list": [{"id": 1, "name": "HQ"}],
+        "iter_users_list": [{"id": 10, "office_id": 1, "phone_numbers": ["+14155550111"]}],
+    }
+    release = threading.Event()
+
+    def listing(items):
+        release.wait(5)
+        return iter(items)
+
+    for method, _, _ in KINDS.values():
+        setattr(app_instance, method, lambda prefetch=0, items=listings.get(method, []): listing(items))
+    assert app_instance.directory_owner_of_number("(415) 555-0111") == {"kind": None, "id": None, "entity": None, "stale": True}
+    release.set()
+    app_instance.directory._refresh_thread.join(5)
+    assert app_instance.directory_owner_of_number("(415) 555-0111")["id"] == "10"
+    assert app_instance.directory_office_of_user(10) == {"office": {"id": 1, "name": "HQ"}, "stale": False}
+    assert app_instance.ingest_change_log_events([{"item_type": "user", "change_type": "deleted", "item_id": 10}]) == 1
+    assert app_instance.directory_office_of_user(10)["office"] is None
+
+def test_stale_phone_index_is_refreshed_in_the_background(app_instance):
+    builds = []
+    release = threading.Event()
+
+    def refresh_phone_index():
+        builds.append(len(builds))
+        if len(builds) > 1:
+            release.wait(5)
+        return app_instance.phone_index.build([{"number": "+14155550111", "target_type": "user", "target_id": len(builds)}])
+
+    app_instance.refresh_phone_index = refresh_phone_index
+    assert app_instance.lookup_number("+14155550111")["target_id"] == 1
+    assert app_instance.lookup_number("+14155550111", max_age=-1)["target_id"] == 1
+    assert app_instance.lookup_number("+14155550111", max_age=-1)["target_id"] == 1
+    release.set()
+    app_instance._phone_index_refresh.join(5)
+    assert builds == [0, 1]
+    assert app_instance.lookup_number("+14155550111")["target_id"] == 2
+
+def test_async_endpoints_send_the_requests_the_sync_ones_build(app_instance, async_app_instance):
+    sent = []
+
+    def request(method, url, params=None, data=None):
+        sent.append((method, url, params, data))
+        return httpx.Response(200, json={"ok": True}, request=httpx.Request(method, url))
+
+    async def arequest(method, url, params=None, data=None):
+        return request(method, url, params, data)
+
+    app_instance._request = request
+    async_app_instance._request = arequest
+    calls = [("users_get", (7,), {}), ("users_update", (7,), {"first_name": "Ada"}), ("blockednumbers_remove", (), {"numbers": ["+14155550100"]})]
+    for name, args, kwargs in calls:
+        assert getattr(app_instance, name)(*args, **kwargs) == asyncio.run(getattr(async_app_instance, name)(*args, **kwargs)) == {"ok": True}
+    assert sent[0::2] == sent[1::2]
+    assert async_app_instance.users_get.__doc__ == app_instance.users_get.__doc__
+    with pytest.raises(ValueError):
+        asyncio.run(async_app_instance.users_get(None))
+
+def test_update_operators_retries_only_within_its_deadline(app_instance):
+    requests = []
+    release = threading.Event()
+
+    def handler(request):
+        requests.append(request.url.path)
+        if request.url.path.endswith("/skill"):
+            release.wait(5)
+        return httpx.Response(503, json={})
+
+    app_instance._client = httpx.Client(transport=httpx.MockTransport(handler))
+    updates = [{"user_id": 1, "on_duty": True}, {"user_id": 2, "call_center_id": 3, "skill_level": 50}]
+    report = app_instance.update_operators(updates, deadline=0.2, max_attempts=1)
+    release.set()
+    assert report["failed"] == 1 and report["in_flight"] == 1 and report["timed_out"] == 0
+    assert report["operators"][1]["skill_level"]["status"] == "in_flight"
+    assert sum("dutystatus" in path for path in requests) == 1
+
+def test_send_sms_bulk_reports_unreadable_recipients_as_invalid(app_instance):
+    sent = []
+
+    def handler(request):
+        sent.append(request.content)
+        return httpx.Response(200, json={"id": 1})
+
+    app_instance._client = httpx.Client(transport=httpx.MockTransport(handler))
+    app_instance.sms_opt_outs.build([{"recipient": "tel:+14155550199", "opt_out_state": "opted_out", "date": "1"}])
+    report = app_instance.send_sms_bulk([("+1 415 555 0199 x12", "hi"), ("ask reception", "hi"), ("+14155550100", "hi")], from_number="+14155550111")
+    assert (report["sent"], report["opted_out"], report["invalid"], report["failed"]) == (1, 1, 1, 0)
+    assert [result["status"] for result in report["results"][:2]] == ["opted_out", "invalid"]
+    assert len(sent) == 1
+
+def test_rate_limit_key_follows_the_current_credential(app_instance):
+    key = app_instance._rate_limit_key()
+    assert app_instance._rate_limit_key() == key
+    app_instance.integration.get_credentials.return_value = {"access_token": "rotated_access_token"}
+    assert app_instance._rate_limit_key() != key
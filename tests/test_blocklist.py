@@ -0,0 +1,21 @@
+from universal_mcp_dialpad.blocklist import ADD, REMOVE, chunk_idempotency_key, chunks, diff_numbers
+
+def test_diff_numbers_compares_e164_forms():
+    to_add, to_remove, unchanged, invalid = diff_numbers(
+        ["+14155550100", "+14155550101"],
+        ["(415) 555-0100", "415-555-0102", "+14155550102", "call me"],
+    )
+    assert to_add == ["+14155550102"]
+    assert to_remove == ["+14155550101"]
+    assert unchanged == 1
+    assert invalid == ["call me"]
+
+def test_diff_numbers_keeps_numbers_the_offline_rules_are_unsure_about():
+    to_add, to_remove, unchanged, invalid = diff_numbers(["+44 20 7946 09581", "ext. 12"], ["+442079460958 1"])
+    assert (to_add, to_remove, unchanged, invalid) == ([], [], 1, [])
+
+def test_chunks_and_keys():
+    assert list(chunks(["a", "b", "c"], 2)) == [["a", "b"], ["c"]]
+    assert list(chunks([], 2)) == []
+    assert chunk_idempotency_key(ADD, ["a", "b"]) == chunk_idempotency_key(ADD, ["a", "b"])
+    assert chunk_idempotency_key(ADD, ["a"]) != chunk_idempotency_key(REMOVE, ["a"])
@@ -0,0 +1,76 @@
+import pytest
+
+from universal_mcp_dialpad.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+STATS = "https://dialpad.com/api/v2/api/v2/stats/123"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def trip(breaker, times):
+    for _ in range(times):
+        breaker.record_failure(breaker.before_request(STATS))
+
+def test_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+    trip(breaker, 3)
+    assert breaker.state(STATS) == OPEN
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_request("https://dialpad.com/api/v2/api/v2/stats/456")
+    assert excinfo.value.endpoint == "/stats/{id}"
+
+def test_other_endpoints_are_unaffected():
+    breaker = CircuitBreaker(failure_threshold=1, clock=FakeClock())
+    trip(breaker, 1)
+    assert breaker.before_request("https://dialpad.com/api/v2/api/v2/users/1") == "/users/{id}"
+
+def test_half_open_probe_closes_or_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    trip(breaker, 1)
+    clock.now = 10
+    key = breaker.before_request(STATS)
+    assert breaker.state(STATS) == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(STATS)
+    breaker.record_failure(key)
+    assert breaker.state(STATS) == OPEN
+    clock.now = 20
+    breaker.record_success(breaker.before_request(STATS))
+    assert breaker.state(STATS) == CLOSED
+    assert breaker.stats() == {}
+
+def test_success_resets_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+    trip(breaker, 1)
+    breaker.record_success(breaker.before_request(STATS))
+    trip(breaker, 1)
+    assert breaker.state(STATS) == CLOSED
+
+def test_released_probe_frees_the_slot():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    trip(breaker, 1)
+    clock.now = 10
+    breaker.release(breaker.before_request(STATS))
+    assert breaker.state(STATS) == HALF_OPEN
+    breaker.record_success(breaker.before_request(STATS))
+    assert breaker.state(STATS) == CLOSED
+
+def test_lost_probe_is_reclaimed_after_reset_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    trip(breaker, 1)
+    clock.now = 10
+    breaker.before_request(STATS)
+    clock.now = 15
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_request(STATS)
+    assert excinfo.value.retry_in == 5
+    clock.now = 20
+    breaker.record_success(breaker.before_request(STATS))
+    assert breaker.state(STATS) == CLOSED
@@ -0,0 +1,90 @@
+from universal_mcp_dialpad.cache import ResponseCache
+
+BASE = "https://dialpad.com/api/v2/api/v2"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_hit_after_set_with_normalised_params():
+    cache = ResponseCache()
+    cache.set(f"{BASE}/offices", {"cursor": None, "active_only": True}, "page")
+    assert cache.get(f"{BASE}/offices", {"active_only": True}) == "page"
+    assert cache.stats()["hits"] == 1
+
+def test_uncacheable_endpoints_are_ignored():
+    cache = ResponseCache()
+    cache.set(f"{BASE}/callcenters/1/status", {}, "live")
+    assert cache.get(f"{BASE}/callcenters/1/status") is None
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["misses"] == 0
+
+def test_entries_expire_per_endpoint_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(ttls={"/users/{id}": 10, "/company": 100}, clock=clock)
+    cache.set(f"{BASE}/users/1", None, "user")
+    cache.set(f"{BASE}/company", None, "company")
+    clock.now = 11
+    assert cache.get(f"{BASE}/users/1") is None
+    assert cache.get(f"{BASE}/company") == "company"
+    assert cache.stats()["misses"] == 1
+
+def test_lru_eviction():
+    cache = ResponseCache(maxsize=2)
+    cache.set(f"{BASE}/users/1", None, 1)
+    cache.set(f"{BASE}/users/2", None, 2)
+    cache.get(f"{BASE}/users/1")
+    cache.set(f"{BASE}/users/3", None, 3)
+    assert cache.get(f"{BASE}/users/2") is None
+    assert cache.get(f"{BASE}/users/1") == 1
+    assert cache.stats()["evictions"] == 1
+
+def test_entity_update_invalidates_entity_and_list_pages():
+    cache = ResponseCache(ttls={"/offices": 60, "/offices/{id}": 60, "/offices/{office_id}/plan": 60})
+    cache.set(f"{BASE}/offices", {"cursor": "a"}, "page")
+    cache.set(f"{BASE}/offices/1", None, "office 1")
+    cache.set(f"{BASE}/offices/1/plan", None, "plan 1")
+    cache.set(f"{BASE}/offices/2", None, "office 2")
+    assert cache.invalidate_url(f"{BASE}/offices/1") == 3
+    assert cache.get(f"{BASE}/offices/2") == "office 2"
+
+def test_create_only_invalidates_list_pages():
+    cache = ResponseCache(ttls={"/offices": 60, "/offices/{id}": 60})
+    cache.set(f"{BASE}/offices", None, "page")
+    cache.set(f"{BASE}/offices/1", None, "office 1")
+    assert cache.invalidate_url(f"{BASE}/offices") == 1
+    assert cache.get(f"{BASE}/offices/1") == "office 1"
+
+def test_number_assignment_invalidates_dependent_resources():
+    cache = ResponseCache()
+    cache.set(f"{BASE}/numbers/+15551230000", None, "number")
+    cache.set(f"{BASE}/users/7", None, "user")
+    cache.invalidate_url(f"{BASE}/users/7/assign_number")
+    assert cache.get(f"{BASE}/users/7") is None
+    assert cache.get(f"{BASE}/numbers/+15551230000") is None
+    assert cache.stats()["invalidations"] == 2
+
+def test_stale_entry_with_validators_is_revalidated():
+    clock = FakeClock()
+    cache = ResponseCache(ttls={"/users/{id}": 10}, clock=clock)
+    cache.set(f"{BASE}/users/1", None, "user", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    clock.now = 11
+    assert cache.get(f"{BASE}/users/1") is None
+    assert cache.conditional_headers(f"{BASE}/users/1") == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert cache.revalidate(f"{BASE}/users/1") == "user"
+    assert cache.get(f"{BASE}/users/1") == "user"
+    assert cache.stats()["revalidations"] == 1
+
+def test_revalidate_only_endpoints_need_validators():
+    cache = ResponseCache()
+    cache.set(f"{BASE}/contacts", {"cursor": "a"}, "page")
+    assert cache.stats()["size"] == 0
+    cache.set(f"{BASE}/contacts", {"cursor": "a"}, "page", etag='"p1"')
+    assert cache.get(f"{BASE}/contacts", {"cursor": "a"}) is None
+    assert cache.conditional_headers(f"{BASE}/contacts", {"cursor": "a"}) == {"If-None-Match": '"p1"'}
@@ -0,0 +1,44 @@
+import pytest
+
+from universal_mcp_dialpad.columnar import CALL_COLUMNS, ColumnarWriter, call_schema, flatten_call, iter_call_batches
+
+CALL = {
+    "call_id": "101",
+    "date_started": "1700000000000",
+    "duration": 1234.5,
+    "direction": "inbound",
+    "target": {"id": 7, "type": "user", "name": "Ann"},
+    "contact": {"id": "c-1", "type": "local"},
+    "labels": ["sales"],
+}
+
+def test_flatten_call_uses_fixed_layout():
+    row = flatten_call(CALL)
+    assert list(row) == [name for name, _ in CALL_COLUMNS]
+    assert row["call_id"] == 101
+    assert row["date_started"] == 1700000000000
+    assert row["target_type"] == "user"
+    assert row["contact_id"] == "c-1"
+    assert row["date_ended"] is None
+    assert row["labels"] == ["sales"]
+
+def test_call_batches():
+    batches = list(iter_call_batches([CALL] * 3, batch_size=2))
+    assert [len(batch["call_id"]) for batch in batches] == [2, 1]
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_writer_round_trip(tmp_path, format):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / f"calls.{format}"
+    with ColumnarWriter(path, schema=call_schema(), format=format) as writer:
+        for batch in iter_call_batches([CALL] * 3, batch_size=2):
+            writer.write(batch)
+    assert writer.rows == 3
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+    else:
+        table = pa.ipc.open_file(path).read_all()
+    assert table.schema == call_schema()
+    assert table.column("call_id").to_pylist() == [101, 101, 101]
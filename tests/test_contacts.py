@@ -0,0 +1,56 @@
+from universal_mcp_dialpad.contacts import (
+    CREATE,
+    UNCHANGED,
+    UPDATE,
+    UPSERT_UID,
+    ContactSnapshot,
+    contact_changes,
+    dedupe_contacts,
+    normalize_contact,
+    read_contacts,
+)
+
+def test_read_contacts_from_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "contacts.csv"
+    csv_path.write_text("first_name,last_name,phones,emails\nAda,Lovelace,(415) 555-0100;+14155550111,ada@example.com\n")
+    assert list(read_contacts(csv_path)) == [{"first_name": "Ada", "last_name": "Lovelace", "phones": ["(415) 555-0100", "+14155550111"], "emails": ["ada@example.com"]}]
+    jsonl_path = tmp_path / "contacts.jsonl"
+    jsonl_path.write_text('{"uid": "crm-1", "first_name": "Ada"}\n\n{"uid": "crm-2"}\n')
+    assert [record["uid"] for record in read_contacts(jsonl_path)] == ["crm-1", "crm-2"]
+
+def test_normalize_contact():
+    contact = normalize_contact({"first_name": " Ada ", "phones": ["415-555-0100", "+14155550100", "ext 12"], "emails": "ADA@example.com;ada@example.com", "last_name": ""})
+    assert contact == {"first_name": "Ada", "phones": ["+14155550100", "ext 12"], "emails": ["ada@example.com"]}
+
+def test_dedupe_merges_by_phone_email_and_uid():
+    contacts = dedupe_contacts([
+        {"first_name": "Ada", "phones": ["4155550100"]},
+        {"first_name": "Ada L", "phones": ["+14155550100"], "emails": ["ada@example.com"]},
+        {"emails": ["ADA@example.com"], "job_title": "Engineer"},
+        {"uid": "crm-1", "phones": ["+14155550199"]},
+        {"uid": "crm-2", "phones": ["+14155550199"]},
+        {"uid": "crm-1", "first_name": "Grace"},
+    ])
+    assert len(contacts) == 3
+    assert contacts[0] == {"first_name": "Ada L", "job_title": "Engineer", "phones": ["+14155550100"], "emails": ["ada@example.com"]}
+    assert contacts[1] == {"uid": "crm-1", "first_name": "Grace", "phones": ["+14155550199"]}
+    assert contacts[2]["uid"] == "crm-2"
+
+def test_contact_changes_ignores_formatting():
+    existing = {"id": "c1", "first_name": "Ada", "phones": ["+14155550100"], "emails": ["ada@example.com"]}
+    assert contact_changes(normalize_contact({"first_name": "Ada", "phones": ["(415) 555-0100"]}), existing) == {}
+    assert contact_changes(normalize_contact({"first_name": "Ada", "job_title": "CTO"}), existing) == {"job_title": "CTO"}
+
+def test_snapshot_plans_minimal_writes():
+    snapshot = ContactSnapshot()
+    snapshot.build([
+        {"id": "c1", "first_name": "Ada", "phones": ["+14155550100"]},
+        {"id": "c2", "uid": "crm-2", "first_name": "Grace"},
+    ])
+    assert snapshot.plan(normalize_contact({"first_name": "Ada", "phones": ["4155550100"]})) == (UNCHANGED, {})
+    assert snapshot.plan(normalize_contact({"first_name": "Ada", "last_name": "L", "phones": ["4155550100"]})) == (UPDATE, {"id": "c1", "last_name": "L"})
+    assert snapshot.plan(normalize_contact({"uid": "crm-2", "first_name": "Grace"})) == (UNCHANGED, {})
+    assert snapshot.plan(normalize_contact({"uid": "crm-2", "first_name": "Grace H"})) == (UPSERT_UID, {"uid": "crm-2", "first_name": "Grace H"})
+    assert snapshot.plan(normalize_contact({"first_name": "New", "owner_id": 7})) == (CREATE, {"owner_id": "7", "first_name": "New"})
+    snapshot.record({"id": "c3", "first_name": "New", "emails": ["new@example.com"]})
+    assert snapshot.plan(normalize_contact({"first_name": "New", "emails": ["new@example.com"]})) == (UNCHANGED, {})
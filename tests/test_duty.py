@@ -0,0 +1,71 @@
+import pytest
+
+from universal_mcp_dialpad.duty import DUTY_STATUS, SKILL_LEVEL, OperatorUpdateRun, is_retryable, operator_calls
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type("Response", (), {"status_code": status_code})()
+
+def test_operator_calls():
+    calls = operator_calls({"user_id": 5, "on_duty": False, "call_center_id": 7, "skill_level": 80})
+    assert calls[DUTY_STATUS] == ("callcenters_operators_dutystatus", {"id": 5, "on_duty": False, "duty_status_reason": None})
+    assert calls[SKILL_LEVEL] == ("callcenters_operators_skilllevel", {"call_center_id": 7, "user_id": 5, "skill_level": 80})
+    with pytest.raises(ValueError):
+        operator_calls({"user_id": 5, "skill_level": 80})
+    with pytest.raises(ValueError):
+        operator_calls({"user_id": 5})
+
+def test_is_retryable():
+    assert is_retryable(ConnectionError())
+    assert is_retryable(StatusError(429)) and is_retryable(StatusError(500))
+    assert not is_retryable(StatusError(404))
+
+def test_run_retries_transient_failures_with_backoff():
+    clock = FakeClock()
+    run = OperatorUpdateRun([{"user_id": 1, "on_duty": True}, {"user_id": 2, "on_duty": True}], deadline=10, backoff=1.0, clock=clock)
+    first = run.ready()
+    assert [index for index, *_ in first] == [0, 1]
+    run.complete(0, DUTY_STATUS)
+    run.fail(1, DUTY_STATUS, StatusError(503))
+    assert run.ready() == [] and run.wait_time() == 1.0
+    clock.now = 1.0
+    assert [index for index, *_ in run.ready()] == [1]
+    run.complete(1, DUTY_STATUS)
+    assert run.done
+    report = run.report()
+    assert (report["succeeded"], report["failed"], report["timed_out"]) == (2, 0, 0)
+    assert report["operators"][1][DUTY_STATUS] == {"status": "succeeded", "attempts": 2, "error": None}
+
+def test_run_gives_up_on_permanent_errors_and_deadline():
+    clock = FakeClock()
+    run = OperatorUpdateRun([{"user_id": 1, "on_duty": True}, {"user_id": 2, "call_center_id": 7, "skill_level": 50}], deadline=2, backoff=1.0, clock=clock)
+    run.ready()
+    run.fail(0, DUTY_STATUS, StatusError(400))
+    clock.now = 1.5
+    run.fail(1, SKILL_LEVEL, ConnectionError("reset"))
+    assert run.done
+    clock.now = 0.0
+    report = run.report()
+    assert report["failed"] == 2
+    assert report["operators"][1][SKILL_LEVEL]["error"] == "reset"
+
+def test_unfinished_calls_time_out():
+    clock = FakeClock()
+    run = OperatorUpdateRun([{"user_id": 1, "on_duty": True}], deadline=5, clock=clock)
+    run.ready()
+    clock.now = 5.0
+    assert run.expired and not run.done
+    report = run.report()
+    assert report["in_flight"] == 1 and report["timed_out"] == 0
+    assert report["operators"][0][DUTY_STATUS]["status"] == "in_flight"
+    run.withdraw(0, DUTY_STATUS)
+    report = run.report()
+    assert report["timed_out"] == 1 and report["operators"][0][DUTY_STATUS]["attempts"] == 0
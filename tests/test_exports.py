@@ -0,0 +1,21 @@
+import pytest
+
+from universal_mcp_dialpad.exports import BoundaryDeduper, split_window
+
+def test_split_window_covers_range_with_overlapping_boundaries():
+    assert split_window(0, 100, 4) == [(0, 26), (24, 51), (49, 76), (74, 100)]
+
+def test_split_window_single_shard_and_caps_tiny_ranges():
+    assert split_window(10, 20, 1) == [(10, 20)]
+    assert len(split_window(0, 3, 10)) == 3
+
+def test_split_window_rejects_empty_range():
+    with pytest.raises(ValueError):
+        split_window(5, 5, 2)
+
+def test_deduper_only_tracks_boundary_calls():
+    dedupe = BoundaryDeduper(split_window(0, 100, 2))
+    first = [{"call_id": 1, "date_started": "10"}, {"call_id": 2, "date_started": "50"}]
+    second = [{"call_id": 2, "date_started": "50"}, {"call_id": 3, "date_started": "70"}, {"call_id": 4}]
+    assert [call["call_id"] for call in first + second if dedupe(call)] == [1, 2, 3, 4]
+    assert dedupe.seen == {2, 4}
@@ -0,0 +1,231 @@
+import asyncio
+import threading
+
+import pytest
+
+from universal_mcp_dialpad.mirror import KINDS, DirectoryMirror
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeApp:
+    def __init__(self):
+        self.data = {
+            "offices": [{"id": 1, "name": "HQ", "phone_numbers": ["+14155550100"]}],
+            "departments": [{"id": 2, "office_id": 1, "name": "Support"}],
+            "callcenters": [],
+            "users": [{"id": 10, "office_id": 1, "phone_numbers": ["+14155550111"]}],
+            "numbers": [{"number": "+14155550111", "target_id": 10, "target_type": "user", "office_id": 1}],
+            "contacts": [{"id": "c1", "phones": ["+14155550199"]}],
+        }
+        self.fetched = []
+        for kind, (method, _, _) in KINDS.items():
+            setattr(self, method, self._lister(kind))
+
+    def _lister(self, kind):
+        def iterate(prefetch=0):
+            return iter(list(self.data[kind]))
+        return iterate
+
+    def webhook_change_log_event_subscription_create(self, enabled=None, endpoint_id=None):
+        return {"enabled": enabled, "endpoint_id": endpoint_id}
+
+    def users_get(self, id):
+        self.fetched.append(id)
+        return {"id": int(id), "office_id": 1, "phone_numbers": []}
+
+class FakeAsyncApp(FakeApp):
+    def _lister(self, kind):
+        async def iterate(prefetch=0):
+            for item in list(self.data[kind]):
+                yield item
+        return iterate
+
+    async def webhook_change_log_event_subscription_create(self, enabled=None, endpoint_id=None):
+        return {"enabled": enabled, "endpoint_id": endpoint_id}
+
+def test_full_sync_answers_lookups_locally():
+    mirror = DirectoryMirror(FakeApp())
+    counts = mirror.full_sync()
+    assert counts["users"] == 1 and counts["callcenters"] == 0
+    owner = mirror.owner_of_number("+14155550111")
+    assert owner["kind"] == "users" and owner["entity"]["id"] == 10
+    assert mirror.owner_of_number("+14155550100")["kind"] == "offices"
+    assert mirror.owner_of_number("+14155550199")["id"] == "c1"
+    assert mirror.owner_of_number("+10000000000") is None
+    assert mirror.office_of_user(10)["name"] == "HQ"
+    assert [item["id"] for item in mirror.all("departments", office_id=1)] == [2]
+
+def test_full_sync_removes_vanished_entities():
+    app = FakeApp()
+    mirror = DirectoryMirror(app)
+    mirror.full_sync()
+    app.data["contacts"] = []
+    mirror.full_sync(["contacts"])
+    assert mirror.get("contacts", "c1") is None
+    assert mirror.owner_of_number("+14155550199") is None
+
+def test_change_log_events_update_and_delete():
+    app = FakeApp()
+    mirror = DirectoryMirror(app)
+    mirror.full_sync()
+    assert mirror.apply_change_log_event({"item_type": "user", "change_type": "updated", "item": {"id": 10, "office_id": 3}})
+    assert mirror.get("users", 10)["office_id"] == 3
+    assert mirror.apply_change_log_event({"item_type": "user", "change_type": "created", "item_id": 11})
+    assert app.fetched == ["11"] and mirror.get("users", 11) is not None
+    assert mirror.apply_change_log_event({"item_type": "contact", "change_type": "deleted", "item_id": "c1"})
+    assert mirror.get("contacts", "c1") is None
+    assert not mirror.apply_change_log_event({"item_type": "channel", "item_id": 5})
+
+def test_refresh_reconciles_only_stale_kinds():
+    clock = FakeClock()
+    mirror = DirectoryMirror(FakeApp(), clock=clock)
+    assert set(mirror.refresh(max_age=60)) == {"offices", "departments", "callcenters", "users", "numbers", "contacts"}
+    clock.now = 30
+    assert mirror.refresh(max_age=60) == {}
+    clock.now = 61
+    assert mirror.refresh(max_age=60)["users"] == 1
+
+def test_mirror_persists_to_file(tmp_path):
+    path = tmp_path / "directory.db"
+    mirror = DirectoryMirror(FakeApp(), path)
+    mirror.full_sync()
+    mirror.close()
+    assert DirectoryMirror(None, path).office_of_user(10)["id"] == 1
+
+def test_async_full_sync():
+    mirror = DirectoryMirror(FakeAsyncApp())
+    counts = asyncio.run(mirror.afull_sync())
+    assert counts["numbers"] == 1
+    assert mirror.owner_of_number("+14155550111")["id"] == "10"
+
+def test_numbers_are_keyed_like_phone_index():
+    app = FakeApp()
+    app.data["users"][0]["phone_numbers"] = ["+1 (415) 555-0111"]
+    mirror = DirectoryMirror(app)
+    mirror.full_sync()
+    assert mirror.owner_of_number("(415) 555-0111")["id"] == "10"
+    assert mirror.owner_of_number("415.555.0199")["id"] == "c1"
+    assert mirror.get("numbers", "4155550111")["target_id"] == 10
+    assert mirror.owner_of_number("not a number") is None
+
+def test_events_during_a_reconcile_survive_it():
+    app = FakeApp()
+    mirror = DirectoryMirror(app)
+    mirror.full_sync()
+
+    def listing(prefetch=0):
+        yield {"id": 10, "office_id": 1}
+        mirror.apply_change_log_event({"item_type": "user", "change_type": "created", "item": {"id": 12, "office_id": 1}})
+        yield {"id": 13, "office_id": 1}
+
+    app.iter_users_list = listing
+    assert mirror.full_sync(["users"]) == {"users": 2}
+    assert {user["id"] for user in mirror.all("users")} == {10, 12, 13}
+
+def test_failed_reconcile_deletes_nothing():
+    app = FakeApp()
+    mirror = DirectoryMirror(app)
+    mirror.full_sync()
+
+    def listing(prefetch=0):
+        yield {"id": 14, "office_id": 1}
+        raise ConnectionError("page 2")
+
+    app.iter_users_list = listing
+    try:
+        mirror.full_sync(["users"])
+    except ConnectionError:
+        pass
+    assert mirror.get("users", 10) is not None and mirror.get("users", 14) is None
+    app.data["users"] = []
+    app.iter_users_list = app._lister("users")
+    mirror.full_sync(["users"])
+    assert mirror.all("users") == []
+
+def test_change_log_batches():
+    app = FakeApp()
+    mirror = DirectoryMirror(app)
+    mirror.full_sync()
+    events = [{"item_type": "contact", "change_type": "deleted", "item_id": "c1"}, {"item_type": "channel", "item_id": 5}]
+    assert mirror.apply_change_log_events(events) == 1
+    assert mirror.get("contacts", "c1") is None
+    async_mirror = DirectoryMirror(FakeAsyncApp())
+    assert asyncio.run(async_mirror.aapply_change_log_events(events)) == 1
+
+def test_reconciles_are_not_committed_or_rolled_back_by_other_writes():
+    app = FakeApp()
+    mirror = DirectoryMirror(app, stage_batch=1)
+    mirror.full_sync()
+
+    def contacts(prefetch=0):
+        yield {"id": "c2", "phones": ["+14155550122"]}
+        mirror.apply_change_log_event({"item_type": "user", "change_type": "deleted", "item_id": 10})
+        try:
+            mirror.full_sync(["users"])
+        except ConnectionError:
+            pass
+        assert mirror.get("contacts", "c2") is None
+        yield {"id": "c3", "phones": []}
+
+    def users(prefetch=0):
+        yield {"id": 15, "office_id": 1}
+        raise ConnectionError("page 2")
+
+    app.iter_contacts_list, app.iter_users_list = contacts, users
+    assert mirror.full_sync(["contacts"]) == {"contacts": 2}
+    assert {contact["id"] for contact in mirror.all("contacts")} == {"c2", "c3"}
+    assert mirror.all("users") == [] and mirror.get("users", 15) is None
+
+def test_events_during_a_reconcile_are_not_overwritten_by_it():
+    app = FakeApp()
+    mirror = DirectoryMirror(app)
+    mirror.full_sync()
+
+    def listing(prefetch=0):
+        yield {"id": 10, "office_id": 1}
+        yield {"id": 11, "office_id": 1}
+        mirror.apply_change_log_event({"item_type": "user", "change_type": "updated", "item": {"id": 10, "office_id": 2}})
+        mirror.apply_change_log_event({"item_type": "user", "change_type": "deleted", "item_id": 11})
+
+    app.iter_users_list = listing
+    mirror.full_sync(["users"])
+    assert mirror.all("users") == [{"id": 10, "office_id": 2}]
+
+def test_background_refresh_answers_from_the_current_state():
+    app = FakeApp()
+    clock = FakeClock()
+    mirror = DirectoryMirror(app, clock=clock)
+    release = threading.Event()
+    listed = app.iter_users_list
+
+    def users(prefetch=0):
+        release.wait(5)
+        return listed()
+
+    app.iter_users_list = users
+    assert mirror.refresh_in_background(60) is True
+    assert mirror.refresh_in_background(60) is True
+    assert mirror.office_of_user(10) is None
+    release.set()
+    mirror._refresh_thread.join(5)
+    assert mirror.office_of_user(10)["name"] == "HQ"
+    assert mirror.refresh_in_background(60) is False
+
+def test_async_background_refresh_and_subscription():
+    async def run():
+        mirror = DirectoryMirror(FakeAsyncApp())
+        assert await mirror.arefresh_in_background(60) is True
+        await mirror._refresh_task
+        assert await mirror.arefresh_in_background(60) is False
+        return mirror.office_of_user(10), await mirror.asubscribe_change_log(7)
+
+    office, subscription = asyncio.run(run())
+    assert office["name"] == "HQ" and subscription == {"enabled": True, "endpoint_id": 7}
+    assert DirectoryMirror(FakeApp()).subscribe_change_log(7)["endpoint_id"] == 7
+    with pytest.raises(TypeError):
+        DirectoryMirror(FakeAsyncApp()).subscribe_change_log(7)
@@ -0,0 +1,49 @@
+import pytest
+
+from universal_mcp_dialpad.operators import (
+    ADD,
+    REMOVE,
+    current_operators,
+    desired_operators,
+    normalize_group_type,
+    operator_call,
+    record_change,
+    roster_diff,
+    roster_report,
+)
+
+def test_desired_operators_normalises_specs():
+    roster = desired_operators("office", [1, {"id": 2, "role": "admin"}, {"id": 3, "type": "room"}])
+    assert set(roster) == {("user", "1"), ("user", "2"), ("room", "3")}
+    assert roster[("user", "2")]["role"] == "admin"
+    with pytest.raises(ValueError):
+        desired_operators("callcenter", [{"id": 3, "type": "room"}])
+    with pytest.raises(ValueError):
+        normalize_group_type("team")
+    assert normalize_group_type("callcenters") == "callcenter"
+
+def test_roster_diff_is_minimal():
+    current = current_operators({"users": [{"id": 1}, {"id": 4}], "rooms": [{"id": 9}]})
+    desired = desired_operators("department", [1, 2])
+    assert roster_diff(current, desired) == [
+        (ADD, {"id": 2, "type": "user"}),
+        (REMOVE, {"type": "room", "id": "9"}),
+        (REMOVE, {"type": "user", "id": "4"}),
+    ]
+    assert roster_diff(current, desired, remove_extra=False) == [(ADD, {"id": 2, "type": "user"})]
+    assert roster_diff(current, desired_operators("department", [1, 4, {"id": 9, "type": "room"}])) == []
+
+def test_operator_call_builds_endpoint_arguments():
+    assert operator_call("callcenter", 7, ADD, {"id": "5", "type": "user", "skill_level": 80}) == (
+        "callcenters_operators_post",
+        {"id": 7, "user_id": 5, "keep_paid_numbers": None, "license_type": None, "role": None, "skill_level": 80},
+    )
+    assert operator_call("callcenter", 7, REMOVE, {"id": "5", "type": "user"}) == ("callcenters_operators_delete", {"id": 7, "user_id": 5})
+    assert operator_call("office", 3, REMOVE, {"id": "9", "type": "room"}) == ("offices_operators_delete", {"id": 3, "operator_id": 9, "operator_type": "room"})
+
+def test_roster_report_totals():
+    group = {"group_type": "office", "group_id": 3, "added": [], "removed": [], "failed": []}
+    record_change(group, ADD, {"id": 1, "type": "user"})
+    record_change(group, REMOVE, {"id": 2, "type": "user"}, RuntimeError("nope"))
+    assert roster_report([group])["added"] == 1
+    assert group["failed"] == [{"action": "remove", "type": "user", "id": 2, "error": "nope"}]
@@ -0,0 +1,97 @@
+import asyncio
+
+from universal_mcp_dialpad.optout import INVALID, OPTED_BACK_IN, OPTED_OUT, OptOutSet, with_state
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def entry(number, state=OPTED_OUT, date=1):
+    return {"recipient": number, "opt_out_state": state, "date": str(date)}
+
+def test_build_keeps_latest_state_per_number():
+    opt_outs = OptOutSet()
+    count = opt_outs.build([
+        entry("+14155550100", date=1),
+        entry("+14155550111", date=1),
+        entry("+14155550111", OPTED_BACK_IN, date=2),
+        entry("not a number"),
+    ])
+    assert count == 1 and len(opt_outs) == 1
+    assert "+14155550100" in opt_outs
+    assert "(415) 555-0100" in opt_outs
+    assert "+14155550111" not in opt_outs
+    assert "garbage" not in opt_outs
+    assert opt_outs.watermark == 2
+    assert opt_outs.skipped == 1
+
+def test_apply_takes_unseen_entries_in_date_order():
+    opt_outs = OptOutSet()
+    opt_outs.build([entry("+14155550100", date=5)])
+    applied = opt_outs.apply([
+        entry("+14155550100", date=5),
+        entry("+14155550122", OPTED_BACK_IN, date=8),
+        entry("+14155550122", date=7),
+        entry("+14155550100", OPTED_BACK_IN, date=6),
+    ])
+    assert applied == 3
+    assert "+14155550100" not in opt_outs and "+14155550122" not in opt_outs
+    assert opt_outs.watermark == 8
+    assert opt_outs.apply([entry("+14155550122", OPTED_BACK_IN, date=8)]) == 0
+    assert opt_outs.apply([entry("+14155550133", date=8), entry("+14155550144", date=3)]) == 1
+    assert "+14155550133" in opt_outs
+
+def test_incremental_changes_are_compacted():
+    opt_outs = OptOutSet(compact_threshold=2)
+    opt_outs.build([entry("+14155550100")])
+    opt_outs.add("+14155550111")
+    opt_outs.discard("+14155550100")
+    opt_outs.add("+14155550122")
+    assert list(opt_outs._numbers) == [14155550111, 14155550122]
+    assert len(opt_outs) == 2
+    opt_outs.discard("+14155550111")
+    assert "+14155550111" not in opt_outs and len(opt_outs) == 1
+
+def test_filter_and_staleness():
+    clock = FakeClock()
+    opt_outs = OptOutSet(clock=clock)
+    assert opt_outs.is_stale(60)
+    opt_outs.build([entry("+14155550100")])
+    assert opt_outs.filter(["+14155550100", "+14155550111"]) == (["+14155550111"], ["+14155550100"])
+    clock.now = 61
+    assert opt_outs.is_stale(60)
+
+def test_entries_take_the_state_they_were_listed_under():
+    opt_outs = OptOutSet()
+    listed = [{"recipient": "+14155550100", "date": "1"}]
+    opt_outs.build([*with_state(listed, OPTED_OUT), *with_state([{"recipient": "+14155550100", "date": "2"}], OPTED_BACK_IN)])
+    assert "+14155550100" not in opt_outs
+
+def test_async_listings_are_consumed_as_they_stream():
+    async def listing(*entries):
+        for item in entries:
+            yield item
+
+    opt_outs = OptOutSet()
+    assert asyncio.run(opt_outs.abuild(listing(entry("+14155550100", date=5), entry("+14155550111", date=4)))) == 2
+    assert asyncio.run(opt_outs.aapply(listing(entry("+14155550100", date=5), entry("+14155550111", OPTED_BACK_IN, date=6)))) == 1
+    assert "+14155550100" in opt_outs and "+14155550111" not in opt_outs
+
+def test_tel_uris_and_extensions_are_matched():
+    opt_outs = OptOutSet()
+    opt_outs.build([entry("tel:+14155550199"), entry("+1 415 555 0188;ext=4")])
+    assert opt_outs.skipped == 0 and len(opt_outs) == 2
+    assert opt_outs.status("+1 415 555 0199 x12") == OPTED_OUT
+    assert opt_outs.status("tel:+14155550188") == OPTED_OUT
+    assert opt_outs.status("+14155550177 ext. 3") is None
+
+def test_unreadable_numbers_fail_closed():
+    opt_outs = OptOutSet()
+    opt_outs.build([entry("+14155550100")])
+    assert opt_outs.status("call me maybe") == INVALID
+    assert opt_outs.filter(["+14155550111", "call me maybe", None]) == (["+14155550111"], ["call me maybe", None])
+    assert opt_outs.apply([entry("unknown", date=2), entry("+14155550122", date=2)]) == 1
+    assert opt_outs.skipped == 1
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from universal_mcp_dialpad.pagination import (
+    aiter_items,
+    aiter_pages,
+    aprefetch_pages,
+    iter_items,
+    iter_pages,
+    prefetch_pages,
+)
+
+PAGES = {
+    None: {"items": [1, 2], "cursor": "a"},
+    "a": {"items": [3, 4], "cursor": "b"},
+    "b": {"items": [5]},
+}
+
+def fetch(cursor):
+    return PAGES[cursor]
+
+async def afetch(cursor):
+    return PAGES[cursor]
+
+def test_follows_cursor_until_exhausted():
+    assert list(iter_items(iter_pages(fetch))) == [1, 2, 3, 4, 5]
+
+def test_limits():
+    assert list(iter_items(iter_pages(fetch), max_items=3)) == [1, 2, 3]
+    assert list(iter_items(iter_pages(fetch, max_pages=2))) == [1, 2, 3, 4]
+
+def test_fetches_lazily():
+    calls = []
+    items = iter_items(iter_pages(lambda cursor: calls.append(cursor) or PAGES[cursor]))
+    assert next(items) == 1
+    assert calls == [None]
+
+def test_repeated_cursor_stops():
+    assert list(iter_items(iter_pages(lambda cursor: {"items": [0], "cursor": "x"}))) == [0, 0]
+
+def test_async_iteration():
+    async def collect():
+        return [item async for item in aiter_items(aiter_pages(afetch), max_items=4)]
+
+    assert asyncio.run(collect()) == [1, 2, 3, 4]
+
+def test_prefetch_preserves_order_and_reads_ahead():
+    fetched = []
+
+    def tracking_fetch(cursor):
+        fetched.append(cursor)
+        return PAGES[cursor]
+
+    pages = prefetch_pages(iter_pages(tracking_fetch), depth=2)
+    first = next(pages)
+    assert first["items"] == [1, 2]
+    assert list(iter_items(pages)) == [3, 4, 5]
+    assert fetched == [None, "a", "b"]
+
+def test_prefetch_reraises_fetch_errors():
+    def failing_fetch(cursor):
+        if cursor == "a":
+            raise RuntimeError("boom")
+        return PAGES[cursor]
+
+    pages = prefetch_pages(iter_pages(failing_fetch), depth=1)
+    assert next(pages)["cursor"] == "a"
+    with pytest.raises(RuntimeError):
+        next(pages)
+
+def test_async_prefetch():
+    async def collect():
+        pages = aprefetch_pages(aiter_pages(afetch), depth=2)
+        return [item async for item in aiter_items(pages)]
+
+    assert asyncio.run(collect()) == [1, 2, 3, 4, 5]
@@ -0,0 +1,123 @@
+import asyncio
+
+from universal_mcp_dialpad.phones import NumberFormatter, PhoneIndex, normalize_number, normalize_numbers, parse_number
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+NUMBERS = [
+    {"number": "+14155550100", "target_type": "office", "target_id": 1, "office_id": 1},
+    {"number": "+14155550111", "target_type": "user", "target_id": 10, "office_id": 1},
+    {"number": "+14155550122", "target_type": "room", "target_id": 20, "office_id": 1},
+    {"number": "+14155550133", "target_id": None, "status": "available"},
+]
+
+CONTACTS = [
+    {"id": "c1", "first_name": "Ada", "last_name": "Lovelace", "phones": ["(415) 555-0199", "+14155550111"]},
+]
+
+def test_normalize_number():
+    assert normalize_number("+1 (415) 555-0100") == "+14155550100"
+    assert normalize_number("415.555.0100") == "+14155550100"
+    assert normalize_number("1-415-555-0100") == "+14155550100"
+    assert normalize_number("0044 20 7946 0000") == "+442079460000"
+    assert normalize_number("020 7946 0000", country="GB") == "+442079460000"
+    assert normalize_number("011 44 20 7946 0000") == "+442079460000"
+    assert normalize_number("555-0100") is None
+    assert normalize_number(None) is None
+
+def test_parse_number_flags_ambiguous_numbers():
+    assert parse_number("555-0100") == (None, True)
+    assert parse_number("1-800-FLOWERS") == (None, True)
+    assert parse_number("0612345678", country="XX") == (None, True)
+    assert parse_number("+1 415 555 01") == (None, True)
+    assert parse_number("+86 10 1234 5678") == ("+861012345678", False)
+    assert parse_number("+12") == (None, False)
+
+def test_normalize_numbers_batch():
+    assert normalize_numbers(["4155550100", "4155550100", "bogus", None]) == ["+14155550100", "+14155550100", None, None]
+
+def test_formatter_memoises_remote_answers():
+    formatter = NumberFormatter()
+    results, pending = formatter.plan(["4155550100", "555-0100", "555-0100", "1-800-FLOWERS"])
+    assert [result["source"] for result in results] == ["local", None, None, None]
+    assert pending == ["555-0100", "1-800-FLOWERS"]
+    formatter.record("555-0100", "us", {"e164_number": "+14155550100"})
+    formatter.record("1-800-FLOWERS", "US", None)
+    completed = formatter.complete(results)
+    assert [(result["e164"], result["source"]) for result in completed[1:]] == [("+14155550100", "remote"), ("+14155550100", "remote"), (None, "remote")]
+    results, pending = formatter.plan(["555-0100"])
+    assert pending == [] and results[0] == {"number": "555-0100", "e164": "+14155550100", "source": "cache"}
+    assert formatter.plan(["555-0100"], country="CA")[1] == ["555-0100"]
+
+def test_formatter_is_bounded():
+    formatter = NumberFormatter(maxsize=2)
+    for number in ("a1", "a2", "a3"):
+        formatter.record(number, "US", None)
+    assert formatter.plan(["a1", "a3"])[1] == ["a1"]
+
+def test_lookup_prefers_company_numbers_over_contacts():
+    index = PhoneIndex()
+    assert index.build(NUMBERS, CONTACTS) == 4
+    assert index.lookup("415-555-0111")["target_type"] == "user"
+    assert index.lookup("+14155550122")["target_id"] == 20
+    contact = index.lookup("+14155550199")
+    assert contact["target_type"] == "contact" and contact["name"] == "Ada Lovelace"
+    assert index.lookup("+14155550133") is None
+
+def test_index_keeps_api_numbers_the_offline_rules_doubt():
+    index = PhoneIndex()
+    index.build([{"number": "+49301234567890", "target_type": "user", "target_id": 1}])
+    assert index.lookup("+49 30 1234567890")["target_id"] == 1
+
+def test_incremental_updates():
+    index = PhoneIndex()
+    index.build(NUMBERS, CONTACTS)
+    index.update_number({"number": "+14155550133", "target_type": "callrouter", "target_id": 30})
+    assert index.lookup("+14155550133")["target_type"] == "callrouter"
+    index.update_number({"number": "+14155550133", "target_id": None})
+    assert index.lookup("+14155550133") is None
+    index.update_contact({"id": "c1", "display_name": "Ada", "phones": ["+14155550188"]})
+    assert index.lookup("+14155550199") is None
+    assert index.lookup("+14155550188")["name"] == "Ada"
+    index.remove_contact("c1")
+    assert index.lookup("+14155550188") is None
+    index.remove_number("+14155550111")
+    assert index.lookup("+14155550111") is None
+
+def test_staleness():
+    clock = FakeClock()
+    index = PhoneIndex(clock=clock)
+    assert index.is_stale(60)
+    index.build(NUMBERS)
+    clock.now = 60
+    assert not index.is_stale(60)
+    clock.now = 61
+    assert index.is_stale(60)
+
+def test_patches_during_a_rebuild_are_replayed():
+    index = PhoneIndex()
+
+    def contacts():
+        yield from CONTACTS
+        index.update_number({"number": "+14155550133", "target_type": "callrouter", "target_id": 30})
+        index.remove_number("+14155550122")
+
+    index.build(NUMBERS, contacts())
+    assert index.lookup("+14155550133")["target_id"] == 30
+    assert index.lookup("+14155550122") is None
+    index.build(NUMBERS, CONTACTS)
+    assert index.lookup("+14155550122") is not None
+
+def test_async_build():
+    async def listing(items):
+        for item in items:
+            yield item
+
+    index = PhoneIndex()
+    assert asyncio.run(index.abuild(listing(NUMBERS), listing(CONTACTS))) == 4
+    assert index.lookup("+14155550199")["target_id"] == "c1"
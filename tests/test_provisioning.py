@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from universal_mcp_dialpad.provisioning import ProvisioningRun, plan_user, step_call, user_key
+
+SPEC = {
+    "email": "ada@example.com",
+    "first_name": "Ada",
+    "office_id": 1,
+    "move_office_id": 2,
+    "area_code": "415",
+    "caller_id": "+14155550100",
+    "e911": {"address": "1 Main St", "city": "SF", "state": "CA", "zip": "94105", "country": "us"},
+    "operator_offices": [2, {"office_id": 3, "role": "admin"}],
+}
+
+def drive(run, fail=()):
+    order = []
+    while not run.done:
+        for key, step, spec, user_id in run.ready():
+            order.append((key, step))
+            if (key, step) in fail:
+                run.fail(key, step, RuntimeError("boom"))
+            else:
+                run.complete(key, step, {"id": 42} if step == "create" else {})
+    return order
+
+def test_plan_orders_steps_by_dependency():
+    assert plan_user(SPEC) == {
+        "create": (),
+        "move_office": ("create",),
+        "assign_number": ("move_office",),
+        "caller_id": ("assign_number",),
+        "e911": ("move_office",),
+        "operator:2": ("move_office",),
+        "operator:3": ("move_office",),
+    }
+    assert plan_user({"email": "a@b.c", "caller_id": "blocked"}) == {"create": (), "caller_id": ("create",)}
+
+def test_step_call_builds_endpoint_arguments():
+    assert step_call("create", SPEC, None) == ("users_create", {"auto_assign": None, "email": "ada@example.com", "first_name": "Ada", "last_name": None, "license": None, "office_id": 1})
+    assert step_call("move_office", SPEC, 42) == ("users_move_office_patch", {"id": 42, "office_id": 2})
+    assert step_call("operator:3", SPEC, 42) == ("offices_operators_post", {"id": "3", "operator_id": 42, "operator_type": "user", "role": "admin"})
+    assert step_call("e911", SPEC, 42)[1]["zip"] == "94105"
+    with pytest.raises(ValueError):
+        step_call("nope", SPEC, 42)
+
+def test_user_key_requires_email_or_key():
+    assert user_key({"key": "k", "email": "e"}) == "k"
+    with pytest.raises(ValueError):
+        user_key({"first_name": "Ada"})
+
+def test_run_executes_waves_and_reports():
+    run = ProvisioningRun([SPEC, {"email": "bob@example.com"}])
+    first = run.ready()
+    assert [(key, step) for key, step, _, _ in first] == [("ada@example.com", "create"), ("bob@example.com", "create")]
+    for key, step, _, _ in first:
+        run.complete(key, step, {"id": 42})
+    assert [step for _, step, _, user_id in run.ready()] == ["move_office"]
+    report = run.report()
+    assert report["users"]["ada@example.com"]["user_id"] == 42
+    assert report["succeeded"] == 1
+
+def test_failures_block_dependents():
+    run = ProvisioningRun([SPEC])
+    drive(run, fail={("ada@example.com", "assign_number")})
+    user = run.report()["users"]["ada@example.com"]
+    assert user["failed"] == {"assign_number": "boom"}
+    assert user["blocked"] == ["caller_id"]
+    assert "e911" in user["done"] and "operator:3" in user["done"]
+    assert run.report()["failed"] == 1
+
+def test_resume_from_checkpoint(tmp_path):
+    checkpoint = tmp_path / "provision.json"
+    drive(ProvisioningRun([SPEC], checkpoint), fail={("ada@example.com", "move_office")})
+    assert json.loads(checkpoint.read_text()) == {"ada@example.com": {"user_id": 42, "done": ["create"]}}
+    resumed = ProvisioningRun([SPEC], checkpoint)
+    order = drive(resumed)
+    assert ("ada@example.com", "create") not in order
+    assert resumed.report()["succeeded"] == 1
+    assert resumed.report()["users"]["ada@example.com"]["user_id"] == 42
@@ -0,0 +1,69 @@
+import pytest
+
+from universal_mcp_dialpad import ratelimit
+from universal_mcp_dialpad.ratelimit import RateLimiter, TokenBucket, parse_limits, shared_limiter
+
+BASE = "https://dialpad.com/api/v2/api/v2"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_bucket_allows_burst_then_queues_in_order():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 0.5, 1.0]
+    clock.now = 10
+    assert bucket.reserve() == 0
+
+def test_bucket_reserves_several_tokens():
+    bucket = TokenBucket(rate=1, capacity=10, clock=FakeClock())
+    assert bucket.reserve(10) == 0
+    assert bucket.reserve(3) == 3
+
+def test_bucket_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+
+def test_family_buckets_are_separate_per_key():
+    clock = FakeClock()
+    limiter = RateLimiter(limits={"sms": (1, 1)}, clock=clock)
+    assert limiter.family_for("POST", f"{BASE}/sms") == "sms"
+    assert limiter.family_for("GET", f"{BASE}/users") == "default"
+    assert limiter.reserve("key-a", "POST", f"{BASE}/sms") == 0
+    assert limiter.reserve("key-a", "POST", f"{BASE}/sms") == 1.0
+    assert limiter.reserve("key-b", "POST", f"{BASE}/sms") == 0
+    assert limiter.reserve("key-a", "GET", f"{BASE}/users") == 0
+
+def test_wait_metrics():
+    clock = FakeClock()
+    limiter = RateLimiter(limits={"sms": (1, 1)}, clock=clock)
+    for _ in range(3):
+        limiter.reserve("key", "POST", f"{BASE}/sms")
+    assert limiter.stats()["sms"] == {"requests": 3, "delayed": 2, "wait_seconds": 3.0, "max_wait_seconds": 2.0}
+
+def test_parse_limits():
+    assert parse_limits("default=10:10, sms=1.5:5") == {"default": (10.0, 10.0), "sms": (1.5, 5.0)}
+    assert parse_limits(None) == parse_limits("") == {}
+    for spec in ("mms=1:1", "sms=1", "sms=0:5", "sms=fast:5"):
+        with pytest.raises(ValueError):
+            parse_limits(spec)
+
+def test_configure_restarts_only_changed_families():
+    clock = FakeClock()
+    limiter = RateLimiter(limits={"sms": (1, 1)}, clock=clock)
+    limiter.reserve("key", "POST", f"{BASE}/sms")
+    limiter.reserve("key", "GET", f"{BASE}/users")
+    limiter.configure({"sms": (2, 3), "default": limiter.limits["default"]})
+    assert limiter.limits["sms"] == (2, 3)
+    assert set(limiter._buckets) == {("key", "default")}
+
+def test_shared_limiter_takes_configured_limits(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_shared_limiter", None)
+    limiter = shared_limiter({"sms": (1, 2)})
+    assert limiter.limits["sms"] == (1, 2) and limiter.limits["call"] == ratelimit.DEFAULT_LIMITS["call"]
+    assert shared_limiter() is limiter and limiter.limits["sms"] == (1, 2)
+    assert shared_limiter({"sms": (3, 4)}) is limiter and limiter.limits["sms"] == (3, 4)
@@ -0,0 +1,43 @@
+from email.utils import formatdate
+
+from universal_mcp_dialpad.retry import RetryPolicy, current_idempotency_key, idempotency_key, parse_retry_after, retries_disabled, without_retries
+
+def test_only_idempotent_methods_retry_without_key():
+    policy = RetryPolicy()
+    assert policy.allows("GET")
+    assert policy.allows("patch")
+    assert not policy.allows("POST")
+    assert policy.allows("POST", idempotency_key="abc")
+
+def test_should_retry_statuses_and_attempt_budget():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry(0, 503)
+    assert policy.should_retry(0)
+    assert not policy.should_retry(0, 500)
+    assert not policy.should_retry(2, 503)
+
+def test_backoff_is_exponential_with_jitter_and_capped():
+    policy = RetryPolicy(backoff=1, max_backoff=5, rand=lambda: 1.0)
+    assert [policy.delay(attempt) for attempt in range(4)] == [1, 2, 4, 5]
+    assert RetryPolicy(rand=lambda: 0.5, backoff=1).delay(1) == 1.0
+
+def test_retry_after_takes_precedence():
+    policy = RetryPolicy(max_retry_after=60)
+    assert policy.delay(0, "7") == 7
+    assert policy.delay(0, "3600") == 60
+
+def test_parse_retry_after_http_date():
+    assert parse_retry_after(formatdate(1_000_030, usegmt=True), now=lambda: 1_000_000) == 30
+    assert parse_retry_after("soon") is None
+
+def test_idempotency_key_context():
+    assert current_idempotency_key() is None
+    with idempotency_key("k1"):
+        assert current_idempotency_key() == "k1"
+    assert current_idempotency_key() is None
+
+def test_without_retries_is_scoped():
+    assert not retries_disabled()
+    with without_retries():
+        assert retries_disabled()
+    assert not retries_disabled()
@@ -0,0 +1,24 @@
+import re
+from pathlib import Path
+
+from universal_mcp_dialpad.routes import DEPENDENTS, ROUTES, entity_for, template_for
+
+APP_SOURCE = Path(__file__).parents[1] / "src" / "universal_mcp_dialpad" / "app.py"
+
+def test_routes_cover_every_endpoint_url():
+    templates = set(re.findall(r'url = f"\{self\.base_url\}(?:/api/v2)?([^"]*)"', APP_SOURCE.read_text()))
+    assert templates == set(ROUTES)
+
+def test_template_for_prefers_literal_segments():
+    assert template_for("https://dialpad.com/api/v2/api/v2/numbers/format") == "/numbers/format"
+    assert template_for("https://dialpad.com/api/v2/api/v2/numbers/+15551234567") == "/numbers/{number}"
+    assert template_for("https://dialpad.com/api/v2/api/v2/callcenters/operators/7/dutystatus") == "/callcenters/operators/{id}/dutystatus"
+    assert template_for("https://dialpad.com/api/v2/api/v2/unknown") is None
+
+def test_entity_for_uses_resource_map():
+    assert entity_for("https://dialpad.com/api/v2/api/v2/users/42/e911") == ("users", "42")
+    assert entity_for("https://dialpad.com/api/v2/api/v2/users") == ("users", None)
+    assert entity_for("https://dialpad.com/api/v2/api/v2/callcenters/operators/7/dutystatus") == ("callcenters", None)
+
+def test_dependents_reference_known_templates():
+    assert set(DEPENDENTS) <= set(ROUTES)
@@ -0,0 +1,70 @@
+import pytest
+
+from universal_mcp_dialpad.sms import FAILED, SENT, SenderPacer, batch_idempotency_key, batch_results, iter_sms_batches, sender_key, sms_message
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def messages(items, **defaults):
+    return [sms_message(item, defaults) for item in items]
+
+def test_sms_message_accepts_tuples_and_mappings():
+    assert sms_message(("+14155550100", "hi"), {"from_number": "+14155550199"}) == {
+        "from_number": "+14155550199", "user_id": None, "sender_group_id": None, "sender_group_type": None,
+        "to_number": "+14155550100", "text": "hi", "media": None,
+    }
+    message = sms_message({"to": "+14155550100", "text": "hi", "media": "aGk=", "user_id": 7}, {"user_id": 1})
+    assert message["user_id"] == 7 and message["media"] == "aGk="
+    with pytest.raises(ValueError):
+        sms_message({"text": "hi"})
+
+def test_sender_key_follows_sms_send_precedence():
+    assert sender_key({"from_number": "+1415", "user_id": 1}) == "+1415"
+    assert sender_key({"sender_group_id": 5, "sender_group_type": "office", "user_id": 1}) == "office:5"
+    assert sender_key({"user_id": 1}) == "user:1"
+    assert sender_key({}) == "default"
+
+def test_batches_are_single_recipient_unless_grouping_is_requested():
+    items = [(f"+1415555{n:04d}", "hello") for n in range(12)] + [("+14155559999", "other")]
+    assert all(len(batch["to_numbers"]) == 1 for batch in iter_sms_batches(messages(items, from_number="+14155550000")))
+    batches = list(iter_sms_batches(messages(items, from_number="+14155550000"), max_recipients=10))
+    assert [len(batch["to_numbers"]) for batch in batches] == [10, 2, 1]
+    assert batches[2]["text"] == "other"
+    assert all(batch["sender_key"] == "+14155550000" for batch in batches)
+
+def test_batches_keep_senders_and_repeats_apart():
+    items = [
+        {"to_number": "+1", "text": "hi", "from_number": "+a"},
+        {"to_number": "+2", "text": "hi", "from_number": "+b"},
+        {"to_number": "+1", "text": "hi", "from_number": "+a"},
+    ]
+    batches = list(iter_sms_batches(messages(items), max_recipients=10))
+    assert sorted((batch["sender_key"], tuple(batch["to_numbers"])) for batch in batches) == [("+a", ("+1",)), ("+a", ("+1",)), ("+b", ("+2",))]
+
+def test_batches_respect_limits():
+    items = [(f"+{n}", "hi") for n in range(4)] + [("+9", f"text {n}") for n in range(3)]
+    assert [len(batch["to_numbers"]) for batch in iter_sms_batches(messages(items), max_recipients=1)] == [1] * 7
+    assert [batch["text"] for batch in iter_sms_batches(messages(items), max_recipients=50, max_open=1)][:2] == ["hi", "text 0"]
+
+def test_batch_results_and_idempotency_key():
+    batch = {"sender_key": "+a", "text": "hi", "media": None, "to_numbers": ["+1", "+2"]}
+    assert [(result["status"], result["id"]) for result in batch_results(batch, {"id": 3})] == [(SENT, None), (SENT, None)]
+    assert batch_results(dict(batch, to_numbers=["+1"]), {"id": 4})[0]["id"] == 4
+    failed = batch_results(batch, error=RuntimeError("boom"))
+    assert failed[0]["status"] == FAILED and failed[0]["error"] == "boom"
+    reordered = dict(batch, to_numbers=["+2", "+1"])
+    assert batch_idempotency_key("c1", batch) == batch_idempotency_key("c1", reordered)
+    assert batch_idempotency_key("c1", batch) != batch_idempotency_key("c2", batch)
+
+def test_pacer_counts_recipients_per_sender():
+    clock = FakeClock()
+    pacer = SenderPacer(rate=1, burst=10, rates={"+fast": (10, 10)}, clock=clock)
+    assert pacer.reserve("+a", 10) == 0
+    assert pacer.reserve("+a", 2) == 2
+    assert pacer.reserve("+b", 10) == 0
+    assert pacer.reserve("+fast", 10) == 0
+    assert pacer.reserve("+fast", 5) == 0.5
@@ -0,0 +1,80 @@
+from itertools import islice
+
+from universal_mcp_dialpad.stats import (
+    COMPLETE,
+    FAILED,
+    PENDING,
+    StatsBatch,
+    iter_column_batches,
+    iter_csv_rows,
+    iter_file_lines,
+    job_state,
+    poll_intervals,
+    spill_path,
+)
+
+def test_poll_intervals_back_off_to_cap():
+    assert list(islice(poll_intervals(1, factor=2, maximum=5), 5)) == [1, 2, 4, 5, 5]
+
+def test_job_state():
+    assert job_state({"status": "processing"}) == PENDING
+    assert job_state({"status": "complete", "download_url": "https://x"}) == COMPLETE
+    assert job_state({"status": "failed"}) == FAILED
+
+def test_iter_csv_rows_handles_multiline_fields_and_blank_lines():
+    lines = ["date,name,note", "2024-01-01,Ann,\"first", "second\"", "", "2024-01-02,Bob,plain"]
+    assert list(iter_csv_rows(lines)) == [
+        {"date": "2024-01-01", "name": "Ann", "note": "first\nsecond"},
+        {"date": "2024-01-02", "name": "Bob", "note": "plain"},
+    ]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_stats_batch_caps_concurrency_and_reports_completion():
+    clock = FakeClock()
+    batch = StatsBatch([{"office_id": 1}, {"office_id": 2}, {"office_id": 3}], concurrency=2, initial_interval=1, clock=clock)
+    first, second = batch.ready_to_submit()
+    assert batch.ready_to_submit() == []
+    assert batch.update(first, {"request_id": "a"}) is None
+    assert batch.update(second, {"request_id": "b"}) is None
+    assert batch.due() == []
+    assert batch.idle_time() == 1
+    clock.now = 1
+    assert batch.update(first, {"status": "processing"}) is None
+    finished = batch.update(second, {"status": "complete", "download_url": "https://x"})
+    assert finished == {"job": {"office_id": 2}, "request_id": "b", "result": {"status": "complete", "download_url": "https://x"}, "error": None}
+    assert [job.params for job in batch.ready_to_submit()] == [{"office_id": 3}]
+
+def test_stats_batch_failures_and_timeouts():
+    clock = FakeClock()
+    batch = StatsBatch([{"office_id": 1}, {"office_id": 2}], timeout=5, clock=clock)
+    first, second = batch.ready_to_submit()
+    assert isinstance(batch.fail(first, RuntimeError("boom"))["error"], RuntimeError)
+    batch.update(second, {"request_id": "b"})
+    clock.now = 6
+    assert isinstance(batch.update(second, {"status": "processing"})["error"], TimeoutError)
+    assert batch.ready_to_submit() == []
+    assert batch.done
+
+def test_typed_rows():
+    lines = ["id,phone,duration,rate,note", "0042,+14155550100,35,0.5,"]
+    assert list(iter_csv_rows(lines, infer_types=True)) == [
+        {"id": "0042", "phone": "+14155550100", "duration": 35, "rate": 0.5, "note": None},
+    ]
+    assert list(iter_csv_rows(lines, types={"id": int})) == [
+        {"id": 42, "phone": "+14155550100", "duration": "35", "rate": "0.5", "note": ""},
+    ]
+
+def test_column_batches_pad_missing_columns():
+    rows = [{"a": 1}, {"a": 2, "b": 3}, {"a": 4}]
+    assert list(iter_column_batches(rows, batch_size=2)) == [{"a": [1, 2], "b": [None, 3]}, {"a": [4]}]
+
+def test_spilled_file_round_trip(tmp_path):
+    path = spill_path(tmp_path / "report.csv")
+    path.write_text('a,b\r\n1,"x\r\ny"\r\n', newline="")
+    assert list(iter_csv_rows(iter_file_lines(path))) == [{"a": "1", "b": "x\ny"}]
@@ -0,0 +1,91 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+
+import pytest
+
+from universal_mcp_dialpad.webhooks import WebhookAuthError, WebhookReceiver, decode_jwt, parse_event
+
+def b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def sign(claims, secret, alg="HS256"):
+    signing_input = f"{b64(json.dumps({'alg': alg, 'typ': 'JWT'}).encode())}.{b64(json.dumps(claims).encode())}"
+    signature = hmac.new(secret.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{b64(signature)}".encode()
+
+def test_decode_jwt_verifies_signature_and_expiry():
+    assert decode_jwt(sign({"call_id": 1}, "s3cret"), "s3cret") == {"call_id": 1}
+    with pytest.raises(WebhookAuthError):
+        decode_jwt(sign({"call_id": 1}, "other"), "s3cret")
+    with pytest.raises(WebhookAuthError):
+        decode_jwt(sign({"call_id": 1}, "s3cret", alg="none"), "s3cret")
+    with pytest.raises(WebhookAuthError):
+        decode_jwt(sign({"exp": 100}, "s3cret"), "s3cret", now=lambda: 1000.0)
+    with pytest.raises(WebhookAuthError):
+        decode_jwt(b"not-a-jwt", "s3cret")
+
+def test_parse_event_without_secret():
+    assert parse_event(b'{"state": "hangup"}') == {"state": "hangup"}
+    with pytest.raises(ValueError):
+        parse_event(b"[1]")
+
+def test_accept_statuses_and_backpressure():
+    receiver = WebhookReceiver(secret="s3cret")
+    receiver.route("calls", lambda batch: None, maxsize=1)
+    assert receiver.accept("sms", b"{}")[0] == 404
+    assert receiver.accept("calls", b'{"call_id": 1}')[0] == 401
+    assert receiver.accept("calls", sign({"call_id": 1}, "s3cret"))[0] == 202
+    assert receiver.accept("calls", sign({"call_id": 2}, "s3cret"))[0] == 503
+    stats = receiver.stats()["calls"]
+    assert (stats["queued"], stats["rejected"], stats["invalid"]) == (1, 1, 1)
+
+def test_batches_are_delivered_and_retried():
+    batches = []
+    failures = [RuntimeError("down")]
+
+    async def consumer(batch):
+        if failures:
+            raise failures.pop()
+        batches.append([event["n"] for event in batch])
+
+    async def scenario():
+        receiver = WebhookReceiver()
+        channel = receiver.route("events", consumer, batch_size=2, max_wait=0.01, backoff=0.01)
+        for n in range(3):
+            assert receiver.accept("events", json.dumps({"n": n}).encode())[0] == 202
+        await receiver.start()
+        assert await receiver.stop(timeout=5) == 0
+        assert receiver.accept("events", b'{"n": 3}')[0] == 503
+        return channel
+
+    channel = asyncio.run(scenario())
+    assert batches == [[0, 1], [2]]
+    assert (channel.delivered, channel.consumer_errors, channel.last_error) == (3, 1, "down")
+
+def test_poison_events_are_dead_lettered():
+    delivered = []
+    dead = []
+
+    def consumer(batch):
+        if any(event["n"] == 1 for event in batch):
+            raise ValueError("bad event")
+        delivered.extend(event["n"] for event in batch)
+
+    async def scenario():
+        receiver = WebhookReceiver()
+        channel = receiver.route("events", consumer, batch_size=3, max_wait=0.01, backoff=0, max_attempts=2, dead_letter=lambda event, error: dead.append(event["n"]))
+        for n in range(3):
+            receiver.accept("events", json.dumps({"n": n}).encode())
+        await receiver.start()
+        with pytest.raises(RuntimeError):
+            receiver.route("late", consumer)
+        assert await receiver.stop(timeout=5) == 0
+        return channel
+
+    channel = asyncio.run(scenario())
+    assert delivered == [0, 2] and dead == [1]
+    assert channel.stats()["dead_lettered"] == 1
+    assert channel.dead_letters[0] == ({"n": 1}, "bad event")